@@ -16,12 +16,27 @@ load_dotenv()
 
 
 class BiasDetectionPipeline:
-    def __init__(self):
+    def __init__(
+        self,
+        hedge_detection: Optional[bool] = None,
+        fused: Optional[bool] = None,
+        cascade: Optional[bool] = None,
+        rewrite_mode: Optional[str] = None,
+        prescore: Optional[bool] = None
+    ):
         from src.services.news_client import NewsClient
         from src.agents.orchestrator import BiasAnalysisOrchestrator
+        from src.agents.scheduler import AnalysisScheduler
+        from src.agents.job_runner import JobRunner
         
         self.news_client = NewsClient()
-        self.orchestrator = BiasAnalysisOrchestrator(max_concurrent=3)
+        self.orchestrator = BiasAnalysisOrchestrator(
+            hedge_detection=hedge_detection, fused=fused, cascade=cascade,
+            rewrite_mode=rewrite_mode, prescore=prescore
+        )
+        self.scheduler = AnalysisScheduler(self.orchestrator)
+        # Analyses go through the durable job queue so a restart resumes them
+        self.job_runner = JobRunner(self.scheduler)
     
     async def run_full_pipeline(self, query: Optional[str] = None, article_count: int = 5):
         """
@@ -35,11 +50,11 @@ class BiasDetectionPipeline:
                 get_connection_to_news_db, 
                 add_news, 
                 prepare_data_for_llm,
-                add_bias,
                 clear_old_articles,
                 get_article_stats,
                 clear_processed_articles
             )
+            from src.database.job_queue import enqueue_articles, clear_finished_jobs
             
             query_display = f"'{query}'" if query else "all recent articles"
             print(f"Processing parameters - Query: {query_display}, Count: {article_count}")
@@ -48,6 +63,7 @@ class BiasDetectionPipeline:
             print("Step 1: Clearing previously processed articles...")
             get_connection_to_news_db()
             clear_processed_articles()
+            clear_finished_jobs()
             
             print("Step 2: Fetching fresh articles...")
             articles = await self.news_client.fetch_articles(query, article_count)
@@ -76,18 +92,15 @@ class BiasDetectionPipeline:
             
             print(f"Prepared {len(llm_articles)} articles for bias analysis")
             
-            print("Step 5: Analyzing biases with AI agents...")
-            analysis_results = await self.orchestrator.analyze_multiple_articles(llm_articles)
+            print("Step 5: Queueing analysis jobs...")
+            job_ids = enqueue_articles(llm_articles, priority=self.scheduler.BACKGROUND)
+            
+            print("Step 6: Analyzing biases with AI agents (results stored as each job finishes)...")
+            analysis_results = await self.job_runner.run_jobs(len(job_ids), job_ids=job_ids)
             
             # Verify we got real LLM analysis, not fallbacks
             valid_results = self._verify_llm_results(analysis_results)
             
-            print("Step 6: Storing analysis results...")
-            db_ready_results = self._format_results_for_db(valid_results, llm_articles)
-            
-            if db_ready_results:
-                add_bias(db_ready_results)
-            
             print("Step 7: Generating summary...")
             self._display_summary(valid_results)
             get_article_stats()
@@ -104,6 +117,94 @@ class BiasDetectionPipeline:
             traceback.print_exc()
             return None
     
+    async def run_resume_pipeline(self, batch_size: int = 5):
+        """
+        Finish the job queue left by an interrupted run: pending jobs, expired
+        leases and retries, each resuming from its saved stage checkpoints.
+        """
+        print("Resuming Queued Analysis Jobs")
+        print("=" * 50)
+        
+        try:
+            from src.database.news_db import get_article_stats
+            from src.database.job_queue import get_queue_stats
+            
+            stats = get_queue_stats()
+            print(f"Queue: {stats.get('pending', 0)} pending, {stats.get('leased', 0)} leased "
+                  f"({stats.get('expired_leases', 0)} expired), {stats.get('failed', 0)} failed")
+            
+            analysis_results = await self.job_runner.drain(batch_size)
+            if not analysis_results:
+                print("No queued jobs to resume")
+                return None
+            
+            valid_results = self._verify_llm_results(analysis_results)
+            self._display_summary(valid_results)
+            get_article_stats()
+            
+            return valid_results
+            
+        except Exception as e:
+            print(f"Resume failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    async def run_batch_pipeline(self, article_count: int = 50, service=None):
+        """
+        Overnight backfill: analyze stored, unanalyzed articles through a batch API.
+        
+        The local stand-in returns canned answers, so its runs are dry runs
+        that never write to data_news.
+        """
+        from src.services.batch_client import LocalBatchService
+        dry_run = isinstance(service, LocalBatchService)
+        print("Starting Batch Bias Detection")
+        print("=" * 50)
+        
+        try:
+            from src.database.news_db import (
+                get_connection_to_news_db,
+                prepare_data_for_llm,
+                add_bias,
+                get_article_stats
+            )
+            
+            get_connection_to_news_db()
+            
+            print("Step 1: Selecting unanalyzed articles...")
+            llm_articles = prepare_data_for_llm(limit=article_count, processed_only=True)
+            
+            if not llm_articles:
+                print("No unanalyzed articles to process")
+                return None
+            
+            print(f"Submitting {len(llm_articles)} articles as batch jobs...")
+            analysis_results = await self.orchestrator.analyze_articles_batch(llm_articles, service=service)
+            
+            valid_results = self._verify_llm_results(analysis_results)
+            
+            if dry_run:
+                print("Step 2: Dry run with the local batch stand-in; results not stored")
+            else:
+                print("Step 2: Storing analysis results...")
+                db_ready_results = self._format_results_for_db(valid_results, llm_articles)
+                
+                if db_ready_results:
+                    add_bias(db_ready_results)
+            
+            print("Step 3: Generating summary...")
+            self._display_summary(valid_results)
+            get_article_stats()
+            
+            return valid_results
+            
+        except Exception as e:
+            print(f"Batch pipeline failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
     def _verify_llm_results(self, analysis_results):
         """Just verify, don't filter out fallbacks."""
         for result in analysis_results:
@@ -179,6 +280,43 @@ class BiasDetectionPipeline:
                 original_len = len(result.get("original_text", ""))
                 rewritten_len = len(result.get("neutral_version", ""))
                 print(f"     Original: {original_len} chars, Rewritten: {rewritten_len} chars")
+        
+        if self.orchestrator.detector.hedge:
+            stats = self.orchestrator.get_hedge_stats()
+            print(f"Detection hedging: {stats['hedges_sent']}/{stats['hedged_calls']} calls hedged, "
+                  f"{stats['hedge_wins']} won by the hedge")
+        
+        if self.orchestrator.cascade:
+            stats = self.orchestrator.get_cascade_stats()
+            print(f"Model cascade: {stats['neutral']} neutral (no rewrite), {stats['triage']} triage-only, "
+                  f"{stats['escalated']} escalated to the main model")
+        
+        stats = self.orchestrator.get_concurrency_stats()
+        print(f"Adaptive concurrency: limit {stats['limit']} "
+              f"({stats['increases']} increases, {stats['decreases']} decreases)")
+        
+        stats = self.scheduler.snapshot()
+        if stats['dropped']:
+            print(f"Scheduler: {stats['dropped']} articles dropped after their deadline")
+        
+        from src.services.structured_output import ParseStats
+        for row in ParseStats.shared().snapshot():
+            print(f"Structured output {row['provider']}/{row['model_name']}: {row['responses']} responses, "
+                  f"{row['repaired']} repaired, parse-failure rate {row['parse_failure_rate']:.1%}")
+        
+        if self.orchestrator.prescorer is not None:
+            counts = self.orchestrator.prescore_counts
+            print(f"Lexical pre-scorer: {counts['neutral']} marked neutral without an LLM call, "
+                  f"{counts['cheap']} sent to the cheap tier, {counts['full']} fully analyzed")
+        
+        rewriter = self.orchestrator.rewriter
+        if rewriter.mode == 'local':
+            print(f"Rewrites: {rewriter.rewrite_counts['local']} local phrase rewrites, "
+                  f"{rewriter.rewrite_counts['llm']} LLM rewrites")
+        elif rewriter.mode == 'paragraph':
+            print(f"Rewrites: {rewriter.rewrite_counts['paragraph']} paragraph-scoped "
+                  f"({rewriter.paragraphs_rewritten} paragraphs rewritten, {rewriter.paragraphs_kept} kept), "
+                  f"{rewriter.rewrite_counts['llm']} full LLM rewrites")
 
 
 async def main():
@@ -188,9 +326,55 @@ async def main():
     parser = argparse.ArgumentParser(description='Bias Detection Pipeline')
     parser.add_argument('--query', type=str, help='Search query for articles (optional)')
     parser.add_argument('--count', type=int, default=3, help='Number of articles to process')
+    parser.add_argument('--hedge', action='store_true', help='Hedge slow detection calls to a second provider')
+    parser.add_argument('--fused', action='store_true', help='Detect, rewrite, retitle and explain in one LLM request per article')
+    parser.add_argument('--cascade', action='store_true', help='Triage with a small model; escalate only biased articles')
+    parser.add_argument('--rewrite-mode', choices=['llm', 'local', 'paragraph'], default=None,
+                        help='Rewrite the whole article with the LLM, locally from detected phrase '
+                             'replacements, or only the biased paragraphs')
+    parser.add_argument('--prescore', action='store_true',
+                        help='Score articles with the local lexicon before LLM detection')
+    parser.add_argument('--rebuild-lexicon', action='store_true',
+                        help='Relearn the pre-scorer lexicon from stored analyses, then exit')
+    parser.add_argument('--lexicon-report', action='store_true',
+                        help='Print pre-scorer precision against stored LLM labels, then exit')
+    parser.add_argument('--batch', action='store_true', help='Backfill stored articles through provider batch APIs')
+    parser.add_argument('--batch-service', choices=['provider', 'local'], default=None,
+                        help='Batch backend: the provider batch API or the local file-based stand-in')
+    parser.add_argument('--resume', action='store_true',
+                        help='Finish queued analysis jobs from an interrupted run, reusing their checkpoints')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='Write Prometheus metrics to this file when the run ends (textfile collector)')
+    parser.add_argument('--metrics-push', type=str, default=None,
+                        help='Push Prometheus metrics to this Pushgateway URL when the run ends')
+    parser.add_argument('--trace-file', type=str, default=None,
+                        help='Append this run\'s trace spans (OTLP/JSON lines) to this file')
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument('--record-cassette', type=str, default=None,
+                                help='Record LLM and news API traffic with timings to this cassette file')
+    cassette_group.add_argument('--replay-cassette', type=str, default=None,
+                                help='Serve LLM and news API calls from this cassette with the recorded latency')
+    parser.add_argument('--ledger-report', action='store_true',
+                        help='Print LLM call cost and latency per stage and model, then exit')
     
     args = parser.parse_args()
     
+    if args.ledger_report:
+        from src.database.call_ledger import print_ledger_report
+        print_ledger_report()
+        return
+    
+    if args.rebuild_lexicon:
+        from src.agents.lexical_scorer import LexicalPreScorer
+        stats = LexicalPreScorer().rebuild()
+        print(f"Lexicon rebuilt: {stats['terms']} terms from {stats['articles']} analyzed articles")
+        return
+    
+    if args.lexicon_report:
+        from src.agents.lexical_scorer import print_lexicon_report
+        print_lexicon_report(float(os.getenv("LEXICAL_NEUTRAL_SCORE", "5")))
+        return
+    
     print("Bias Detection System")
     print("=" * 40)
     
@@ -202,12 +386,46 @@ async def main():
         else:
             print(f"  MISSING: {var}")
     
-    pipeline = BiasDetectionPipeline()
+    # Before any client is built: ModelFactory and NewsClient pick the cassette up
+    cassette = None
+    if args.record_cassette or args.replay_cassette:
+        from src.services.cassette import Cassette
+        cassette = Cassette.use(args.record_cassette or args.replay_cassette,
+                                "record" if args.record_cassette else "replay")
+        print(f"Cassette: {cassette.mode} {cassette.path}")
+    
+    pipeline = BiasDetectionPipeline(hedge_detection=args.hedge or None, fused=args.fused or None,
+                                     cascade=args.cascade or None, rewrite_mode=args.rewrite_mode,
+                                     prescore=args.prescore or None)
     
-    results = await pipeline.run_full_pipeline(
-        query=args.query,
-        article_count=args.count
-    )
+    from src.services.tracing import Tracer
+    tracer = Tracer.shared()
+    if args.trace_file:
+        tracer.export, tracer.path = "file", args.trace_file
+    
+    with tracer.span("pipeline.run", query=args.query, article_count=args.count) as run_span:
+        if args.batch:
+            from src.services.batch_client import get_batch_service
+            detector = pipeline.orchestrator.detector
+            try:
+                service = get_batch_service(detector.provider, detector.model_name, args.batch_service)
+            except ValueError as e:
+                print(f"Batch mode unavailable: {e} (use --batch-service local for a dry run)")
+                service = None
+            results = await pipeline.run_batch_pipeline(article_count=args.count, service=service) if service else None
+        elif args.resume:
+            results = await pipeline.run_resume_pipeline(batch_size=args.count)
+        else:
+            results = await pipeline.run_full_pipeline(
+                query=args.query,
+                article_count=args.count
+            )
+    
+    if cassette is not None:
+        print(f"Cassette {cassette.mode}: {cassette.counts}")
+    
+    if tracer.enabled:
+        print(f"Trace {run_span.trace_id} exported ({tracer.path if tracer.export == 'file' else tracer.otlp_endpoint})")
     
     if results:
         print("Pipeline completed successfully")
@@ -221,6 +439,9 @@ async def main():
             print(f"  Some analyses used fallbacks: {len(real_analyses)}/{len(results)} real")
     else:
         print("Pipeline failed")
+    
+    from src.services.metrics import export_cli_metrics
+    export_cli_metrics(args.metrics_file, args.metrics_push)
 
 
 if __name__ == "__main__":
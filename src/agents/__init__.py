@@ -3,11 +3,17 @@
 from .detector import BiasDetector
 from .explainer import BiasExplainer
 from .rewriter import ArticleRewriter
+from .fused_analyzer import FusedAnalyzer
 from .orchestrator import BiasAnalysisOrchestrator
+from .scheduler import AnalysisScheduler
+from .job_runner import JobRunner
 
 __all__ = [
     "BiasDetector",
     "BiasExplainer", 
     "ArticleRewriter",
-    "BiasAnalysisOrchestrator"
+    "FusedAnalyzer",
+    "BiasAnalysisOrchestrator",
+    "AnalysisScheduler",
+    "JobRunner"
 ]
\ No newline at end of file
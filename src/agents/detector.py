@@ -1,85 +1,146 @@
 # src/agents/detector.py
 
 import asyncio
-import json
-from typing import Dict, Any
-from src.services.model_factory import ModelFactory, ProviderType
+import os
+import re
+from typing import Dict, Any, List, Optional, Tuple
+from src.services.llm_gateway import LLMGateway
+from src.services.metrics import PipelineMetrics
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.structured_output import BIAS_ANALYSIS_SCHEMA, load_json_object, parse_structured
 
 
 class BiasDetector:
-    def __init__(self):
-        self.client, self.model_name, self.provider = ModelFactory.get_model()
+    SYSTEM_PROMPT = "You are an expert media bias analyst. Analyze articles for specific, rewritable biases and return valid JSON."
+    
+    # Articles longer than this are analyzed as paragraph-aligned chunks
+    CHUNK_CHARS = int(os.getenv("DETECTION_CHUNK_CHARS", "6000"))
+    SCORE_FIELDS = ['emotional_bias_score', 'framing_bias_score', 'omission_bias_score', 'overall_bias_score']
+
+    def __init__(self, hedge: Optional[bool] = None, model: Optional[Tuple[Any, str, ProviderType]] = None):
+        # `model` pins a specific (client, model_name, provider), e.g. the cascade's triage model
+        self.client, self.model_name, self.provider = model or ProviderRegistry.get_model()
+        self.llm = LLMGateway(self.client, self.model_name, self.provider)
+        # Opt-in: duplicate slow detection calls to a second provider
+        self.hedge = hedge if hedge is not None else os.getenv("LLM_HEDGE_DETECTION", "false").lower() == "true"
     
     async def detect_biases(self, article_text: str) -> Dict[str, Any]:
         """Async bias detection with provider-specific handling."""
         if not article_text or len(article_text.strip()) < 10:
-            return self._get_fallback_response()
+            return self._fallback("empty_article")
+        
+        chunks = self._split_into_chunks(article_text)
+        if len(chunks) > 1:
+            return await self._detect_chunked(chunks)
         
         prompt = self._create_bias_analysis_prompt(article_text)
         
         try:
-            if self.provider == ProviderType.GROQ:
-                return await self._analyze_chat_completion(prompt)
-            elif self.provider == ProviderType.GEMINI:
-                return await self._analyze_gemini(prompt)
-            elif self.provider == ProviderType.CLAUDE:
-                return await self._analyze_claude(prompt)
-            else:
-                return self._get_fallback_response()
+            return await self._analyze(prompt)
         except Exception as e:
             print(f"Bias detection failed: {e}")
-            return self._get_fallback_response()
+            return self._fallback("llm_error")
     
-    async def _analyze_chat_completion(self, prompt: str) -> Dict[str, Any]:
-        """Analysis for Groq chat completion APIs."""
-        response = await asyncio.get_event_loop().run_in_executor(
-            None, 
-            lambda: self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert media bias analyst. Analyze articles for specific, rewritable biases and return valid JSON."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
+    async def _detect_chunked(self, chunks: List[str]) -> Dict[str, Any]:
+        """Analyze chunks concurrently and merge them into one result."""
+        responses = await asyncio.gather(
+            *[self._analyze(self._create_bias_analysis_prompt(chunk)) for chunk in chunks],
+            return_exceptions=True
         )
         
-        result_text = response.choices[0].message.content
-        if result_text is None:
-            return self._get_fallback_response()
+        fallback = self._get_fallback_response()
+        analyzed = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                print(f"Chunk analysis failed: {response}")
+            elif response != fallback:
+                analyzed.append((chunk, response))
         
-        return self._extract_json(result_text)
+        if not analyzed:
+            return fallback
+        
+        print(f"Merged bias analysis from {len(analyzed)}/{len(chunks)} chunks")
+        return self._merge_chunk_results(analyzed)
     
-    async def _analyze_gemini(self, prompt: str) -> Dict[str, Any]:
-        """Analysis for Gemini client."""
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.client.generate_content(prompt)
-        )
-        return self._extract_json(response.text)
+    def _merge_chunk_results(self, analyzed: List[tuple]) -> Dict[str, Any]:
+        """Length-weighted scores, de-duplicated phrases and joined summaries."""
+        total_length = sum(len(chunk) for chunk, _ in analyzed)
+        merged = {}
+        
+        for field in self.SCORE_FIELDS:
+            weighted = 0.0
+            for chunk, result in analyzed:
+                try:
+                    score = float(result.get(field, 0))
+                except (TypeError, ValueError):
+                    score = 0.0
+                weighted += score * len(chunk)
+            merged[field] = round(weighted / total_length)
+        
+        seen = set()
+        merged["biased_phrases"] = []
+        for _, result in analyzed:
+            for phrase in result.get("biased_phrases", []) or []:
+                key = str(phrase.get("text", "")).strip().lower()
+                if key and key not in seen:
+                    seen.add(key)
+                    merged["biased_phrases"].append(phrase)
+        
+        summaries = [result.get("summary", "") for _, result in analyzed if result.get("summary")]
+        merged["summary"] = " ".join(summaries)
+        return merged
+    
+    def _split_into_chunks(self, article_text: str) -> List[str]:
+        """Split on paragraph boundaries into chunks of at most CHUNK_CHARS."""
+        if len(article_text) <= self.CHUNK_CHARS:
+            return [article_text]
+        
+        paragraphs = []
+        for paragraph in re.split(r"\n\s*\n|\n", article_text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if len(paragraph) <= self.CHUNK_CHARS:
+                paragraphs.append(paragraph)
+                continue
+            # A single oversized paragraph is split on sentence boundaries
+            current = ""
+            for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+                if current and len(current) + len(sentence) + 1 > self.CHUNK_CHARS:
+                    paragraphs.append(current)
+                    current = ""
+                current = f"{current} {sentence}".strip()
+            if current:
+                paragraphs.append(current)
+        
+        chunks = []
+        current = ""
+        for paragraph in paragraphs:
+            if current and len(current) + len(paragraph) + 2 > self.CHUNK_CHARS:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append(current)
+        
+        return chunks
     
-    async def _analyze_claude(self, prompt: str) -> Dict[str, Any]:
-        """Analysis for Claude client."""
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.client.messages.create(
-                model=self.model_name,
-                max_tokens=2000,
-                temperature=0.1,
-                system="You are an expert media bias analyst. Always respond with valid JSON.",
-                messages=[{"role": "user", "content": prompt}]
-            )
+    async def _analyze(self, prompt: str) -> Dict[str, Any]:
+        """Run the analysis prompt through the provider gateway."""
+        result_text = await self.llm.complete(
+            prompt,
+            system=self.SYSTEM_PROMPT,
+            max_tokens=2000,
+            temperature=0.1,
+            hedge=self.hedge,
+            stage="detect",
+            schema=BIAS_ANALYSIS_SCHEMA
         )
         
-        result_text = response.content[0].text
+        if result_text is None:
+            return self._fallback("empty_response")
+        
         return self._extract_json(result_text)
         
     def _create_bias_analysis_prompt(self, article_text: str) -> str:
@@ -117,49 +178,26 @@ class BiasDetector:
         """
     
     def _extract_json(self, text: str) -> Dict[str, Any]:
-        """More robust JSON extraction from LLM responses."""
-        if not text:
-            return self._get_fallback_response()
-        
-        try:
-            # Clean the response text
-            cleaned = text.strip()
-            
-            # Remove markdown code blocks if present
-            if cleaned.startswith('```json'):
-                cleaned = cleaned[7:]
-            if cleaned.startswith('```'):
-                cleaned = cleaned[3:]
-            if cleaned.endswith('```'):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
-            
-            # Find JSON object
-            start = cleaned.find('{')
-            end = cleaned.rfind('}') + 1
-            
-            if start == -1 or end == 0:
-                print(f"No JSON object found in: {cleaned[:100]}...")
-                return self._get_fallback_response()
-                
-            json_str = cleaned[start:end]
-            result = json.loads(json_str)
-            
-            # Validate required fields
-            required = ['emotional_bias_score', 'framing_bias_score', 'overall_bias_score']
-            if all(field in result for field in required):
-                return result
-            else:
-                print(f"Missing required fields in: {result}")
-                return self._get_fallback_response()
-                
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            print(f"Problematic text: {text[:200]}...")
-            return self._get_fallback_response()
-        except Exception as e:
-            print(f"JSON extraction error: {e}")
-            return self._get_fallback_response()
+        """Parse the analysis, repairing near misses against the shared schema."""
+        result, status = parse_structured(text, BIAS_ANALYSIS_SCHEMA)
+        if result is None:
+            print(f"Unusable analysis response: {(text or '')[:100]}...")
+            return self._fallback("unparseable")
+        return result
+    
+    def _parse_json_object(self, text: str) -> Optional[Dict[str, Any]]:
+        """Pull the JSON object out of an LLM response; None when there is none."""
+        return load_json_object(text)
+    
+    def _is_valid_analysis(self, result: Dict[str, Any]) -> bool:
+        """Validate required fields"""
+        required = ['emotional_bias_score', 'framing_bias_score', 'overall_bias_score']
+        return all(field in result for field in required)
+
+    def _fallback(self, reason: str) -> Dict[str, Any]:
+        """The fallback response, counted by why it was needed."""
+        PipelineMetrics.shared().inc("bias_analysis_fallbacks_total", reason=reason)
+        return self._get_fallback_response()
 
     def _get_fallback_response(self) -> Dict[str, Any]:
         """Return a fallback response when analysis fails."""
@@ -1,12 +1,16 @@
 # src/agents/explainer.py
 
-import asyncio
-from src.services.model_factory import ModelFactory, ProviderType
+from typing import Any, Optional, Tuple
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
 
 
 class BiasExplainer:
-    def __init__(self):
-        self.client, self.model_name, self.provider = ModelFactory.get_model()
+    def __init__(self, model: Optional[Tuple[Any, str, ProviderType]] = None):
+        # `model` pins a specific (client, model_name, provider), e.g. the cascade's triage model
+        self.client, self.model_name, self.provider = model or ProviderRegistry.get_model()
+        self.llm = LLMGateway(self.client, self.model_name, self.provider)
     
     async def explain_biases(self, bias_analysis: dict) -> str:
         """Generate educational explanation of detected biases."""
@@ -24,35 +28,7 @@ class BiasExplainer:
         """
         
         try:
-            if self.provider == ProviderType.GROQ:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=500,
-                        temperature=0.3
-                    )
-                )
-                return response.choices[0].message.content or "Unable to generate explanation."
-            elif self.provider == ProviderType.GEMINI:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.generate_content(prompt)
-                )
-                return response.text
-            elif self.provider == ProviderType.CLAUDE:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.messages.create(
-                        model=self.model_name,
-                        max_tokens=500,
-                        temperature=0.3,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                )
-                return response.content[0].text
-            else:
-                return "Unable to generate explanation at this time."
+            explanation = await self.llm.complete(prompt, max_tokens=500, temperature=0.3, stage="explain")
+            return explanation or "Unable to generate explanation."
         except Exception as e:
             return "Unable to generate explanation at this time."
\ No newline at end of file
@@ -0,0 +1,59 @@
+# src/agents/fused_analyzer.py
+
+from typing import Dict, Any, Optional
+from src.agents.detector import BiasDetector
+from src.services.structured_output import FUSED_ANALYSIS_SCHEMA
+
+
+class FusedAnalyzer:
+    """
+    Detection, rewrite, retitle and explanation in a single LLM request.
+    
+    Shares the detector's gateway and JSON parsing; the orchestrator checks
+    each returned field and re-runs only the stages whose output is unusable.
+    """
+    
+    def __init__(self, detector: BiasDetector):
+        self.detector = detector
+        self.llm = detector.llm
+    
+    async def analyze(self, article_text: str, original_title: str = "") -> Optional[Dict[str, Any]]:
+        """Return the parsed fused response, or None when no JSON object came back."""
+        prompt = self._create_fused_prompt(article_text, original_title)
+        
+        try:
+            result_text = await self.llm.complete(
+                prompt,
+                system=self.detector.SYSTEM_PROMPT,
+                max_tokens=self._max_tokens(article_text),
+                temperature=0.1,
+                hedge=self.detector.hedge,
+                stage="fused",
+                schema=FUSED_ANALYSIS_SCHEMA
+            )
+        except Exception as e:
+            print(f"Fused analysis failed: {e}")
+            return None
+        
+        return self.detector._parse_json_object(result_text)
+    
+    def _max_tokens(self, article_text: str) -> int:
+        """
+        Room for the analysis and explanation plus a rewrite about as long as
+        the article (~4 characters per token), so one call does not claim a
+        whole Groq TPM budget.
+        """
+        return min(4000, 1200 + len(article_text) // 3)
+    
+    def _create_fused_prompt(self, article_text: str, original_title: str) -> str:
+        # The detector's own prompt, so the analysis half cannot drift from it
+        return f"""{self.detector._create_bias_analysis_prompt(article_text)}
+        HEADLINE: {original_title}
+
+        Then, in the same JSON object, also return:
+        - "neutral_text": the complete article rewritten in a neutral, objective tone, keeping
+          ALL facts, dates, numbers and names, and the original length and structure
+        - "neutral_title": the headline rewritten to be neutral and factual (under 80 characters if possible)
+        - "explanation": an educational explanation of the detected biases for general readers
+          in 2-3 short paragraphs
+        """
@@ -0,0 +1,108 @@
+# src/agents/job_runner.py
+
+import asyncio
+import os
+import socket
+import uuid
+from typing import Any, Dict, List, Optional
+from src.agents.scheduler import AnalysisScheduler
+from src.database import job_queue
+from src.database.news_db import add_bias
+from src.services.tracing import run_in_thread
+
+
+class JobRunner:
+    """
+    Analyzes jobs from the durable queue (analysis_jobs).
+
+    Each claimed job carries the stage outputs an earlier attempt already
+    paid for; the orchestrator skips those stages and checkpoints new ones
+    as they finish. A finished job is written to data_news before it is
+    marked done, so a crash at any point leaves it to be resumed, not lost.
+    While a batch runs, a heartbeat renews every claimed lease, so jobs still
+    waiting for a concurrency slot are not taken over by another worker.
+    Queue and data_news writes run in the executor: with several processes
+    on one database they can wait on its lock, and the loop must not.
+    """
+
+    def __init__(self, scheduler: AnalysisScheduler, worker_id: str = None, lease_seconds: float = None):
+        self.scheduler = scheduler
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds or job_queue.LEASE_SECONDS
+
+    async def run_jobs(
+        self,
+        limit: int,
+        priority: int = AnalysisScheduler.BACKGROUND,
+        job_ids: Optional[List[int]] = None,
+        deadline_seconds: Optional[float] = None,
+        retry_dropped: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Claim up to `limit` jobs (optionally only `job_ids`) and analyze them.
+        Jobs dropped by `deadline_seconds` go back to pending for a worker to
+        retry, or are cancelled when `retry_dropped` is False (no worker
+        would ever claim them).
+        """
+        jobs = await run_in_thread(job_queue.claim_jobs, self.worker_id, limit, self.lease_seconds, job_ids=job_ids)
+        if not jobs:
+            return []
+
+        resumed = [job for job in jobs if job["checkpoints"]]
+        print(f"Claimed {len(jobs)} jobs ({len(resumed)} resuming from checkpoints)")
+
+        articles = [{"title": job["title"], "body": job["body"], "source": job["source"]} for job in jobs]
+        checkpoints = [job_queue.StageCheckpoints(job["id"], self.worker_id, job["checkpoints"], self.lease_seconds) for job in jobs]
+        heartbeat = asyncio.create_task(self._heartbeat([job["id"] for job in jobs]))
+        try:
+            results = await self.scheduler.run(articles, priority=priority, deadline_seconds=deadline_seconds,
+                                               checkpoints=checkpoints)
+        finally:
+            heartbeat.cancel()
+
+        for job, result in zip(jobs, results):
+            await run_in_thread(self._settle, job, result, retry_dropped)
+        return results
+
+    async def _heartbeat(self, job_ids: List[int]):
+        """Renew the leases of `job_ids` every third of the lease until cancelled."""
+        held = set(job_ids)
+        while held:
+            await asyncio.sleep(self.lease_seconds / 3)
+            for job_id in list(held):
+                renewed = await run_in_thread(job_queue.renew_lease, job_id, self.worker_id, self.lease_seconds)
+                if not renewed:
+                    print(f"Lease on job {job_id} lost")
+                    held.discard(job_id)
+
+    async def drain(self, batch_size: int, priority: int = AnalysisScheduler.BACKGROUND) -> List[Dict[str, Any]]:
+        """Run claimable jobs batch by batch until none are left (failed retries included)."""
+        results = []
+        while True:
+            batch = await self.run_jobs(batch_size, priority)
+            if not batch:
+                return results
+            results.extend(batch)
+
+    def _settle(self, job: Dict[str, Any], result: Dict[str, Any], retry_dropped: bool = True):
+        """Persist a finished job and mark it done, or fail it back to the queue."""
+        if result.get("dropped") and not retry_dropped:
+            job_queue.cancel_job(job["id"], self.worker_id, result["error"])
+            return
+        if "error" in result:
+            job_queue.fail_job(job["id"], self.worker_id, result["error"])
+            return
+        if not self._persist(job, result):
+            job_queue.fail_job(job["id"], self.worker_id, "empty analysis or neutral version")
+            return
+        job_queue.complete_job(job["id"], self.worker_id, result)
+
+    def _persist(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """Write the result to data_news; False (job should be retried) when it is empty."""
+        analysis = result.get("analysis", {})
+        neutral_version = result.get("neutral_version", "")
+        if not analysis or not neutral_version:
+            print(f"Empty analysis for: {job['title'][:50]}...")
+            return False
+        add_bias([{"title": job["title"], "bias": str(analysis), "rewritten_article": neutral_version}])
+        return True
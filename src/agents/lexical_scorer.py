@@ -0,0 +1,218 @@
+# src/agents/lexical_scorer.py
+
+import ast
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.database.news_db import get_analyzed_articles
+
+
+LEXICON_PATH = os.getenv("LEXICON_PATH", "data/cache/bias_lexicon.json")
+
+# "analyzed_by" of analyses the pre-scorer made up itself; never LLM labels
+PRESCORE_SOURCE = "lexical_prescore"
+PRESCORE_SUMMARY_PREFIX = "Marked neutral by the lexical pre-scorer"
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9']+", (text or "").lower())
+
+
+def _ngrams(tokens: List[str], max_n: int) -> List[str]:
+    return [
+        " ".join(tokens[i:i + n])
+        for n in range(1, max_n + 1)
+        for i in range(len(tokens) - n + 1)
+    ]
+
+
+def parse_stored_analysis(bias: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Stored analyses are str(dict); None for unreadable, fallback or pre-scored analyses."""
+    if not bias:
+        return None
+    try:
+        analysis = ast.literal_eval(bias)
+    except (ValueError, SyntaxError):
+        return None
+    if not isinstance(analysis, dict) or 'overall_bias_score' not in analysis:
+        return None
+    summary = str(analysis.get('summary', ''))
+    if 'fallback' in summary.lower():
+        return None
+    # Training on (or grading against) the pre-scorer's own guesses would reinforce them
+    if analysis.get('analyzed_by') == PRESCORE_SOURCE or summary.startswith(PRESCORE_SUMMARY_PREFIX):
+        return None
+    return analysis
+
+
+class LexicalPreScorer:
+    """
+    Cheap bias estimate from a loaded-term lexicon, run before detect_biases.
+
+    The lexicon is learned from the biased_phrases of stored LLM analyses:
+    each term's weight is the share of articles containing it where the
+    detector flagged it, scaled by those articles' mean overall score. An
+    article's score is its weighted term hits per 100 words (times SCALE),
+    capped at 100, computed for many articles at once as a matrix product.
+    """
+
+    MAX_NGRAM = 4
+    MIN_FLAGGED = int(os.getenv("LEXICON_MIN_FLAGGED", "2"))
+    SCALE = float(os.getenv("LEXICAL_SCALE", "10"))
+    # LLM overall scores at or above this count as "biased" in the precision report
+    BIASED_LABEL_SCORE = float(os.getenv("LEXICAL_BIASED_LABEL_SCORE", "20"))
+
+    def __init__(self, path: str = LEXICON_PATH, lexicon: Optional[Dict[str, float]] = None):
+        self.path = path
+        if lexicon is None:
+            lexicon = self._load()
+        self._set_lexicon(lexicon)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.terms) > 0
+
+    def _set_lexicon(self, lexicon: Dict[str, float]):
+        self.terms = sorted(lexicon)
+        self.index = {term: i for i, term in enumerate(self.terms)}
+        self.weights = np.array([lexicon[term] for term in self.terms], dtype=np.float64)
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("terms", {})
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def build_lexicon(cls, articles: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Term weights from articles with parsed analyses ({"body", "analysis"})."""
+        flagged: Dict[str, List[float]] = {}
+        for article in articles:
+            score = float(article["analysis"].get('overall_bias_score', 0) or 0)
+            phrases = {
+                " ".join(_tokens(p.get('text', '')))
+                for p in article["analysis"].get('biased_phrases', []) or []
+                if isinstance(p, dict)
+            }
+            for term in phrases:
+                if term and len(term.split()) <= cls.MAX_NGRAM:
+                    flagged.setdefault(term, []).append(score)
+
+        candidates = {term for term, scores in flagged.items() if len(scores) >= cls.MIN_FLAGGED}
+        containing = dict.fromkeys(candidates, 0)
+        for article in articles:
+            for term in candidates.intersection(_ngrams(_tokens(article["body"]), cls.MAX_NGRAM)):
+                containing[term] += 1
+
+        lexicon = {}
+        for term in candidates:
+            flag_rate = len(flagged[term]) / max(containing[term], len(flagged[term]))
+            mean_score = sum(flagged[term]) / len(flagged[term])
+            lexicon[term] = round(flag_rate * mean_score / 100, 4)
+        return lexicon
+
+    @staticmethod
+    def labeled_articles() -> List[Dict[str, Any]]:
+        """Stored articles whose LLM analysis can serve as a label."""
+        labeled = []
+        for row in get_analyzed_articles():
+            analysis = parse_stored_analysis(row["bias"])
+            if analysis is not None and row["body"]:
+                labeled.append({"id": row["id"], "body": row["body"], "analysis": analysis})
+        return labeled
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Relearn the lexicon from every stored analysis and save it."""
+        articles = self.labeled_articles()
+        lexicon = self.build_lexicon(articles)
+        self._set_lexicon(lexicon)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"articles": len(articles), "terms": lexicon}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+        return {"articles": len(articles), "terms": len(lexicon)}
+
+    def score_many(self, texts: List[str]) -> np.ndarray:
+        """Pre-scores (0-100) for a batch of articles."""
+        counts = np.zeros((len(texts), len(self.terms)), dtype=np.float64)
+        lengths = np.ones(len(texts), dtype=np.float64)
+
+        for row, text in enumerate(texts):
+            tokens = _tokens(text)
+            lengths[row] = max(len(tokens), 1)
+            hits = [self.index[gram] for gram in _ngrams(tokens, self.MAX_NGRAM) if gram in self.index]
+            if hits:
+                np.add.at(counts[row], hits, 1.0)
+
+        return np.minimum(100.0, (counts @ self.weights) / lengths * 100 * self.SCALE)
+
+    def score(self, text: str) -> float:
+        return float(self.score_many([text])[0])
+
+    def precision_report(self, neutral_below: float, holdout_every: int = 5) -> Dict[str, Any]:
+        """
+        Compare pre-scores with stored LLM labels.
+
+        The lexicon is rebuilt in memory from all but every `holdout_every`-th
+        article and evaluated on the held-out ones, so the numbers are not
+        inflated by scoring the articles the terms were learned from.
+        """
+        articles = self.labeled_articles()
+        train = [a for i, a in enumerate(articles) if i % holdout_every]
+        test = [a for i, a in enumerate(articles) if not i % holdout_every]
+
+        scorer = LexicalPreScorer(self.path, lexicon=self.build_lexicon(train))
+        if not test or not scorer.ready:
+            return {"train": len(train), "test": len(test), "terms": len(scorer.terms)}
+
+        scores = scorer.score_many([a["body"] for a in test])
+        llm_scores = np.array([float(a["analysis"].get('overall_bias_score', 0) or 0) for a in test])
+        llm_biased = llm_scores >= self.BIASED_LABEL_SCORE
+        predicted_neutral = scores < neutral_below
+
+        def ratio(numerator, denominator) -> Optional[float]:
+            return round(float(numerator) / float(denominator), 3) if denominator else None
+
+        correlation = None
+        if len(test) > 1 and scores.std() > 0 and llm_scores.std() > 0:
+            correlation = round(float(np.corrcoef(scores, llm_scores)[0, 1]), 3)
+
+        return {
+            "train": len(train),
+            "test": len(test),
+            "terms": len(scorer.terms),
+            "neutral_below": neutral_below,
+            "predicted_neutral": int(predicted_neutral.sum()),
+            # Of the articles we would skip, how many the LLM also found neutral
+            "neutral_precision": ratio((predicted_neutral & ~llm_biased).sum(), predicted_neutral.sum()),
+            "biased_precision": ratio((~predicted_neutral & llm_biased).sum(), (~predicted_neutral).sum()),
+            "biased_recall": ratio((~predicted_neutral & llm_biased).sum(), llm_biased.sum()),
+            "correlation": correlation
+        }
+
+
+def print_lexicon_report(neutral_below: float):
+    """Print the pre-scorer precision report for the CLI."""
+    report = LexicalPreScorer().precision_report(neutral_below)
+
+    print("Lexical Pre-Scorer Report")
+    print("=" * 50)
+    print(f"  Lexicon learned from {report['train']} articles, {report['terms']} terms")
+    print(f"  Evaluated on {report['test']} held-out articles")
+    if "predicted_neutral" not in report:
+        print("  Not enough labeled articles to evaluate")
+        return report
+
+    print(f"  Marked neutral (score < {neutral_below}): {report['predicted_neutral']}")
+    print(f"  Neutral precision: {report['neutral_precision']}")
+    print(f"  Biased precision: {report['biased_precision']}, recall: {report['biased_recall']}")
+    print(f"  Correlation with LLM overall score: {report['correlation']}")
+    return report
@@ -1,40 +1,316 @@
 # src/agents/orchestrator.py
 
 import asyncio
-from typing import Dict, Any, List
+import contextvars
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from src.agents.detector import BiasDetector
 from src.agents.rewriter import ArticleRewriter
 from src.agents.explainer import BiasExplainer
+from src.agents.fused_analyzer import FusedAnalyzer
+from src.agents.lexical_scorer import PRESCORE_SOURCE, PRESCORE_SUMMARY_PREFIX, LexicalPreScorer
+from src.database.job_queue import StageCheckpoints
+from src.database.news_db import get_content_hash
+from src.services.batch_client import BatchService, get_batch_service
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.services.llm_context import article_context
+from src.services.metrics import PipelineMetrics
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.tracing import Tracer
+
+
+# Stage outputs of the job being analyzed, so a resumed job skips paid-for stages
+_stage_checkpoints: contextvars.ContextVar[Optional[StageCheckpoints]] = contextvars.ContextVar(
+    "stage_checkpoints", default=None
+)
 
 
 class BiasAnalysisOrchestrator:
-    def __init__(self, max_concurrent: int = 2):
-        self.detector = BiasDetector()
-        self.rewriter = ArticleRewriter()
+    # Fused-response keys that are not part of the bias analysis itself
+    FUSED_OUTPUT_FIELDS = ('neutral_text', 'neutral_title', 'explanation')
+    
+    def __init__(
+        self,
+        hedge_detection: Optional[bool] = None,
+        fused: Optional[bool] = None,
+        cascade: Optional[bool] = None,
+        rewrite_mode: Optional[str] = None,
+        prescore: Optional[bool] = None,
+        concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+    ):
+        self.detector = BiasDetector(hedge=hedge_detection)
+        self.rewriter = ArticleRewriter(mode=rewrite_mode)
         self.explainer = BiasExplainer()
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.fused_analyzer = FusedAnalyzer(self.detector)
+        # Opt-in: one structured request per article instead of up to four
+        self.fused = fused if fused is not None else os.getenv("FUSED_ANALYSIS", "false").lower() == "true"
+        
+        # Opt-in cascade: a small model triages, only biased articles reach the main model
+        self.cascade = cascade if cascade is not None else os.getenv("MODEL_CASCADE", "false").lower() == "true"
+        self.triage_provider = ProviderType(os.getenv("CASCADE_TRIAGE_PROVIDER", "groq"))
+        self.triage_model = os.getenv("CASCADE_TRIAGE_MODEL", "llama-3.1-8b-instant")
+        self.escalate_threshold = float(os.getenv("CASCADE_ESCALATE_THRESHOLD", "40"))
+        self.neutral_threshold = float(os.getenv("CASCADE_NEUTRAL_THRESHOLD", "15"))
+        self.tier_counts = {"neutral": 0, "triage": 0, "escalated": 0}
+        self._triage_detector = None
+        self._triage_rewriter = None
+        self._triage_explainer = None
+        
+        # Opt-in lexical pre-scorer: skip or cheapen detection for low-scoring articles
+        self.prescorer = None
+        if prescore if prescore is not None else os.getenv("LEXICAL_PRESCORE", "false").lower() == "true":
+            self.prescorer = LexicalPreScorer()
+            if not self.prescorer.ready:
+                print("Lexical pre-scorer disabled: no lexicon built yet (run main.py --rebuild-lexicon)")
+                self.prescorer = None
+        self.prescore_neutral_below = float(os.getenv("LEXICAL_NEUTRAL_SCORE", "5"))
+        self.prescore_cheap_below = float(os.getenv("LEXICAL_CHEAP_SCORE", "20"))
+        self.prescore_counts = {"neutral": 0, "cheap": 0, "full": 0}
+        
+        # Articles in flight adapt to provider load (AIMD), fed by the LLM gateway
+        self.concurrency = concurrency or AdaptiveConcurrencyLimiter.shared()
     
-    async def analyze_article(self, article_text: str, original_title: str = "", source: str = "unknown") -> Dict[str, Any]:
-        async with self.semaphore:
-            bias_analysis = await self.detector.detect_biases(article_text)
-            neutral_text = await self.rewriter.rewrite_neutral(article_text, bias_analysis)
-            
-            neutral_title = original_title
-            if original_title and bias_analysis.get('overall_bias_score', 0) > 20:
-                neutral_title = await self.rewriter.rewrite_title_neutral(original_title, bias_analysis)
-            
-            explanation = await self.explainer.explain_biases(bias_analysis)
+    async def analyze_article(
+        self,
+        article_text: str,
+        original_title: str = "",
+        source: str = "unknown",
+        schedule_key: Tuple = (0,),
+        deadline: Optional[float] = None,
+        checkpoints: Optional[StageCheckpoints] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze one article once a concurrency slot is free.
+        
+        Args:
+            schedule_key: Slot priority, lower first (see AnalysisScheduler)
+            deadline: time.monotonic() by which the article must have started,
+                else DeadlineExceeded is raised without any LLM call
+            checkpoints: Stage outputs saved by an earlier attempt of a queued job
+        """
+        article_hash = get_content_hash(original_title, article_text)
+        tracer = Tracer.shared()
+        with tracer.span("analyze_article", article_hash=article_hash, title=original_title[:120], source=source,
+                         resumed_stages=len(checkpoints.outputs) if checkpoints else None):
+            # Time spent queued behind other articles, apart from the analysis itself
+            with tracer.span("concurrency.wait", priority=schedule_key[0] if schedule_key else None):
+                await self.concurrency.acquire(schedule_key, deadline)
+            token = _stage_checkpoints.set(checkpoints)
+            try:
+                with article_context(article_hash), PipelineMetrics.shared().time_step("analyze"):
+                    if self.prescorer is not None:
+                        routed = await self._route_by_prescore(article_text, original_title, source)
+                        if routed is not None:
+                            return routed
+                    
+                    if self.cascade and self._get_triage_detector() is not None:
+                        return await self._analyze_cascaded(article_text, original_title, source)
+                    return await self._analyze_with_main_model(article_text, original_title, source)
+            finally:
+                _stage_checkpoints.reset(token)
+                self.concurrency.release()
+    
+    async def _stage(self, name: str, run: Callable[[], Awaitable[Any]]) -> Any:
+        """Output of one pipeline stage: from the job's checkpoints if saved, else run and save it."""
+        checkpoints = _stage_checkpoints.get()
+        with Tracer.shared().span(f"stage.{name}") as span:
+            if checkpoints is not None and name in checkpoints.outputs:
+                span.set_attributes(checkpointed=True)
+                return checkpoints.outputs[name]
             
-            return {
-                "original_text": article_text,
-                "original_title": original_title,
-                "neutral_version": neutral_text,
-                "neutral_title": neutral_title,
-                "analysis": bias_analysis,
-                "explanation": explanation,
-                "source": source,
-                "rewrite_quality": self._assess_rewrite_quality(article_text, neutral_text)
+            output = await run()
+            if checkpoints is not None:
+                await checkpoints.save_async(name, output)
+            return output
+    
+    async def _route_by_prescore(self, article_text: str, original_title: str, source: str) -> Optional[Dict[str, Any]]:
+        """
+        Handle low pre-scores without the main detector:
+        - below the neutral score: neutral result, no LLM call
+        - below the cheap score: the cascade's triage tier
+        Returns None for articles that need the normal path.
+        """
+        score = self.prescorer.score(article_text)
+        
+        if score < self.prescore_neutral_below:
+            self.prescore_counts["neutral"] += 1
+            rounded = round(score)
+            analysis = {
+                "emotional_bias_score": rounded,
+                "framing_bias_score": rounded,
+                "omission_bias_score": rounded,
+                "overall_bias_score": rounded,
+                "biased_phrases": [],
+                "summary": f"{PRESCORE_SUMMARY_PREFIX} (score {score:.1f}); no LLM analysis run",
+                "analyzed_by": PRESCORE_SOURCE
             }
+            return self._build_result(article_text, original_title, article_text, original_title, analysis, analysis["summary"], source)
+        
+        if score < self.prescore_cheap_below and self._get_triage_detector() is not None:
+            self.prescore_counts["cheap"] += 1
+            return await self._analyze_cascaded(article_text, original_title, source)
+        
+        self.prescore_counts["full"] += 1
+        return None
+    
+    async def _analyze_with_main_model(self, article_text: str, original_title: str, source: str) -> Dict[str, Any]:
+        # Long articles are chunked by the detector; keep those on the multi-call path
+        if self.fused and len(article_text) <= self.detector.CHUNK_CHARS:
+            return await self._analyze_fused(article_text, original_title, source)
+        return await self._analyze_separately(article_text, original_title, source)
+    
+    async def _analyze_cascaded(self, article_text: str, original_title: str, source: str) -> Dict[str, Any]:
+        """
+        Triage with the small model, then:
+        - neutral (score < neutral threshold): keep the original text and title
+        - triage (in between): rewrite and explain on the small model from the triage analysis
+        - escalated (score >= escalate threshold): full analysis on the main model
+        """
+        triage_analysis = await self._stage("triage_analysis", lambda: self._triage_detector.detect_biases(article_text))
+        score = triage_analysis.get('overall_bias_score', 0)
+        
+        if score >= self.escalate_threshold:
+            self.tier_counts["escalated"] += 1
+            if (self.triage_provider, self.triage_model) == (self.detector.provider, self.detector.model_name):
+                # Triage already ran on the main model; don't detect twice
+                return await self._finish_analysis(article_text, original_title, triage_analysis, source)
+            return await self._analyze_with_main_model(article_text, original_title, source)
+        
+        if score < self.neutral_threshold:
+            self.tier_counts["neutral"] += 1
+            explanation = triage_analysis.get('summary') or "No significant bias detected."
+            return self._build_result(article_text, original_title, article_text, original_title, triage_analysis, explanation, source)
+        
+        self.tier_counts["triage"] += 1
+        return await self._finish_analysis(article_text, original_title, triage_analysis, source,
+                                           rewriter=self._triage_rewriter, explainer=self._triage_explainer)
+    
+    def _get_triage_detector(self) -> Optional[BiasDetector]:
+        """
+        Detector pinned to the triage model (with a rewriter and explainer on
+        the same model); None (cascade off) when it cannot be built.
+        """
+        if self._triage_detector is None:
+            try:
+                model = ProviderRegistry.get_pinned_model(self.triage_provider, self.triage_model)
+            except Exception as e:
+                model = None
+                print(f"Triage model could not be built: {e}")
+            if model is None:
+                print(f"Cascade disabled, triage model {self.triage_model} unavailable")
+                self.cascade = False
+                return None
+            self._triage_detector = BiasDetector(hedge=False, model=model)
+            self._triage_rewriter = ArticleRewriter(mode=self.rewriter.mode, model=model)
+            self._triage_explainer = BiasExplainer(model=model)
+        return self._triage_detector
+    
+    def get_cascade_stats(self) -> Dict[str, Any]:
+        """Articles handled per cascade tier."""
+        total = sum(self.tier_counts.values())
+        stats = dict(self.tier_counts)
+        stats["total"] = total
+        stats["main_model_share"] = round(self.tier_counts["escalated"] / total, 3) if total else 0.0
+        return stats
+    
+    async def _analyze_separately(self, article_text: str, original_title: str, source: str) -> Dict[str, Any]:
+        bias_analysis = await self._stage("analysis", lambda: self.detector.detect_biases(article_text))
+        return await self._finish_analysis(article_text, original_title, bias_analysis, source)
+    
+    async def _finish_analysis(
+        self,
+        article_text: str,
+        original_title: str,
+        bias_analysis: Dict[str, Any],
+        source: str,
+        rewriter: Optional[ArticleRewriter] = None,
+        explainer: Optional[BiasExplainer] = None
+    ) -> Dict[str, Any]:
+        rewriter = rewriter or self.rewriter
+        explainer = explainer or self.explainer
+        # Body, title and explanation depend only on the analysis: run them together
+        neutral_text, neutral_title, explanation = await asyncio.gather(
+            self._stage("neutral_text", lambda: rewriter.rewrite_neutral(article_text, bias_analysis)),
+            self._stage("neutral_title", lambda: self._rewrite_title(original_title, bias_analysis, rewriter)),
+            self._stage("explanation", lambda: explainer.explain_biases(bias_analysis))
+        )
+        
+        return self._build_result(article_text, original_title, neutral_text, neutral_title, bias_analysis, explanation, source)
+    
+    async def _rewrite_title(self, original_title: str, bias_analysis: Dict[str, Any], rewriter: Optional[ArticleRewriter] = None) -> str:
+        rewriter = rewriter or self.rewriter
+        if original_title and bias_analysis.get('overall_bias_score', 0) >= rewriter.REWRITE_MIN_SCORE:
+            return await rewriter.rewrite_title_neutral(original_title, bias_analysis)
+        return original_title
+    
+    async def _analyze_fused(self, article_text: str, original_title: str, source: str) -> Dict[str, Any]:
+        """One fused request; fields that fail validation are re-run through their own agent."""
+        fused = await self._stage("fused", lambda: self.fused_analyzer.analyze(article_text, original_title))
+        if fused is None:
+            print("Fused analysis unusable, falling back to separate calls")
+            return await self._analyze_separately(article_text, original_title, source)
+        
+        if self.detector._is_valid_analysis(fused):
+            bias_analysis = {key: value for key, value in fused.items() if key not in self.FUSED_OUTPUT_FIELDS}
+        else:
+            print("Fused analysis re-running: analysis")
+            bias_analysis = await self._stage("analysis", lambda: self.detector.detect_biases(article_text))
+        
+        fields = {}
+        reruns = {}
+        
+        neutral_text = fused.get('neutral_text')
+        clean_text = self.rewriter._clean_text(neutral_text, article_text) if isinstance(neutral_text, str) else None
+        if clean_text is not None:
+            fields['neutral_text'] = clean_text
+        else:
+            reruns['neutral_text'] = self._stage("neutral_text", lambda: self.rewriter.rewrite_neutral(article_text, bias_analysis))
+        
+        fields['neutral_title'] = original_title
+        if original_title and bias_analysis.get('overall_bias_score', 0) >= self.rewriter.REWRITE_MIN_SCORE:
+            fused_title = fused.get('neutral_title')
+            clean_title = self.rewriter._clean_title(fused_title) if isinstance(fused_title, str) else None
+            if clean_title is not None:
+                fields['neutral_title'] = clean_title
+            else:
+                reruns['neutral_title'] = self._stage("neutral_title", lambda: self.rewriter.rewrite_title_neutral(original_title, bias_analysis))
+        
+        explanation = fused.get('explanation')
+        if isinstance(explanation, str) and explanation.strip():
+            fields['explanation'] = explanation
+        else:
+            reruns['explanation'] = self._stage("explanation", lambda: self.explainer.explain_biases(bias_analysis))
+        
+        if reruns:
+            print(f"Fused analysis re-running: {', '.join(reruns)}")
+            fields.update(zip(reruns, await asyncio.gather(*reruns.values())))
+        
+        return self._build_result(
+            article_text, original_title, fields['neutral_text'], fields['neutral_title'],
+            bias_analysis, fields['explanation'], source
+        )
+    
+    def _build_result(
+        self,
+        article_text: str,
+        original_title: str,
+        neutral_text: str,
+        neutral_title: str,
+        bias_analysis: Dict[str, Any],
+        explanation: str,
+        source: str
+    ) -> Dict[str, Any]:
+        return {
+            "original_text": article_text,
+            "original_title": original_title,
+            "neutral_version": neutral_text,
+            "neutral_title": neutral_title,
+            "analysis": bias_analysis,
+            "explanation": explanation,
+            "source": source,
+            "rewrite_quality": self._assess_rewrite_quality(article_text, neutral_text)
+        }
     
     async def analyze_multiple_articles(self, articles: List[Dict]) -> List[Dict[str, Any]]:
         tasks = []
@@ -57,6 +333,80 @@ class BiasAnalysisOrchestrator:
         
         return processed_results
     
+    async def analyze_articles_batch(self, articles: List[Dict], service: Optional[BatchService] = None) -> List[Dict[str, Any]]:
+        """
+        Offline bulk analysis through a provider batch API.
+        
+        Detection prompts go out as one batch, then rewrite prompts built from
+        those analyses as a second batch. Fallback analyses and scores below
+        the rewriter's REWRITE_MIN_SCORE (the online headline threshold) keep
+        their original text, as do rewrites that fail the online length
+        check. Titles and explanations are skipped; results have the same
+        shape as analyze_article.
+        """
+        if service is None:
+            service = get_batch_service(self.detector.provider, self.detector.model_name)
+        
+        texts = [article.get('body', '') for article in articles]
+        
+        detection_requests = [
+            {
+                "custom_id": f"detect-{i}",
+                "prompt": self.detector._create_bias_analysis_prompt(text),
+                "system": self.detector.SYSTEM_PROMPT,
+                "max_tokens": 2000,
+                "temperature": 0.1,
+                "json_mode": True
+            }
+            for i, text in enumerate(texts)
+        ]
+        detection_results = await service.run(detection_requests)
+        
+        analyses = []
+        for i in range(len(articles)):
+            result_text = detection_results.get(f"detect-{i}")
+            analyses.append(self.detector._extract_json(result_text) if result_text else self.detector._get_fallback_response())
+        
+        fallback = self.detector._get_fallback_response()
+        rewrite_requests = [
+            {
+                "custom_id": f"rewrite-{i}",
+                "prompt": self.rewriter._create_rewrite_prompt(text, analyses[i]),
+                "system": None,
+                "max_tokens": 4000,
+                "temperature": 0.1,
+                "json_mode": False
+            }
+            for i, text in enumerate(texts)
+            if analyses[i] != fallback and analyses[i].get('overall_bias_score', 0) >= self.rewriter.REWRITE_MIN_SCORE
+        ]
+        rewrite_results = await service.run(rewrite_requests) if rewrite_requests else {}
+        
+        results = []
+        for i, article in enumerate(articles):
+            # Same check as the fused path: an empty or implausibly sized rewrite keeps the original
+            neutral_text = self.rewriter._clean_text(rewrite_results.get(f"rewrite-{i}"), texts[i]) or texts[i]
+            results.append({
+                "original_text": texts[i],
+                "original_title": article.get('title', ''),
+                "neutral_version": neutral_text,
+                "neutral_title": article.get('title', ''),
+                "analysis": analyses[i],
+                "explanation": "",
+                "source": article.get('source', 'unknown'),
+                "rewrite_quality": self._assess_rewrite_quality(texts[i], neutral_text)
+            })
+        
+        return results
+    
+    def get_concurrency_stats(self) -> Dict[str, Any]:
+        """Current adaptive concurrency limit and its recent changes."""
+        return self.concurrency.snapshot()
+    
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """Hedge rate and wins for detection calls, for tuning the hedge percentile."""
+        return self.detector.llm.hedging.snapshot()
+    
     def _assess_rewrite_quality(self, original: str, rewritten: str) -> str:
         if original == rewritten:
             return "no_change"
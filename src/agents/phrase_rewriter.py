@@ -0,0 +1,138 @@
+# src/agents/phrase_rewriter.py
+
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+
+def _lower(text: str) -> str:
+    """Lowercase without changing the string length, so match offsets stay valid."""
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _clean_replacement(value: Any) -> str:
+    return str(value or "").strip().strip('"\'').strip()
+
+
+def match_case(source: str, replacement: str) -> str:
+    """Give the replacement the casing style of the text it replaces."""
+    if not replacement:
+        return replacement
+    letters = [c for c in source if c.isalpha()]
+    if len(letters) > 1 and all(c.isupper() for c in letters):
+        return replacement.upper()
+    if source[:1].isupper():
+        return replacement[0].upper() + replacement[1:]
+    if source[:1].islower() and replacement[:1].isupper() and not replacement[1:2].isupper():
+        return replacement[0].lower() + replacement[1:]
+    return replacement
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over case-insensitive phrases.
+
+    One pass over the text finds every occurrence of every phrase; matches
+    are reported as (start, end, phrase_index) offsets into the original text.
+    """
+
+    def __init__(self, phrases: List[str]):
+        self.phrases = phrases
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, phrase in enumerate(phrases):
+            self._add(_lower(phrase), index)
+        self._build_failure_links()
+
+    def _add(self, phrase: str, index: int):
+        state = 0
+        for char in phrase:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append(index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        matches = []
+        state = 0
+        for position, char in enumerate(_lower(text)):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                length = len(self.phrases[index])
+                matches.append((position + 1 - length, position + 1, index))
+        return matches
+
+    def find_words(self, text: str) -> List[Tuple[int, int, int]]:
+        """find_all without the matches inside longer words ("war" in "award")."""
+        return [match for match in self.find_all(text) if _on_word_boundary(text, match[0], match[1])]
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isalnum() and text[start].isalnum()) and not (after.isalnum() and text[end - 1].isalnum())
+
+
+def apply_phrase_replacements(text: str, biased_phrases: List[Dict[str, Any]]) -> Tuple[str, List[str]]:
+    """
+    Replace every detected phrase with its suggested replacement in one pass.
+
+    Overlapping matches resolve leftmost-longest, matches inside words are
+    ignored, and each replacement takes the casing of the text it replaces.
+
+    Returns:
+        (rewritten text, phrases with a replacement that were not found)
+    """
+    replacements = {}
+    for phrase in biased_phrases or []:
+        if not isinstance(phrase, dict):
+            continue
+        source = str(phrase.get('text') or "").strip()
+        replacement = _clean_replacement(phrase.get('suggested_replacement'))
+        if source and replacement and _lower(source) != _lower(replacement):
+            replacements.setdefault(_lower(source), (source, replacement))
+
+    if not replacements:
+        return text, []
+
+    keys = list(replacements)
+    matcher = PhraseMatcher([replacements[key][0] for key in keys])
+
+    candidates = sorted(matcher.find_words(text), key=lambda match: (match[0], match[0] - match[1]))
+    chosen = []
+    cursor = 0
+    for start, end, index in candidates:
+        if start >= cursor:
+            chosen.append((start, end, index))
+            cursor = end
+
+    found = {index for _, _, index in chosen}
+    missing = [replacements[key][0] for i, key in enumerate(keys) if i not in found]
+
+    parts = []
+    cursor = 0
+    for start, end, index in chosen:
+        parts.append(text[cursor:start])
+        parts.append(match_case(text[start:end], replacements[keys[index]][1]))
+        cursor = end
+    parts.append(text[cursor:])
+
+    return "".join(parts), missing
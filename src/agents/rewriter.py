@@ -1,49 +1,151 @@
 # src/agents/rewriter.py
 
 import asyncio
-from typing import Dict, Any
-from src.services.model_factory import ModelFactory, ProviderType
+import os
+import re
+from typing import Dict, Any, List, Optional, Tuple
+from src.agents.phrase_rewriter import PhraseMatcher, apply_phrase_replacements
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
 
 
 class ArticleRewriter:
-    def __init__(self):
-        self.client, self.model_name, self.provider = ModelFactory.get_model()
+    # llm: full-article regeneration; local: apply the detector's suggested replacements;
+    # paragraph: regenerate only the paragraphs that contain biased phrases
+    REWRITE_MODES = ('llm', 'local', 'paragraph')
+    # A rewrite far shorter or longer than the original dropped or invented content
+    MIN_LENGTH_RATIO = float(os.getenv("REWRITE_MIN_LENGTH_RATIO", "0.5"))
+    MAX_LENGTH_RATIO = float(os.getenv("REWRITE_MAX_LENGTH_RATIO", "1.6"))
+    # Below this overall score headlines are kept and batch runs skip the rewrite
+    REWRITE_MIN_SCORE = float(os.getenv("REWRITE_MIN_SCORE", "20"))
+    
+    def __init__(self, mode: Optional[str] = None, model: Optional[Tuple[Any, str, ProviderType]] = None):
+        # `model` pins a specific (client, model_name, provider), e.g. the cascade's triage model
+        self.client, self.model_name, self.provider = model or ProviderRegistry.get_model()
+        self.llm = LLMGateway(self.client, self.model_name, self.provider)
+        self.mode = (mode or os.getenv("REWRITE_MODE", "llm")).lower()
+        if self.mode not in self.REWRITE_MODES:
+            raise ValueError(f"Unknown rewrite mode: {self.mode}")
+        # Above this overall score local mode hands the article to the LLM
+        self.local_max_score = float(os.getenv("LOCAL_REWRITE_MAX_SCORE", "60"))
+        self.rewrite_counts = {"local": 0, "paragraph": 0, "llm": 0}
+        self.paragraphs_rewritten = 0
+        self.paragraphs_kept = 0
     
     async def rewrite_neutral(self, original_text: str, bias_analysis: dict) -> str:
         """Rewrite entire article using detected biases as guidance."""
+        if self.mode == 'local':
+            neutral_text = self._rewrite_locally(original_text, bias_analysis)
+            if neutral_text is not None:
+                self.rewrite_counts["local"] += 1
+                return neutral_text
+        elif self.mode == 'paragraph':
+            neutral_text = await self._rewrite_paragraphs(original_text, bias_analysis)
+            if neutral_text is not None:
+                self.rewrite_counts["paragraph"] += 1
+                return neutral_text
+        
+        self.rewrite_counts["llm"] += 1
+        return await self._rewrite_with_llm(original_text, bias_analysis)
+    
+    def _rewrite_locally(self, original_text: str, bias_analysis: dict) -> Optional[str]:
+        """Phrase-level rewrite; None when the article needs the LLM instead."""
+        if bias_analysis.get('overall_bias_score', 0) > self.local_max_score:
+            return None
+        
+        neutral_text, missing = apply_phrase_replacements(original_text, bias_analysis.get('biased_phrases', []))
+        if missing:
+            print(f"Local rewrite could not locate {len(missing)} phrase(s), using LLM rewrite")
+            return None
+        return neutral_text
+    
+    async def _rewrite_paragraphs(self, original_text: str, bias_analysis: dict) -> Optional[str]:
+        """
+        Rewrite only the paragraphs holding biased phrases, concurrently.
+        
+        An article with no phrases to target is returned unchanged; None (full
+        rewrite instead) only when some phrase cannot be located in the text.
+        """
+        phrases = [p for p in bias_analysis.get('biased_phrases', []) if isinstance(p, dict) and str(p.get('text') or '').strip()]
+        if not phrases:
+            self.paragraphs_kept += len(re.split(r'\n\s*\n', original_text))
+            return original_text
+        
+        # Even indexes are paragraphs, odd indexes the blank-line separators between them
+        parts = re.split(r'(\n\s*\n)', original_text)
+        starts = []
+        offset = 0
+        for part in parts:
+            starts.append(offset)
+            offset += len(part)
+        
+        matcher = PhraseMatcher([str(p['text']).strip() for p in phrases])
+        by_paragraph: Dict[int, List[dict]] = {}
+        located = set()
+        for start, _, index in matcher.find_words(original_text):
+            paragraph = max(i for i in range(0, len(parts), 2) if starts[i] <= start)
+            located.add(index)
+            if phrases[index] not in by_paragraph.setdefault(paragraph, []):
+                by_paragraph[paragraph].append(phrases[index])
+        
+        if len(located) < len(phrases):
+            print(f"Paragraph rewrite could not locate {len(phrases) - len(located)} phrase(s), using full rewrite")
+            return None
+        
+        targets = sorted(by_paragraph)
+        rewritten = await asyncio.gather(*[self._rewrite_paragraph(parts[i], by_paragraph[i]) for i in targets])
+        for i, text in zip(targets, rewritten):
+            parts[i] = text
+        
+        self.paragraphs_rewritten += len(targets)
+        self.paragraphs_kept += (len(parts) + 1) // 2 - len(targets)
+        return "".join(parts)
+    
+    async def _rewrite_paragraph(self, paragraph: str, phrases: List[dict]) -> str:
+        """Neutral version of one paragraph; the original paragraph if the call fails."""
+        guidance = "\n".join(
+            f"- '{p.get('text', '')}' ({p.get('bias_type', 'unknown')}): suggested {p.get('suggested_replacement', 'neutral language')}"
+            for p in phrases
+        )
+        prompt = f"""
+        Rewrite this paragraph from a news article in a neutral, objective tone while preserving ALL factual content.
+
+        PARAGRAPH:
+        {paragraph.strip()}
+
+        BIASED PHRASES TO CHANGE:
+        {guidance}
+
+        Keep all facts, dates, numbers, names and quotations, and roughly the same length.
+        Return ONLY the rewritten paragraph, no explanations.
+        """
+        
+        try:
+            neutral = await self.llm.complete(
+                prompt,
+                max_tokens=min(4000, len(paragraph) // 3 + 100),
+                temperature=0.1,
+                stage="rewrite_paragraph"
+            )
+        except Exception as e:
+            print(f"Paragraph rewriting failed: {e}")
+            return paragraph
+        
+        if not neutral or not neutral.strip():
+            return paragraph
+        
+        # Keep the paragraph's own leading/trailing whitespace so the structure is unchanged
+        leading = paragraph[:len(paragraph) - len(paragraph.lstrip())]
+        trailing = paragraph[len(paragraph.rstrip()):]
+        return f"{leading}{neutral.strip()}{trailing}"
+    
+    async def _rewrite_with_llm(self, original_text: str, bias_analysis: dict) -> str:
         prompt = self._create_rewrite_prompt(original_text, bias_analysis)
         
         try:
-            if self.provider == ProviderType.GROQ:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=4000,
-                        temperature=0.1
-                    )
-                )
-                return response.choices[0].message.content or original_text
-            elif self.provider == ProviderType.GEMINI:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.generate_content(prompt)
-                )
-                return response.text
-            elif self.provider == ProviderType.CLAUDE:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.messages.create(
-                        model=self.model_name,
-                        max_tokens=4000,
-                        temperature=0.1,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                )
-                return response.content[0].text
-            else:
-                return original_text
+            neutral_text = await self.llm.complete(prompt, max_tokens=4000, temperature=0.1, stage="rewrite")
+            return neutral_text or original_text
         except Exception as e:
             print(f"Rewriting failed: {e}")
             return original_text
@@ -90,7 +192,7 @@ class ArticleRewriter:
     
     async def rewrite_title_neutral(self, original_title: str, bias_analysis: dict) -> str:
         """Rewrite title based on bias analysis."""
-        if bias_analysis.get('overall_bias_score', 0) < 20:
+        if bias_analysis.get('overall_bias_score', 0) < self.REWRITE_MIN_SCORE:
             return original_title
             
         prompt = f"""
@@ -112,40 +214,25 @@ class ArticleRewriter:
         """
         
         try:
-            if self.provider == ProviderType.GROQ:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=100,
-                        temperature=0.1
-                    )
-                )
-                neutral_title = response.choices[0].message.content or original_title
-            elif self.provider == ProviderType.GEMINI:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.generate_content(prompt)
-                )
-                neutral_title = response.text
-            elif self.provider == ProviderType.CLAUDE:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.messages.create(
-                        model=self.model_name,
-                        max_tokens=100,
-                        temperature=0.1,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                )
-                neutral_title = response.content[0].text
-            else:
-                return original_title
-            
-            clean_title = neutral_title.strip().replace('"', '')
-            return clean_title if 10 < len(clean_title) < 120 else original_title
+            neutral_title = await self.llm.complete(prompt, max_tokens=100, temperature=0.1, stage="rewrite_title")
+            return self._clean_title(neutral_title) or original_title
             
         except Exception as e:
             print(f"Title rewriting failed: {e}")
-            return original_title
\ No newline at end of file
+            return original_title
+    
+    def _clean_text(self, neutral_text: Optional[str], original_text: str) -> Optional[str]:
+        """A rewritten body; None if it is empty or implausibly sized next to the original."""
+        if not neutral_text or not neutral_text.strip():
+            return None
+        
+        ratio = len(neutral_text.strip()) / max(1, len(original_text.strip()))
+        return neutral_text if self.MIN_LENGTH_RATIO <= ratio <= self.MAX_LENGTH_RATIO else None
+    
+    def _clean_title(self, neutral_title: Optional[str]) -> Optional[str]:
+        """Strip quotes from a rewritten headline; None if it is empty or implausibly sized."""
+        if not neutral_title:
+            return None
+        
+        clean_title = neutral_title.strip().replace('"', '')
+        return clean_title if 10 < len(clean_title) < 120 else None
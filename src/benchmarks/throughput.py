@@ -0,0 +1,376 @@
+# src/benchmarks/throughput.py
+"""
+Throughput benchmark of the full BiasAnalysisOrchestrator against the fake
+LLM provider (src/services/fake_llm.py); no API keys or network needed.
+
+Sweeps article concurrency (fixed limits and/or the adaptive AIMD limiter),
+article count and body size, and reports articles/sec, p50/p95/p99 article
+latency (submission to result, queueing included) and peak traced memory.
+Results can be saved as a baseline and later runs compared against it.
+With --cassette, LLM calls are replayed from recorded production traffic
+(src/services/cassette.py) instead, keeping their real latencies.
+
+    python -m src.benchmarks.throughput --concurrency 1,4,16,adaptive --articles 20 --body-chars 2000,8000
+    python -m src.benchmarks.throughput --save-baseline
+    python -m src.benchmarks.throughput --compare      # exit status 1 on a regression
+    python -m src.benchmarks.throughput --cassette data/cassettes/traffic.jsonl --recorded-articles
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.database import news_db
+from src.database.call_ledger import flush_ledger
+from src.services.cassette import Cassette
+from src.services.circuit_breaker import CircuitBreakerBoard
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.services.fake_llm import FakeLLMProfile
+from src.services.hedging import HedgePolicy
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.news_client import NewsClient
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+
+
+DEFAULT_BASELINE = os.getenv("BENCHMARK_BASELINE", "data/benchmarks/throughput_baseline.json")
+
+NEUTRAL_WORDS = (
+    "council budget session roads schools residents officials report vote city plan funding "
+    "committee meeting proposal members public hearing data spending year district services"
+).split()
+LOADED_WORDS = "reckless disastrous shocking radical slammed outrageous heroic".split()
+
+
+def make_articles(count: int, body_chars: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Distinct synthetic articles of about `body_chars` characters, a few loaded words in each."""
+    rng = random.Random(f"articles:{seed}:{body_chars}")
+    articles = []
+    for i in range(count):
+        words = [f"Article {i}:"]
+        length = len(words[0])
+        while length < body_chars:
+            word = rng.choice(LOADED_WORDS) if rng.random() < 0.03 else rng.choice(NEUTRAL_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        articles.append({
+            "title": f"Council {rng.choice(LOADED_WORDS)} budget vote {i}",
+            "body": " ".join(words)[:body_chars],
+            "source": "benchmark"
+        })
+    return articles
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _reset_shared_state(limiter: AdaptiveConcurrencyLimiter, profile: FakeLLMProfile, cassette: Optional[Cassette]):
+    """Fresh LLM clients, rate limits, breakers and hedging stats for one sweep point."""
+    if cassette is None:
+        ProviderRegistry.use_fake_provider(profile)
+    else:
+        # Replay clients for every provider with recorded traffic, in the usual order
+        ProviderRegistry.PROVIDER_ORDER = [
+            provider for provider in (ProviderType.GROQ, ProviderType.GEMINI, ProviderType.CLAUDE)
+            if cassette.models(provider.value)
+        ]
+        ProviderRegistry.reset()
+    AdaptiveConcurrencyLimiter._shared = limiter
+    ProviderRateLimiter._shared = None
+    CircuitBreakerBoard._shared = None
+    HedgePolicy._shared = None
+
+
+def _build_limiter(concurrency: Union[int, str]) -> AdaptiveConcurrencyLimiter:
+    if concurrency == "adaptive":
+        return AdaptiveConcurrencyLimiter()
+    return AdaptiveConcurrencyLimiter(initial_limit=concurrency, min_limit=concurrency, max_limit=concurrency)
+
+
+async def run_point(
+    concurrency: Union[int, str],
+    article_count: int,
+    body_chars: int,
+    profile: FakeLLMProfile,
+    fused: bool = False,
+    cassette: Optional[Cassette] = None,
+    articles: Optional[List[Dict[str, str]]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze one batch at one concurrency setting and measure it. LLM calls go
+    to the fake provider, or are replayed from `cassette` when given;
+    `articles` replaces the synthetic ones (recorded news).
+    """
+    limiter = _build_limiter(concurrency)
+    _reset_shared_state(limiter, profile, cassette)
+    orchestrator = BiasAnalysisOrchestrator(fused=fused, cascade=False, prescore=False, concurrency=limiter)
+    fallback_summary = orchestrator.detector._get_fallback_response()["summary"]
+    if articles is None:
+        articles = make_articles(article_count, body_chars, profile.seed)
+    else:
+        articles = [articles[i % len(articles)] for i in range(article_count)]
+    replayed_before = cassette.counts["exact"] + cassette.counts["loose"] if cassette else 0
+    latencies = []
+
+    async def analyze(article):
+        result = await orchestrator.analyze_article(article["body"], article["title"], article["source"])
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    results = await asyncio.gather(*(analyze(article) for article in articles))
+    elapsed = time.perf_counter() - started
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if cassette is None:
+        stats = ProviderRegistry.get_provider(ProviderType.FAKE)[0].stats
+    else:
+        replayed = cassette.counts["exact"] + cassette.counts["loose"] - replayed_before
+        stats = {"calls": replayed, "errors": None, "rate_limited": None}
+    fallbacks = sum(1 for result in results if result.get("analysis", {}).get("summary") == fallback_summary)
+    return {
+        "concurrency": concurrency,
+        "final_limit": limiter.limit,
+        "articles": article_count,
+        "body_chars": body_chars,
+        "seconds": round(elapsed, 3),
+        "articles_per_sec": round(article_count / elapsed, 3) if elapsed else 0.0,
+        "p50": round(percentile(latencies, 50), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "p99": round(percentile(latencies, 99), 3),
+        "peak_memory_mb": round(peak_bytes / 1024 / 1024, 2),
+        "llm_calls": stats["calls"],
+        "llm_errors": stats["errors"],
+        "llm_rate_limited": stats["rate_limited"],
+        "fallback_analyses": fallbacks
+    }
+
+
+async def run_sweep(
+    concurrency_levels: Sequence[Union[int, str]],
+    article_counts: Sequence[int],
+    body_sizes: Sequence[int],
+    profile: FakeLLMProfile,
+    fused: bool = False,
+    verbose: bool = True,
+    cassette_path: Optional[str] = None,
+    recorded_articles: bool = False,
+    query: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Every combination of the sweep dimensions, one after another.
+
+    With `cassette_path` the LLM traffic is replayed from a recorded cassette
+    (loosely matched, so synthetic articles get production-shaped latencies)
+    under the real providers' local quotas (<PROVIDER>_RPM / _TPM);
+    `recorded_articles` also takes the articles from its news traffic, in
+    which case body sizes are not swept.
+    """
+    results = []
+    cassette = Cassette(cassette_path, "replay") if cassette_path else None
+    previous_cassette = (Cassette._active, Cassette._configured)
+    with tempfile.TemporaryDirectory() as tmp:
+        # The call ledger writes per-call rows; keep them out of the real database
+        original_db, original_cache = news_db.news_DB, LLMGateway.USE_CACHE
+        news_db.news_DB = os.path.join(tmp, "benchmark.db")
+        LLMGateway.USE_CACHE = False
+        try:
+            news_db.get_connection_to_news_db()
+            articles = None
+            if cassette is not None:
+                # NewsClient and ModelFactory pick up the active cassette
+                Cassette._active, Cassette._configured = cassette, True
+            if cassette is not None and recorded_articles:
+                articles = [
+                    {"title": article["title"], "body": article["body"], "source": article["source"]}
+                    for article in await NewsClient().fetch_articles(query, max(article_counts))
+                ]
+                body_sizes = [0]
+            for body_chars in body_sizes:
+                for article_count in article_counts:
+                    for concurrency in concurrency_levels:
+                        point = await run_point(concurrency, article_count, body_chars, profile, fused,
+                                                cassette, articles)
+                        results.append(point)
+                        if verbose:
+                            print(_format_row(point))
+        finally:
+            # Queued ledger rows belong to the temporary database; write them before it goes
+            flush_ledger()
+            news_db.news_DB, LLMGateway.USE_CACHE = original_db, original_cache
+            Cassette._active, Cassette._configured = previous_cassette
+    return results
+
+
+def point_key(point: Dict[str, Any]) -> str:
+    return f"c={point['concurrency']} n={point['articles']} body={point['body_chars']}"
+
+
+def save_baseline(
+    path: str,
+    results: List[Dict[str, Any]],
+    profile: FakeLLMProfile,
+    fused: bool = False,
+    cassette_path: Optional[str] = None
+):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "profile": profile.describe(),
+            "fused": fused,
+            "cassette": cassette_path,
+            "results": results
+        }, f, indent=2)
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.15
+) -> List[str]:
+    """
+    Regressions against the baseline: throughput down or p95 latency up by
+    more than `tolerance` (a fraction) at the same sweep point.
+    """
+    previous = {point_key(point): point for point in baseline.get("results", [])}
+    regressions = []
+    for point in results:
+        before = previous.get(point_key(point))
+        if before is None:
+            continue
+        if point["articles_per_sec"] < before["articles_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{point_key(point)}: {point['articles_per_sec']} articles/sec "
+                f"(baseline {before['articles_per_sec']})"
+            )
+        if point["p95"] > before["p95"] * (1 + tolerance):
+            regressions.append(f"{point_key(point)}: p95 {point['p95']}s (baseline {before['p95']}s)")
+    return regressions
+
+
+def _format_row(point: Dict[str, Any]) -> str:
+    return (
+        f"{str(point['concurrency']):>9} {point['articles']:>6} {point['body_chars']:>7} "
+        f"{point['articles_per_sec']:>9.2f} {point['p50']:>7.2f} {point['p95']:>7.2f} {point['p99']:>7.2f} "
+        f"{point['peak_memory_mb']:>8.1f} {point['llm_calls']:>6} {point['fallback_analyses']:>5}"
+    )
+
+
+def _parse_concurrency(raw: str) -> List[Union[int, str]]:
+    levels = []
+    for value in raw.split(","):
+        value = value.strip()
+        levels.append("adaptive" if value == "adaptive" else int(value))
+    return levels
+
+
+def _parse_ints(raw: str) -> List[int]:
+    return [int(value) for value in raw.split(",") if value.strip()]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='Orchestrator throughput benchmark on the fake LLM provider')
+    parser.add_argument('--concurrency', type=_parse_concurrency, default=_parse_concurrency("1,4,8,adaptive"),
+                        help='Comma-separated article concurrency limits; "adaptive" uses the AIMD limiter')
+    parser.add_argument('--articles', type=_parse_ints, default=[20], help='Comma-separated article counts')
+    parser.add_argument('--body-chars', type=_parse_ints, default=[2000, 8000], help='Comma-separated body sizes')
+    parser.add_argument('--latency', type=str, default=os.getenv("FAKE_LLM_LATENCY", "lognormal:0.3,0.4"),
+                        help='Fake time-to-first-token distribution, e.g. lognormal:0.3,0.4 or uniform:0.1,0.5')
+    parser.add_argument('--per-token-seconds', type=float, default=float(os.getenv("FAKE_LLM_PER_TOKEN_SECONDS", "0.001")),
+                        help='Fake generation time per completion token')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of fake calls failing with a 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of fake calls answered with a 429')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for articles and fake latencies')
+    parser.add_argument('--fused', action='store_true', help='Benchmark the fused single-request analysis')
+    parser.add_argument('--cassette', type=str, default=None,
+                        help='Replay LLM latencies and answers from a recorded cassette instead of the fake provider')
+    parser.add_argument('--recorded-articles', action='store_true',
+                        help='With --cassette, analyze the recorded news articles instead of synthetic ones')
+    parser.add_argument('--query', type=str, default=None, help='News query the cassette was recorded with')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help='Baseline file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--compare', action='store_true', help='Compare with the baseline; exit 1 on a regression')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Allowed throughput drop / p95 increase before a point counts as regressed')
+    parser.add_argument('--output', type=str, default=None, help='Also write this run\'s results as JSON')
+    args = parser.parse_args()
+
+    profile = FakeLLMProfile(
+        latency=args.latency,
+        per_token_seconds=args.per_token_seconds,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    )
+    if args.cassette:
+        print(f"Replaying LLM traffic from {args.cassette}")
+    else:
+        print(f"Fake provider: {profile.describe()}")
+    print(f"{'limit':>9} {'count':>6} {'body':>7} {'art/sec':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'peak MB':>8} {'calls':>6} {'fallb':>5}")
+    results = await run_sweep(args.concurrency, args.articles, args.body_chars, profile, args.fused,
+                              cassette_path=args.cassette, recorded_articles=args.recorded_articles,
+                              query=args.query)
+
+    if args.output:
+        save_baseline(args.output, results, profile, args.fused, args.cassette)
+
+    status = 0
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            status = 1
+        else:
+            if (baseline.get("profile") != profile.describe() or baseline.get("fused", False) != args.fused
+                    or baseline.get("cassette") != args.cassette):
+                print(f"Warning: baseline was recorded with {baseline.get('profile')} "
+                      f"(fused={baseline.get('fused', False)}, cassette={baseline.get('cassette')})")
+            regressions = compare_to_baseline(results, baseline, args.tolerance)
+            for regression in regressions:
+                print(f"REGRESSION {regression}")
+            if regressions:
+                status = 1
+            else:
+                print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, profile, args.fused, args.cassette)
+        print(f"Baseline saved to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
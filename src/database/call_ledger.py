@@ -0,0 +1,276 @@
+# src/database/call_ledger.py
+
+import atexit
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from src.database import news_db
+
+
+# Approximate list prices in USD per million (input, output) tokens
+MODEL_PRICING = {
+    'llama-3.1-70b-versatile': (0.59, 0.79),
+    'llama-3.1-8b-instant': (0.05, 0.08),
+    'llama-3.1-405b-reasoning': (3.00, 3.00),
+    'models/gemini-2.0-flash': (0.10, 0.40),
+    'models/gemini-2.0-flash-001': (0.10, 0.40),
+    'models/gemini-flash-latest': (0.10, 0.40),
+    'models/gemini-2.0-flash-lite': (0.075, 0.30),
+    'models/gemini-1.5-flash-latest': (0.075, 0.30),
+    'claude-3-5-sonnet-20241022': (3.00, 15.00),
+    'claude-3-opus-20240229': (15.00, 75.00),
+    'claude-3-sonnet-20240229': (3.00, 15.00),
+}
+
+_table_ready_for = None
+
+
+def _ensure_ledger_table(cur, db_path: Optional[str] = None):
+    """Create the llm_calls table next to data_news."""
+    global _table_ready_for
+    db_path = db_path or news_db.news_DB
+    if _table_ready_for == db_path:
+        return
+    
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS llm_calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_hash TEXT,
+            stage TEXT,
+            provider TEXT,
+            model_name TEXT,
+            prompt_tokens INTEGER,
+            completion_tokens INTEGER,
+            latency_ms REAL,
+            retries INTEGER,
+            fell_back INTEGER,
+            success INTEGER,
+            cached INTEGER,
+            cost_usd REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_article ON llm_calls(article_hash)")
+    _table_ready_for = db_path
+
+
+def estimate_cost(model_name: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost of one call from the pricing table (0 for unknown models)."""
+    input_price, output_price = MODEL_PRICING.get(model_name or "", (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def record_llm_call(call: Dict[str, Any]):
+    """Append one provider call to the ledger (synchronously)."""
+    _insert_rows(news_db.news_DB, [_ledger_row(call)])
+
+
+def enqueue_llm_call(call: Dict[str, Any]):
+    """Queue one provider call for the background ledger writer; never touches SQLite."""
+    LedgerWriter.shared().submit(news_db.news_DB, _ledger_row(call))
+
+
+def flush_ledger():
+    """Wait until every queued ledger row has been written."""
+    if LedgerWriter._shared is not None:
+        LedgerWriter._shared.flush()
+
+
+class LedgerWriter:
+    """
+    Background thread that writes queued ledger rows in batches.
+
+    The gateway ledgers calls from the event loop; handing rows to this
+    writer keeps the connect, INSERT, commit and any lock wait off it.
+    Rows carry the database path current when they were queued.
+    """
+
+    BATCH_SIZE = 200
+
+    _shared: Optional["LedgerWriter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[str, tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "LedgerWriter":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                # CLI runs end right after their last call; write what is queued
+                atexit.register(cls._shared.flush)
+            return cls._shared
+
+    def submit(self, db_path: str, row: tuple):
+        self._queue.put((db_path, row))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="llm-ledger-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                by_path: Dict[str, List[tuple]] = {}
+                for db_path, row in batch:
+                    by_path.setdefault(db_path, []).append(row)
+                for db_path, rows in by_path.items():
+                    _insert_rows(db_path, rows)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+def _ledger_row(call: Dict[str, Any]) -> tuple:
+    prompt_tokens = call.get("prompt_tokens") or 0
+    completion_tokens = call.get("completion_tokens") or 0
+    cost = 0.0 if call.get("cached") else estimate_cost(call.get("model_name"), prompt_tokens, completion_tokens)
+    return (
+        call.get("article_hash"),
+        call.get("stage"),
+        call.get("provider"),
+        call.get("model_name"),
+        prompt_tokens,
+        completion_tokens,
+        call.get("latency_ms"),
+        call.get("retries", 0),
+        int(bool(call.get("fell_back"))),
+        int(bool(call.get("success"))),
+        int(bool(call.get("cached"))),
+        cost
+    )
+
+
+def _insert_rows(db_path: str, rows: List[tuple]):
+    try:
+        conn = sqlite3.connect(db_path)
+    except sqlite3.Error as e:
+        print(f"Ledger write error: {e}")
+        return
+    
+    try:
+        cur = conn.cursor()
+        _ensure_ledger_table(cur, db_path)
+        cur.executemany("""
+            INSERT INTO llm_calls
+            (article_hash, stage, provider, model_name, prompt_tokens, completion_tokens,
+             latency_ms, retries, fell_back, success, cached, cost_usd)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"Ledger write error: {e}")
+    finally:
+        conn.close()
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100)))
+    return ordered[index]
+
+
+def get_ledger_report() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Aggregate the ledger per stage and per stage/provider/model.
+    
+    Returns:
+        {"by_stage": [...], "by_model": [...]} rows with call counts, tokens,
+        cost, fallback and cache counts and p50/p95 latency in milliseconds
+    """
+    flush_ledger()
+    conn = sqlite3.connect(news_db.news_DB)
+    cur = conn.cursor()
+    
+    try:
+        _ensure_ledger_table(cur)
+        by_stage = _aggregate(cur, ["stage"])
+        by_model = _aggregate(cur, ["stage", "provider", "model_name"])
+    except sqlite3.Error as e:
+        print(f"Ledger read error: {e}")
+        by_stage, by_model = [], []
+    finally:
+        conn.close()
+    
+    return {"by_stage": by_stage, "by_model": by_model}
+
+
+def _aggregate(cur, key_fields: List[str]) -> List[Dict[str, Any]]:
+    """Counts and sums per group in SQL; only uncached latencies are fetched, for the percentiles."""
+    columns = ", ".join(key_fields)
+    cur.execute(f"""
+        SELECT {columns}, COUNT(*),
+               SUM(COALESCE(prompt_tokens, 0)), SUM(COALESCE(completion_tokens, 0)),
+               SUM(COALESCE(cost_usd, 0)), SUM(COALESCE(fell_back, 0)),
+               SUM(CASE WHEN success THEN 0 ELSE 1 END), SUM(COALESCE(cached, 0))
+        FROM llm_calls
+        GROUP BY {columns}
+    """)
+    groups = cur.fetchall()
+    
+    cur.execute(f"""
+        SELECT {columns}, latency_ms FROM llm_calls
+        WHERE latency_ms IS NOT NULL AND NOT COALESCE(cached, 0)
+    """)
+    latencies: Dict[tuple, List[float]] = {}
+    for row in cur.fetchall():
+        latencies.setdefault(tuple(row[:-1]), []).append(row[-1])
+    
+    report = []
+    for row in sorted(groups, key=lambda row: tuple(str(k) for k in row[:len(key_fields)])):
+        key = tuple(row[:len(key_fields)])
+        calls, prompt_tokens, completion_tokens, cost, fallbacks, failures, cache_hits = row[len(key_fields):]
+        entry = dict(zip(key_fields, key))
+        entry.update({
+            "calls": calls,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": round(cost, 6),
+            "fallbacks": fallbacks,
+            "failures": failures,
+            "cache_hits": cache_hits,
+            "p50_latency_ms": round(_percentile(latencies.get(key, []), 50), 1),
+            "p95_latency_ms": round(_percentile(latencies.get(key, []), 95), 1)
+        })
+        report.append(entry)
+    return report
+
+
+def print_ledger_report():
+    """Print the ledger report for the CLI."""
+    report = get_ledger_report()
+    
+    print("LLM Call Ledger")
+    print("=" * 50)
+    if not report["by_stage"]:
+        print("No LLM calls recorded yet")
+        return report
+    
+    print("Per stage:")
+    for row in report["by_stage"]:
+        print(f"  {row['stage']}: {row['calls']} calls, ${row['cost_usd']:.4f}, "
+              f"p50 {row['p50_latency_ms']}ms, p95 {row['p95_latency_ms']}ms, "
+              f"{row['fallbacks']} fallbacks, {row['cache_hits']} cache hits")
+    
+    print("Per stage and model:")
+    for row in report["by_model"]:
+        print(f"  {row['stage']} / {row['provider']} / {row['model_name']}: {row['calls']} calls, "
+              f"{row['prompt_tokens']}+{row['completion_tokens']} tokens, ${row['cost_usd']:.4f}, "
+              f"p50 {row['p50_latency_ms']}ms, p95 {row['p95_latency_ms']}ms")
+    
+    return report
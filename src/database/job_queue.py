@@ -0,0 +1,342 @@
+# src/database/job_queue.py
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+from src.database import news_db
+from src.services.tracing import run_in_thread, traced
+
+
+# Seconds a claimed job stays leased without a checkpoint or renewal
+LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+JOB_STATES = ("pending", "leased", "done", "failed", "cancelled")
+
+_table_ready_for = None
+
+
+def _connect() -> sqlite3.Connection:
+    directory = os.path.dirname(news_db.news_DB)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Autocommit mode so claims can take the write lock with BEGIN IMMEDIATE
+    conn = sqlite3.connect(news_db.news_DB, timeout=30, isolation_level=None)
+    _ensure_jobs_table(conn.cursor())
+    return conn
+
+
+def _ensure_jobs_table(cur):
+    """Create the analysis_jobs table next to data_news."""
+    global _table_ready_for
+    if _table_ready_for == news_db.news_DB:
+        return
+
+    # Worker processes share the file: WAL lets readers run beside the one writer
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_hash TEXT UNIQUE,
+            title TEXT,
+            body TEXT,
+            source TEXT,
+            priority INTEGER DEFAULT 1,
+            state TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            checkpoints TEXT DEFAULT '{}',
+            result TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_analysis_jobs_state ON analysis_jobs(state, priority, id)")
+    _table_ready_for = news_db.news_DB
+
+
+def _job_from_row(row) -> Dict[str, Any]:
+    job = dict(zip(
+        ["id", "article_hash", "title", "body", "source", "priority", "state", "attempts",
+         "max_attempts", "lease_owner", "lease_expires_at", "checkpoints", "result", "error"],
+        row
+    ))
+    job["checkpoints"] = json.loads(job["checkpoints"] or "{}")
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+_JOB_COLUMNS = """
+    id, article_hash, title, body, source, priority, state, attempts,
+    max_attempts, lease_owner, lease_expires_at, checkpoints, result, error
+"""
+
+
+@traced("db.enqueue_articles")
+def enqueue_articles(
+    articles: List[Dict[str, Any]],
+    priority: int = 1,
+    max_attempts: int = None,
+    requeue_finished: bool = True
+) -> List[int]:
+    """
+    Add articles ({"title", "body", "source"}) as pending jobs.
+
+    Articles already queued or in progress keep their job (and its
+    checkpoints); finished, failed or cancelled ones are queued again from
+    scratch unless `requeue_finished` is False.
+
+    Returns:
+        Job ids in the order of `articles`
+    """
+    max_attempts = max_attempts or MAX_ATTEMPTS
+    conn = _connect()
+    cur = conn.cursor()
+    job_ids = []
+
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        for article in articles:
+            article_hash = news_db.get_content_hash(article.get('title', ''), article.get('body', ''))
+            cur.execute("""
+                INSERT INTO analysis_jobs (article_hash, title, body, source, priority, max_attempts)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(article_hash) DO UPDATE SET
+                    state = 'pending', attempts = 0, max_attempts = excluded.max_attempts,
+                    priority = excluded.priority, lease_owner = NULL, lease_expires_at = NULL,
+                    checkpoints = '{}', result = NULL, error = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE ? AND state IN ('done', 'failed', 'cancelled')
+            """, (article_hash, article.get('title', ''), article.get('body', ''),
+                  article.get('source', 'unknown'), priority, max_attempts, int(requeue_finished)))
+            cur.execute("SELECT id FROM analysis_jobs WHERE article_hash = ?", (article_hash,))
+            job_ids.append(cur.fetchone()[0])
+        cur.execute("COMMIT")
+        return job_ids
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"Job queue error: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+@traced("db.claim_jobs")
+def claim_jobs(
+    worker_id: str,
+    limit: int = 1,
+    lease_seconds: float = None,
+    job_ids: Optional[List[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Lease up to `limit` runnable jobs to `worker_id`.
+
+    Runnable means pending, or leased with an expired lease (its worker
+    died). Expired jobs that used up their attempts are marked failed
+    instead. The select and update run under one write lock, so concurrent
+    workers never claim the same job.
+
+    Args:
+        job_ids: Only consider these jobs (e.g. the ones a caller just queued)
+    """
+    lease_seconds = lease_seconds or LEASE_SECONDS
+    now = time.time()
+    conn = _connect()
+    cur = conn.cursor()
+
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute("""
+            UPDATE analysis_jobs
+            SET state = 'failed', error = 'lease expired after final attempt',
+                lease_owner = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE state = 'leased' AND lease_expires_at < ? AND attempts >= max_attempts
+        """, (now,))
+
+        query = """
+            SELECT id FROM analysis_jobs
+            WHERE (state = 'pending' OR (state = 'leased' AND lease_expires_at < ?))
+        """
+        params: List[Any] = [now]
+        if job_ids is not None:
+            query += f" AND id IN ({','.join('?' * len(job_ids))})"
+            params.extend(job_ids)
+        query += " ORDER BY priority, id LIMIT ?"
+        params.append(limit)
+        cur.execute(query, params)
+        ids = [row[0] for row in cur.fetchall()]
+
+        if ids:
+            placeholders = ','.join('?' * len(ids))
+            cur.execute(f"""
+                UPDATE analysis_jobs
+                SET state = 'leased', lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id IN ({placeholders})
+            """, [worker_id, now + lease_seconds] + ids)
+            cur.execute(f"SELECT {_JOB_COLUMNS} FROM analysis_jobs WHERE id IN ({placeholders}) ORDER BY priority, id", ids)
+            jobs = [_job_from_row(row) for row in cur.fetchall()]
+        else:
+            jobs = []
+        cur.execute("COMMIT")
+        return jobs
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"Job queue error: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def _update_leased_job(job_id: int, worker_id: str, assignments: str, params: List[Any]) -> bool:
+    """Apply an update only while `worker_id` still holds the lease."""
+    conn = _connect()
+    try:
+        cur = conn.execute(f"""
+            UPDATE analysis_jobs
+            SET {assignments}, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND state = 'leased' AND lease_owner = ?
+        """, params + [job_id, worker_id])
+        return cur.rowcount == 1
+    except sqlite3.Error as e:
+        print(f"Job queue error: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def renew_lease(job_id: int, worker_id: str, lease_seconds: float = None) -> bool:
+    """Extend a lease; False if it was lost to another worker."""
+    return _update_leased_job(job_id, worker_id, "lease_expires_at = ?", [time.time() + (lease_seconds or LEASE_SECONDS)])
+
+
+@traced("db.save_checkpoint")
+def save_checkpoint(job_id: int, worker_id: str, stage: str, output: Any, lease_seconds: float = None) -> bool:
+    """Store one stage's output (and extend the lease) so a retry can skip that stage."""
+    return _update_leased_job(
+        job_id, worker_id,
+        "checkpoints = json_set(checkpoints, ?, json(?)), lease_expires_at = ?",
+        [f'$."{stage}"', json.dumps(output), time.time() + (lease_seconds or LEASE_SECONDS)]
+    )
+
+
+@traced("db.complete_job")
+def complete_job(job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+    return _update_leased_job(
+        job_id, worker_id,
+        "state = 'done', result = ?, error = NULL, lease_owner = NULL, lease_expires_at = NULL",
+        [json.dumps(result)]
+    )
+
+
+@traced("db.fail_job")
+def fail_job(job_id: int, worker_id: str, error: str) -> bool:
+    """Record a failed attempt: back to pending, or failed once attempts run out."""
+    return _update_leased_job(
+        job_id, worker_id,
+        "state = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+        "error = ?, lease_owner = NULL, lease_expires_at = NULL",
+        [error]
+    )
+
+
+@traced("db.cancel_job")
+def cancel_job(job_id: int, worker_id: str, reason: str) -> bool:
+    """Give up on a job without retrying it; it stays until the article is queued again."""
+    return _update_leased_job(
+        job_id, worker_id,
+        "state = 'cancelled', error = ?, lease_owner = NULL, lease_expires_at = NULL",
+        [reason]
+    )
+
+
+@traced("db.unqueued_articles")
+def unqueued_articles(limit: int = None) -> List[Dict[str, Any]]:
+    """
+    Stored articles that are unanalyzed and have no job at all, oldest first.
+
+    Articles a caller is analyzing in-process are queued (and leased) first,
+    so they are not picked up here.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute("""
+            SELECT title, body, source FROM data_news
+            WHERE bias IS NULL AND duplicate_of IS NULL
+              AND NOT EXISTS (SELECT 1 FROM analysis_jobs WHERE analysis_jobs.article_hash = data_news.content_hash)
+            ORDER BY created_at, id
+            LIMIT ?
+        """, (limit if limit is not None else -1,)).fetchall()
+        return [{"title": title, "body": body, "source": source or "unknown"} for title, body, source in rows]
+    except sqlite3.Error as e:
+        print(f"Job queue error: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    conn = _connect()
+    try:
+        row = conn.execute(f"SELECT {_JOB_COLUMNS} FROM analysis_jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_from_row(row) if row else None
+    except sqlite3.Error as e:
+        print(f"Job queue error: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def get_queue_stats() -> Dict[str, int]:
+    """Job counts per state, plus leases that have expired."""
+    conn = _connect()
+    try:
+        stats = dict.fromkeys(JOB_STATES, 0)
+        for state, count in conn.execute("SELECT state, COUNT(*) FROM analysis_jobs GROUP BY state"):
+            stats[state] = count
+        stats["expired_leases"] = conn.execute(
+            "SELECT COUNT(*) FROM analysis_jobs WHERE state = 'leased' AND lease_expires_at < ?", (time.time(),)
+        ).fetchone()[0]
+        return stats
+    except sqlite3.Error as e:
+        print(f"Job queue error: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def clear_finished_jobs() -> int:
+    """Delete done jobs; failed ones stay for inspection until re-queued."""
+    conn = _connect()
+    try:
+        return conn.execute("DELETE FROM analysis_jobs WHERE state = 'done'").rowcount
+    except sqlite3.Error as e:
+        print(f"Job queue error: {e}")
+        return 0
+    finally:
+        conn.close()
+
+
+class StageCheckpoints:
+    """A leased job's saved stage outputs, and where new ones are written."""
+
+    def __init__(self, job_id: int, worker_id: str, outputs: Optional[Dict[str, Any]] = None, lease_seconds: float = None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.outputs = dict(outputs or {})
+        self.lease_seconds = lease_seconds
+
+    def save(self, stage: str, output: Any):
+        self.outputs[stage] = output
+        if not save_checkpoint(self.job_id, self.worker_id, stage, output, self.lease_seconds):
+            print(f"Checkpoint for job {self.job_id} not saved: lease lost")
+
+    async def save_async(self, stage: str, output: Any):
+        """save() off the event loop; the write may wait on another process's lock."""
+        await run_in_thread(self.save, stage, output)
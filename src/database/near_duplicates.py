@@ -0,0 +1,71 @@
+# src/database/near_duplicates.py
+
+import hashlib
+import os
+import random
+import re
+from typing import List, Optional, Set
+
+
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 32  # 4 rows per band: pairs above ~0.7 Jaccard almost always collide
+SHINGLE_SIZE = 5
+# Below this many shingles a body is too short to fingerprint: empty and
+# near-empty bodies would all share one signature and "match" each other
+MIN_SHINGLES = SHINGLE_SIZE
+SIMILARITY_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures stored in the database stay comparable across runs
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def shingle(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hash every run of `size` normalized words in the text."""
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    if len(words) < size:
+        runs = [" ".join(words)] if words else []
+    else:
+        runs = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+    return {
+        int.from_bytes(hashlib.blake2b(run.encode(), digest_size=4).digest(), "big")
+        for run in runs
+    }
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """MinHash signature of the text's word shingles; None for text too short to fingerprint."""
+    shingles = shingle(text)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+
+    return [
+        min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_keys(signature: List[int]) -> List[str]:
+    """LSH bucket key for each band; similar signatures share at least one."""
+    rows = len(signature) // NUM_BANDS
+    keys = []
+    for band in range(NUM_BANDS):
+        chunk = signature[band * rows:(band + 1) * rows]
+        digest = hashlib.md5(",".join(map(str, chunk)).encode()).hexdigest()[:16]
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def estimate_similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    if not signature_a or len(signature_a) != len(signature_b):
+        return 0.0
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
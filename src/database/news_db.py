@@ -2,8 +2,17 @@
 
 import os
 import sqlite3
-from typing import List, Dict, Any
+import json
+from typing import List, Dict, Any, Optional
 import hashlib
+from src.services.metrics import timed_step
+from src.services.tracing import traced
+from src.database.near_duplicates import (
+    SIMILARITY_THRESHOLD,
+    minhash_signature,
+    band_keys,
+    estimate_similarity
+)
 
 
 news_DB = "data/databases/news.db"
@@ -16,6 +25,9 @@ def get_connection_to_news_db():
     conn = sqlite3.connect(news_DB)
     cur = conn.cursor()
     
+    # Ingest and analysis workers may run as separate processes on this file
+    cur.execute("PRAGMA journal_mode=WAL")
+    
     cur.execute("""
         CREATE TABLE IF NOT EXISTS data_news (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -35,6 +47,30 @@ def get_connection_to_news_db():
     cur.execute("CREATE INDEX IF NOT EXISTS idx_content_hash ON data_news(content_hash)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_date ON data_news(date)")
     
+    # Older databases predate near-duplicate tracking
+    columns = [row[1] for row in cur.execute("PRAGMA table_info(data_news)")]
+    if "duplicate_of" not in columns:
+        cur.execute("ALTER TABLE data_news ADD COLUMN duplicate_of INTEGER")
+    
+    # MinHash fingerprints outlive their articles so analyses can be reused
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS article_fingerprints (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER,
+            signature TEXT,
+            bias TEXT,
+            rewritten_article TEXT
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS fingerprint_buckets (
+            bucket TEXT,
+            fingerprint_id INTEGER
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_fingerprint_article ON article_fingerprints(article_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_fingerprint_bucket ON fingerprint_buckets(bucket)")
+    
     conn.commit()
     conn.close()
 
@@ -45,10 +81,65 @@ def _generate_content_hash(article: Dict[str, Any]) -> str:
     return hashlib.md5(content.encode()).hexdigest()
 
 
+def get_content_hash(title: str, body: str) -> str:
+    """Content hash of an article, the key shared by data_news and llm_calls."""
+    return _generate_content_hash({"title": title, "body": body})
+
+
+def _find_near_duplicate(cur, signature: List[int]) -> Optional[tuple]:
+    """
+    Find the most similar fingerprinted article above the similarity threshold.
+    
+    Returns:
+        (article_id, bias, rewritten_article) of the best match, or None
+    """
+    buckets = band_keys(signature)
+    placeholders = ",".join("?" * len(buckets))
+    cur.execute(f"""
+        SELECT DISTINCT f.article_id, f.signature, f.bias, f.rewritten_article
+        FROM fingerprint_buckets b
+        JOIN article_fingerprints f ON f.id = b.fingerprint_id
+        WHERE b.bucket IN ({placeholders})
+    """, buckets)
+    
+    matches = []
+    for article_id, stored_signature, bias, rewritten_article in cur.fetchall():
+        score = estimate_similarity(signature, json.loads(stored_signature))
+        if score >= SIMILARITY_THRESHOLD:
+            matches.append((bias is not None, score, article_id, bias, rewritten_article))
+    
+    if not matches:
+        return None
+    
+    # Prefer analyzed matches so their results can be reused, then the closest
+    _, _, article_id, bias, rewritten_article = max(matches, key=lambda m: (m[0], m[1]))
+    return article_id, bias, rewritten_article
+
+
+def _index_fingerprint(cur, article_id: int, signature: List[int], bias=None, rewritten_article=None):
+    """Store an article's MinHash signature and its LSH buckets."""
+    cur.execute("""
+        INSERT INTO article_fingerprints (article_id, signature, bias, rewritten_article)
+        VALUES (?, ?, ?, ?)
+    """, (article_id, json.dumps(signature), bias, rewritten_article))
+    fingerprint_id = cur.lastrowid
+    cur.executemany(
+        "INSERT INTO fingerprint_buckets (bucket, fingerprint_id) VALUES (?, ?)",
+        [(bucket, fingerprint_id) for bucket in band_keys(signature)]
+    )
+
+
+@timed_step("store")
+@traced("db.add_news")
 def add_news(data: List[Dict[str, Any]]) -> int:
     """
     Add news articles with content-based deduplication.
     
+    Articles that are near-duplicates of an already analyzed article (syndicated
+    copy with a new headline or boilerplate) reuse its bias analysis and rewrite.
+    Near-duplicates of a still pending article are linked to it via duplicate_of
+    and receive its results when add_bias stores them.
+    
     Returns:
         Number of actually new articles added
     """
@@ -57,6 +148,7 @@ def add_news(data: List[Dict[str, Any]]) -> int:
     
     actually_added = 0
     duplicates_found = 0
+    analyses_reused = 0
     
     for article in data:
         content_hash = _generate_content_hash(article)
@@ -84,8 +176,31 @@ def add_news(data: List[Dict[str, Any]]) -> int:
                 None,
                 content_hash
             ))
+            article_id = cur.lastrowid
             actually_added += 1
             
+            signature = minhash_signature(article.get('body', ''))
+            if signature is None:
+                # Too short to compare; it is analyzed on its own
+                continue
+            match = _find_near_duplicate(cur, signature)
+            bias, rewritten_article = None, None
+            
+            if match and match[1] is not None:
+                _, bias, rewritten_article = match
+                cur.execute("""
+                    UPDATE data_news SET bias = ?, rewritten_article = ? WHERE id = ?
+                """, (bias, rewritten_article, article_id))
+                analyses_reused += 1
+            elif match:
+                cur.execute("""
+                    UPDATE data_news
+                    SET duplicate_of = (SELECT COALESCE(duplicate_of, id) FROM data_news WHERE id = ?)
+                    WHERE id = ?
+                """, (match[0], article_id))
+            
+            _index_fingerprint(cur, article_id, signature, bias, rewritten_article)
+            
         except sqlite3.Error as e:
             print(f"Error adding article: {e}")
             continue
@@ -96,10 +211,12 @@ def add_news(data: List[Dict[str, Any]]) -> int:
     print(f"Articles processed: {len(data)}")
     print(f"New articles added: {actually_added}")
     print(f"Duplicates skipped: {duplicates_found}")
+    print(f"Near-duplicate analyses reused: {analyses_reused}")
     
     return actually_added
 
 
+@traced("db.prepare_data_for_llm")
 def prepare_data_for_llm(limit: int = 5, processed_only: bool = False) -> List[Dict[str, str]]:
     """
     Select articles for LLM processing.
@@ -116,7 +233,7 @@ def prepare_data_for_llm(limit: int = 5, processed_only: bool = False) -> List[D
             cur.execute("""
                 SELECT title, body 
                 FROM data_news 
-                WHERE bias IS NULL
+                WHERE bias IS NULL AND duplicate_of IS NULL
                 ORDER BY created_at DESC
                 LIMIT ?
             """, (limit,))
@@ -139,6 +256,29 @@ def prepare_data_for_llm(limit: int = 5, processed_only: bool = False) -> List[D
         conn.close()
 
 
+@traced("db.get_analyzed_articles")
+def get_analyzed_articles() -> List[Dict[str, Any]]:
+    """Articles with a stored LLM analysis (near-duplicate copies excluded)."""
+    conn = sqlite3.connect(news_DB)
+    cur = conn.cursor()
+    
+    try:
+        cur.execute("""
+            SELECT id, title, body, bias
+            FROM data_news
+            WHERE bias IS NOT NULL AND duplicate_of IS NULL
+            ORDER BY id
+        """)
+        return [{"id": row[0], "title": row[1], "body": row[2], "bias": row[3]} for row in cur.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+@timed_step("persist")
+@traced("db.add_bias")
 def add_bias(llm_data: List[Dict[str, Any]]):
     """Update table with LLM analysis results."""
     try:
@@ -146,11 +286,27 @@ def add_bias(llm_data: List[Dict[str, Any]]):
         cur = conn.cursor()
         
         for data in llm_data:
+            values = (data["bias"], data["rewritten_article"], data["title"])
             cur.execute("""
                 UPDATE data_news
                 SET bias = ?, rewritten_article = ?
                 WHERE title = ?
-            """, (data["bias"], data["rewritten_article"], data["title"]))
+            """, values)
+            
+            # Share the result with pending near-duplicates and future copies
+            cur.execute("""
+                UPDATE data_news
+                SET bias = ?, rewritten_article = ?
+                WHERE bias IS NULL AND duplicate_of IN (SELECT id FROM data_news WHERE title = ?)
+            """, values)
+            cur.execute("""
+                UPDATE article_fingerprints
+                SET bias = ?, rewritten_article = ?
+                WHERE article_id IN (
+                    SELECT id FROM data_news
+                    WHERE title = ? OR duplicate_of IN (SELECT id FROM data_news WHERE title = ?)
+                )
+            """, values + (data["title"],))
 
         conn.commit()
         print(f"Updated {len(llm_data)} records with bias analysis")
@@ -160,6 +316,16 @@ def add_bias(llm_data: List[Dict[str, Any]]):
         conn.close()
 
 
+def _release_orphaned_duplicates(cur):
+    """Pending near-duplicates whose original was deleted need their own analysis."""
+    cur.execute("""
+        UPDATE data_news SET duplicate_of = NULL
+        WHERE duplicate_of IS NOT NULL
+        AND duplicate_of NOT IN (SELECT id FROM data_news)
+    """)
+
+
+@traced("db.clear_old_articles")
 def clear_old_articles(days_old: int = 1):
     """Clear articles older than specified days."""
     conn = sqlite3.connect(news_DB)
@@ -172,6 +338,7 @@ def clear_old_articles(days_old: int = 1):
         """, (f'-{days_old} days',))
         
         deleted_count = cur.rowcount
+        _release_orphaned_duplicates(cur)
         conn.commit()
         print(f"Cleared {deleted_count} articles older than {days_old} days")
     except sqlite3.Error as e:
@@ -180,6 +347,7 @@ def clear_old_articles(days_old: int = 1):
         conn.close()
 
 
+@traced("db.clear_processed_articles")
 def clear_processed_articles():
     """Clear already processed articles to make room for new ones."""
     conn = sqlite3.connect(news_DB)
@@ -188,6 +356,7 @@ def clear_processed_articles():
     try:
         cur.execute("DELETE FROM data_news WHERE bias IS NOT NULL")
         deleted_count = cur.rowcount
+        _release_orphaned_duplicates(cur)
         conn.commit()
         print(f"Cleared {deleted_count} processed articles")
         return deleted_count
@@ -5,11 +5,17 @@ from .news_client import NewsClient
 from .groq_client import GroqClient
 from .claude_client import ClaudeClient
 from .model_factory import ModelFactory
+from .provider_registry import ProviderRegistry
+from .llm_gateway import LLMGateway
+from .circuit_breaker import CircuitBreakerBoard
 
 __all__ = [
     "GeminiClient", 
     "NewsClient", 
     "GroqClient", 
     "ClaudeClient", 
-    "ModelFactory"
+    "ModelFactory",
+    "ProviderRegistry",
+    "LLMGateway",
+    "CircuitBreakerBoard"
 ]
\ No newline at end of file
@@ -0,0 +1,277 @@
+# src/services/batch_client.py
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from dotenv import load_dotenv
+from .model_factory import ProviderType
+
+load_dotenv()
+
+
+class BatchService:
+    """
+    Submit many prompts at once and collect the answers later.
+
+    Each request is a dict with custom_id, prompt, system, max_tokens,
+    temperature and json_mode. Results map custom_id to response text
+    (None for requests the provider could not answer).
+    """
+
+    poll_interval = 30.0
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> str:
+        raise NotImplementedError
+
+    async def is_complete(self, batch_id: str) -> bool:
+        raise NotImplementedError
+
+    async def results(self, batch_id: str) -> Dict[str, Optional[str]]:
+        raise NotImplementedError
+
+    async def run(self, requests: List[Dict[str, Any]], timeout: float = 24 * 3600) -> Dict[str, Optional[str]]:
+        """Submit, poll until the batch ends, and return its results."""
+        batch_id = await self.submit(requests)
+        print(f"Submitted batch {batch_id} with {len(requests)} requests")
+
+        deadline = time.monotonic() + timeout
+        while not await self.is_complete(batch_id):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Batch {batch_id} did not finish within {timeout} seconds")
+            await asyncio.sleep(self.poll_interval)
+
+        return await self.results(batch_id)
+
+
+class AnthropicBatchService(BatchService):
+    """Anthropic Message Batches API."""
+
+    BASE_URL = "https://api.anthropic.com/v1/messages/batches"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not self.api_key:
+            raise ValueError("ANTHROPIC_API_KEY environment variable is required")
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        }
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> str:
+        payload = {"requests": []}
+        for request in requests:
+            params = {
+                "model": self.model_name,
+                "max_tokens": request["max_tokens"],
+                "temperature": request["temperature"],
+                "messages": [{"role": "user", "content": request["prompt"]}]
+            }
+            if request.get("system"):
+                params["system"] = request["system"]
+            payload["requests"].append({"custom_id": request["custom_id"], "params": params})
+
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            response = await client.post(self.BASE_URL, json=payload, headers=self._headers())
+            response.raise_for_status()
+            return response.json()["id"]
+
+    async def is_complete(self, batch_id: str) -> bool:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(f"{self.BASE_URL}/{batch_id}", headers=self._headers())
+            response.raise_for_status()
+            return response.json().get("processing_status") == "ended"
+
+    async def results(self, batch_id: str) -> Dict[str, Optional[str]]:
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            response = await client.get(f"{self.BASE_URL}/{batch_id}", headers=self._headers())
+            response.raise_for_status()
+            results_url = response.json()["results_url"]
+
+            response = await client.get(results_url, headers=self._headers())
+            response.raise_for_status()
+
+        results = {}
+        for line in response.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            result = item.get("result", {})
+            if result.get("type") == "succeeded":
+                content = result.get("message", {}).get("content", [])
+                results[item["custom_id"]] = content[0].get("text") if content else None
+            else:
+                results[item["custom_id"]] = None
+        return results
+
+
+class GroqBatchService(BatchService):
+    """Groq (OpenAI-compatible) batch API: upload a JSONL file, create a batch, download the output file."""
+
+    BASE_URL = "https://api.groq.com/openai/v1"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.api_key = os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY environment variable is required")
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> str:
+        lines = []
+        for request in requests:
+            messages = []
+            if request.get("system"):
+                messages.append({"role": "system", "content": request["system"]})
+            messages.append({"role": "user", "content": request["prompt"]})
+            body = {
+                "model": self.model_name,
+                "messages": messages,
+                "max_tokens": request["max_tokens"],
+                "temperature": request["temperature"]
+            }
+            if request.get("json_mode"):
+                body["response_format"] = {"type": "json_object"}
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            upload = await client.post(
+                f"{self.BASE_URL}/files",
+                headers=self._headers(),
+                data={"purpose": "batch"},
+                files={"file": ("batch.jsonl", "\n".join(lines).encode(), "application/jsonl")}
+            )
+            upload.raise_for_status()
+
+            response = await client.post(
+                f"{self.BASE_URL}/batches",
+                headers=self._headers(),
+                json={
+                    "input_file_id": upload.json()["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h"
+                }
+            )
+            response.raise_for_status()
+            return response.json()["id"]
+
+    async def is_complete(self, batch_id: str) -> bool:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(f"{self.BASE_URL}/batches/{batch_id}", headers=self._headers())
+            response.raise_for_status()
+            return response.json().get("status") in ("completed", "failed", "expired", "cancelled")
+
+    async def results(self, batch_id: str) -> Dict[str, Optional[str]]:
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            response = await client.get(f"{self.BASE_URL}/batches/{batch_id}", headers=self._headers())
+            response.raise_for_status()
+            output_file_id = response.json().get("output_file_id")
+            if not output_file_id:
+                return {}
+
+            response = await client.get(f"{self.BASE_URL}/files/{output_file_id}/content", headers=self._headers())
+            response.raise_for_status()
+
+        results = {}
+        for line in response.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            body = (item.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            results[item["custom_id"]] = choices[0]["message"]["content"] if choices else None
+        return results
+
+
+def _canned_response(request: Dict[str, Any]) -> str:
+    """Default LocalBatchService answer: a neutral analysis or the unchanged prompt text."""
+    if request.get("json_mode"):
+        return json.dumps({
+            "emotional_bias_score": 0,
+            "framing_bias_score": 0,
+            "omission_bias_score": 0,
+            "overall_bias_score": 0,
+            "biased_phrases": [],
+            "summary": "Local batch stand-in analysis"
+        })
+    return "Local batch stand-in response"
+
+
+class LocalBatchService(BatchService):
+    """
+    File-based stand-in for provider batch endpoints, for offline runs and tests.
+
+    submit() writes <id>.input.jsonl; the batch "runs" on the first poll after
+    `complete_after_polls` polls, writing <id>.output.jsonl through `responder`.
+    """
+
+    poll_interval = 0.0
+
+    def __init__(
+        self,
+        directory: str = "data/batches",
+        responder: Callable[[Dict[str, Any]], Optional[str]] = _canned_response,
+        complete_after_polls: int = 1
+    ):
+        self.directory = directory
+        self.responder = responder
+        self.complete_after_polls = complete_after_polls
+        self._polls: Dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, batch_id: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.{kind}.jsonl")
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> str:
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        with open(self._path(batch_id, "input"), "w") as f:
+            for request in requests:
+                f.write(json.dumps(request) + "\n")
+        self._polls[batch_id] = 0
+        return batch_id
+
+    async def is_complete(self, batch_id: str) -> bool:
+        if os.path.exists(self._path(batch_id, "output")):
+            return True
+
+        self._polls[batch_id] = self._polls.get(batch_id, 0) + 1
+        if self._polls[batch_id] < self.complete_after_polls:
+            return False
+
+        with open(self._path(batch_id, "input")) as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        with open(self._path(batch_id, "output"), "w") as f:
+            for request in requests:
+                f.write(json.dumps({"custom_id": request["custom_id"], "text": self.responder(request)}) + "\n")
+        return True
+
+    async def results(self, batch_id: str) -> Dict[str, Optional[str]]:
+        with open(self._path(batch_id, "output")) as f:
+            items = [json.loads(line) for line in f if line.strip()]
+        return {item["custom_id"]: item["text"] for item in items}
+
+
+def get_batch_service(provider: ProviderType, model_name: str, service: Optional[str] = None) -> BatchService:
+    """Pick the batch backend: 'local', or the provider's own batch API."""
+    service = (service or os.getenv("BATCH_SERVICE", "provider")).lower()
+    if service == "local":
+        return LocalBatchService(os.getenv("BATCH_DIR", "data/batches"))
+    if provider == ProviderType.CLAUDE:
+        return AnthropicBatchService(model_name)
+    if provider == ProviderType.GROQ:
+        return GroqBatchService(model_name)
+    raise ValueError(f"No batch API available for provider: {provider.value}")
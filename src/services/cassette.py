@@ -0,0 +1,495 @@
+# src/services/cassette.py
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+
+
+# SDK methods whose calls are recorded: Groq/OpenAI chat, Claude messages
+# (beta.tools on older SDKs) and Gemini generate_content
+RECORDED_CALLS = {
+    ("chat", "completions", "create"),
+    ("messages", "create"),
+    ("beta", "tools", "messages", "create"),
+    ("generate_content",),
+    ("generate_content_async",),
+}
+
+# Never written to a cassette
+SECRET_FIELDS = {"apiKey"}
+
+# Ignored when matching news requests, so a cassette replays on later days
+VOLATILE_FIELDS = SECRET_FIELDS | {"dateStart", "dateEnd", "from", "to"}
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded response for a request."""
+
+
+class ReplayedProviderError(Exception):
+    """A provider error replayed from a cassette, with the recorded status code."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ReplayedTimeoutError(ReplayedProviderError, TimeoutError):
+    """A recorded timeout; is_timeout_error() treats it like the original."""
+
+
+class Cassette:
+    """
+    Recorded LLM and news API traffic with the latency of each call.
+
+    In record mode ModelFactory wraps every SDK client in a RecordingClient
+    and NewsClient sends its requests through a RecordingTransport; each
+    request/response pair (or provider error) is appended to the cassette
+    file as one JSON line together with how long it took. API keys are
+    replaced before anything is written.
+
+    In replay mode ModelFactory hands out ReplayClients and NewsClient a
+    replay transport. Every response is served after its recorded latency
+    (times CASSETTE_SPEED) and recorded errors are raised again, so offline
+    runs see the production latency profile, 429s included. Matching is
+    exact first. With CASSETTE_MATCH=loose (the default), a request that was
+    never recorded gets the next recording of the same kind: same provider,
+    model and structured/text output, or the same news endpoint. That lets
+    changed prompts or other articles replay against real traffic.
+
+    Configured with CASSETTE_MODE (record, replay or off) and CASSETTE_PATH,
+    or Cassette.use() before clients are built.
+    """
+
+    _active: Optional["Cassette"] = None
+    _configured = False
+    _active_lock = threading.Lock()
+
+    def __init__(self, path: str, mode: str = "replay", match: Optional[str] = None, speed: Optional[float] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode!r} (use record or replay)")
+        self.path = path
+        self.mode = mode
+        self.match = (match or os.getenv("CASSETTE_MATCH", "loose")).lower()
+        self.speed = speed if speed is not None else float(os.getenv("CASSETTE_SPEED", "1"))
+        self.counts = {"recorded": 0, "exact": 0, "loose": 0, "miss": 0}
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        self._models: Dict[str, List[str]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self._load()
+
+    @classmethod
+    def active(cls) -> Optional["Cassette"]:
+        """The process-wide cassette, or None when recording and replay are off."""
+        with cls._active_lock:
+            if not cls._configured:
+                mode = os.getenv("CASSETTE_MODE", "off").lower()
+                if mode != "off":
+                    cls._active = cls(os.getenv("CASSETTE_PATH", "data/cassettes/traffic.jsonl"), mode)
+                cls._configured = True
+            return cls._active
+
+    @classmethod
+    def use(cls, path: Optional[str], mode: str = "replay", **options) -> Optional["Cassette"]:
+        """Make `path` the process-wide cassette (None turns cassettes off)."""
+        with cls._active_lock:
+            cls._active = cls(path, mode, **options) if path else None
+            cls._configured = True
+            return cls._active
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    self._index(json.loads(line))
+
+    def _index(self, entry: Dict[str, Any]):
+        self._by_key.setdefault(entry["key"], []).append(entry)
+        self._by_kind.setdefault(entry["kind_key"], []).append(entry)
+        if entry["kind"] == "llm":
+            models = self._models.setdefault(entry["provider"], [])
+            if entry["model"] not in models:
+                models.append(entry["model"])
+
+    def record(self, entry: Dict[str, Any]):
+        entry["recorded_at"] = datetime.now().isoformat(timespec="seconds")
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+            self.counts["recorded"] += 1
+
+    def lookup(self, key: str, kind_key: str) -> Dict[str, Any]:
+        """
+        The recorded entry for a request. Repeated requests get the recordings
+        in order, cycling once they run out.
+        """
+        with self._lock:
+            if key in self._by_key:
+                self.counts["exact"] += 1
+                return self._next(key, self._by_key[key])
+            if self.match == "loose" and kind_key in self._by_kind:
+                self.counts["loose"] += 1
+                return self._next(kind_key, self._by_kind[kind_key])
+            self.counts["miss"] += 1
+        raise CassetteMiss(f"No recording for {kind_key} in {self.path}")
+
+    def _next(self, cursor: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        position = self._cursors.get(cursor, 0)
+        self._cursors[cursor] = position + 1
+        return entries[position % len(entries)]
+
+    def delay(self, entry: Dict[str, Any]) -> float:
+        return max(0.0, entry.get("latency", 0.0) * self.speed)
+
+    def models(self, provider: str) -> List[str]:
+        """Model names recorded for a provider, in first-seen order."""
+        return list(self._models.get(provider, []))
+
+    def wrap_client(self, client, provider: str, model_name: str) -> "RecordingClient":
+        return RecordingClient(client, self, provider, model_name)
+
+    def replay_client(self, provider: str, model_name: Optional[str] = None) -> "ReplayClient":
+        """Client answering from the cassette; the requested model if recorded, else the first recorded one."""
+        models = self.models(provider)
+        if not models:
+            raise RuntimeError(f"No {provider} traffic recorded in {self.path}")
+        return ReplayClient(self, provider, model_name if model_name in models else models[0])
+
+    def async_transport(self) -> httpx.AsyncBaseTransport:
+        return RecordingTransport(self) if self.recording else ReplayTransport(self)
+
+    def sync_transport(self) -> httpx.BaseTransport:
+        return RecordingSyncTransport(self) if self.recording else ReplaySyncTransport(self)
+
+
+# LLM traffic
+
+def llm_request_keys(provider: str, model_name: str, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+    """(exact key, kind key, JSON-safe request) for one SDK call."""
+    request = json.loads(json.dumps({"args": list(args), "kwargs": kwargs}, default=str))
+    canonical = json.dumps({"provider": provider, "model": model_name, **request}, sort_keys=True)
+    settings = json.dumps(request["kwargs"])
+    structured = "response_format" in request["kwargs"] or "tools" in request["kwargs"] or "application/json" in settings
+    kind_key = f"llm:{provider}:{model_name}:{'structured' if structured else 'text'}"
+    return hashlib.sha256(canonical.encode()).hexdigest(), kind_key, request
+
+
+def _normalize_response(provider: str, response) -> Dict[str, Any]:
+    """The parts of an SDK response the gateway reads, as JSON."""
+    if provider == "gemini":
+        try:
+            text = response.text
+        except Exception:
+            text = None
+        usage = getattr(response, "usage_metadata", None)
+        return {
+            "text": text,
+            "usage": [usage.prompt_token_count, usage.candidates_token_count] if usage is not None else None
+        }
+    if provider == "claude":
+        blocks = []
+        for block in getattr(response, "content", None) or []:
+            if getattr(block, "type", None) == "tool_use":
+                blocks.append({"type": "tool_use", "name": block.name, "input": block.input})
+            else:
+                blocks.append({"type": "text", "text": getattr(block, "text", "")})
+        usage = getattr(response, "usage", None)
+        return {
+            "content": blocks,
+            "usage": [usage.input_tokens, usage.output_tokens] if usage is not None else None
+        }
+    usage = getattr(response, "usage", None)
+    return {
+        "text": response.choices[0].message.content,
+        "usage": [usage.prompt_tokens, usage.completion_tokens] if usage is not None else None
+    }
+
+
+def _build_response(provider: str, recorded: Dict[str, Any]):
+    """An object shaped like the provider SDK's response."""
+    usage = recorded.get("usage")
+    if provider == "gemini":
+        return SimpleNamespace(
+            text=recorded["text"],
+            usage_metadata=SimpleNamespace(prompt_token_count=usage[0], candidates_token_count=usage[1]) if usage else None
+        )
+    if provider == "claude":
+        return SimpleNamespace(
+            content=[SimpleNamespace(**block) for block in recorded["content"]],
+            usage=SimpleNamespace(input_tokens=usage[0], output_tokens=usage[1]) if usage else None
+        )
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=recorded["text"]))],
+        usage=SimpleNamespace(prompt_tokens=usage[0], completion_tokens=usage[1]) if usage else None
+    )
+
+
+def _error_entry(error: Exception) -> Dict[str, Any]:
+    return {
+        "type": type(error).__name__,
+        "message": str(error)[:1000],
+        "status_code": getattr(error, "status_code", None),
+        "timeout": isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "timeout" in type(error).__name__.lower()
+    }
+
+
+class RecordingClient:
+    """Proxy for an SDK client that records the calls in RECORDED_CALLS; everything else passes through."""
+
+    def __init__(self, target, cassette: Cassette, provider: str, model_name: str, path: Tuple[str, ...] = ()):
+        self.target = target
+        self.cassette = cassette
+        self.provider = provider
+        self.model_name = model_name
+        self._path = path
+
+    def __getattr__(self, name: str):
+        value = getattr(self.target, name)
+        path = self._path + (name,)
+        if path in RECORDED_CALLS:
+            return self._recorder(value)
+        if any(call[:len(path)] == path for call in RECORDED_CALLS):
+            return RecordingClient(value, self.cassette, self.provider, self.model_name, path)
+        return value
+
+    def rewrap(self, target) -> "RecordingClient":
+        """Record another client (e.g. the async counterpart) under this provider and model."""
+        return RecordingClient(target, self.cassette, self.provider, self.model_name)
+
+    def _recorder(self, method):
+        def call(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                self._save(args, kwargs, started, error=e)
+                raise
+            if inspect.isawaitable(result):
+                return self._finish_async(result, args, kwargs, started)
+            self._save(args, kwargs, started, response=result)
+            return result
+        return call
+
+    async def _finish_async(self, awaitable, args, kwargs, started: float):
+        try:
+            result = await awaitable
+        except Exception as e:
+            self._save(args, kwargs, started, error=e)
+            raise
+        self._save(args, kwargs, started, response=result)
+        return result
+
+    def _save(self, args, kwargs, started: float, response=None, error: Optional[Exception] = None):
+        latency = time.monotonic() - started
+        key, kind_key, request = llm_request_keys(self.provider, self.model_name, args, kwargs)
+        try:
+            recorded = _normalize_response(self.provider, response) if error is None else None
+        except Exception as e:
+            print(f"Cassette could not record {self.provider} response: {e}")
+            return
+        self.cassette.record({
+            "kind": "llm",
+            "provider": self.provider,
+            "model": self.model_name,
+            "key": key,
+            "kind_key": kind_key,
+            "request": request,
+            "response": recorded,
+            "error": _error_entry(error) if error is not None else None,
+            "latency": round(latency, 4)
+        })
+
+
+class ReplayClient:
+    """
+    SDK-shaped client answering from a cassette: client.chat.completions.create
+    (Groq), client.messages.create (Claude) or generate_content[_async]
+    (Gemini), each after the recorded latency.
+    """
+
+    def __init__(self, cassette: Cassette, provider: str, model_name: str, asynchronous: bool = False):
+        self.cassette = cassette
+        self.provider = provider
+        self.model_name = model_name
+        self.asynchronous = asynchronous
+        create = self._create_async if asynchronous else self._create
+        if provider == "gemini":
+            # GenerativeModel is its own async client
+            self.generate_content = self._create
+            self.generate_content_async = self._create_async
+        elif provider == "claude":
+            self.messages = SimpleNamespace(create=create)
+        else:
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    def as_async(self) -> "ReplayClient":
+        if self.provider == "gemini":
+            return self
+        return ReplayClient(self.cassette, self.provider, self.model_name, asynchronous=True)
+
+    def _replay(self, args, kwargs) -> Tuple[float, Any]:
+        key, kind_key, _ = llm_request_keys(self.provider, self.model_name, args, kwargs)
+        entry = self.cassette.lookup(key, kind_key)
+        error = entry.get("error")
+        if error:
+            error_class = ReplayedTimeoutError if error.get("timeout") else ReplayedProviderError
+            return self.cassette.delay(entry), error_class(f"{error['type']}: {error['message']}", error.get("status_code"))
+        return self.cassette.delay(entry), _build_response(self.provider, entry["response"])
+
+    def _create(self, *args, **kwargs):
+        delay, outcome = self._replay(args, kwargs)
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def _create_async(self, *args, **kwargs):
+        delay, outcome = self._replay(args, kwargs)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+# News API traffic
+
+def http_request_keys(request: httpx.Request) -> Tuple[str, str, Dict[str, Any]]:
+    """(exact key, kind key, request with secrets removed) for one HTTP request."""
+    params = {key: value for key, value in request.url.params.multi_items() if key not in VOLATILE_FIELDS}
+    body = request.content.decode("utf-8", errors="replace") if request.content else ""
+    try:
+        parsed = json.loads(body) if body else None
+    except ValueError:
+        parsed = None
+    matched_body = {key: value for key, value in parsed.items() if key not in VOLATILE_FIELDS} \
+        if isinstance(parsed, dict) else body
+
+    canonical = json.dumps({
+        "method": request.method,
+        "url": f"{request.url.host}{request.url.path}",
+        "params": sorted(params.items()),
+        "body": matched_body
+    }, sort_keys=True)
+
+    url = request.url
+    for field in SECRET_FIELDS:
+        if field in url.params:
+            url = url.copy_set_param(field, "REDACTED")
+    if isinstance(parsed, dict):
+        stored_body = {key: ("REDACTED" if key in SECRET_FIELDS else value) for key, value in parsed.items()}
+    else:
+        stored_body = body
+    stored = {"method": request.method, "url": str(url), "body": stored_body}
+    kind_key = f"http:{request.method}:{request.url.host}{request.url.path}"
+    return hashlib.sha256(canonical.encode()).hexdigest(), kind_key, stored
+
+
+def _record_http(cassette: Cassette, request: httpx.Request, status_code: int, headers, content: bytes, latency: float):
+    key, kind_key, stored = http_request_keys(request)
+    cassette.record({
+        "kind": "http",
+        "key": key,
+        "kind_key": kind_key,
+        "request": stored,
+        "response": {
+            "status_code": status_code,
+            "content_type": headers.get("content-type", ""),
+            "content": content.decode("utf-8", errors="replace")
+        },
+        "error": None,
+        "latency": round(latency, 4)
+    })
+
+
+def _replayed_response(request: httpx.Request, entry: Dict[str, Any]) -> httpx.Response:
+    recorded = entry["response"]
+    headers = {"content-type": recorded["content_type"]} if recorded.get("content_type") else {}
+    return httpx.Response(recorded["status_code"], headers=headers, content=recorded["content"].encode(), request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Sends requests over the network and records each exchange with its latency."""
+
+    def __init__(self, cassette: Cassette, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        await response.aclose()
+        _record_http(self.cassette, request, response.status_code, response.headers, content, time.monotonic() - started)
+        # Decoded content: drop content-encoding/length headers that described the wire format
+        headers = {"content-type": response.headers.get("content-type", "")}
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class RecordingSyncTransport(httpx.BaseTransport):
+    def __init__(self, cassette: Cassette, inner: Optional[httpx.BaseTransport] = None):
+        self.cassette = cassette
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = self.inner.handle_request(request)
+        content = response.read()
+        response.close()
+        _record_http(self.cassette, request, response.status_code, response.headers, content, time.monotonic() - started)
+        headers = {"content-type": response.headers.get("content-type", "")}
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answers requests from the cassette after the recorded latency; raises CassetteMiss otherwise."""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key, kind_key, _ = http_request_keys(request)
+        entry = self.cassette.lookup(key, kind_key)
+        await asyncio.sleep(self.cassette.delay(entry))
+        return _replayed_response(request, entry)
+
+
+class ReplaySyncTransport(httpx.BaseTransport):
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key, kind_key, _ = http_request_keys(request)
+        entry = self.cassette.lookup(key, kind_key)
+        time.sleep(self.cassette.delay(entry))
+        return _replayed_response(request, entry)
@@ -0,0 +1,167 @@
+# src/services/circuit_breaker.py
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from .model_factory import ProviderType
+
+
+class CircuitBreaker:
+    """
+    Per-provider breaker driven by error rate and slow-call rate.
+
+    closed    - calls flow; outcomes are tracked over a rolling window
+    open      - calls are refused until a background re-probe succeeds
+    half_open - the re-probe passed; a single trial call decides whether the
+                breaker closes again or re-opens, and other calls are refused
+                while it is in flight
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        cooldown_seconds: float = 30.0
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.cooldown_seconds = cooldown_seconds
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.trial_started_at = 0.0
+        self.times_opened = 0
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Whether a real call may be sent to this provider right now.
+
+        While half-open this claims the one trial call; a claim that never
+        reports back expires after slow_call_seconds, when it would count as
+        slow anyway.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return False
+            now = time.monotonic()
+            if self.trial_started_at and now - self.trial_started_at < self.slow_call_seconds:
+                return False
+            self.trial_started_at = now
+            return True
+
+    def needs_probe(self) -> bool:
+        """True once an open breaker has cooled down and nobody is probing it."""
+        with self._lock:
+            return self.state == self.OPEN and not self.probing and time.monotonic() - self.opened_at >= self.cooldown_seconds
+
+    def start_probe(self) -> bool:
+        """Claim the re-probe for this breaker; False if another caller has it."""
+        with self._lock:
+            if self.probing or self.state != self.OPEN:
+                return False
+            self.probing = True
+            return True
+
+    def probe_finished(self, healthy: bool):
+        with self._lock:
+            self.probing = False
+            if healthy:
+                self.state = self.HALF_OPEN
+                self.trial_started_at = 0.0
+            else:
+                self.opened_at = time.monotonic()
+
+    def record_success(self, latency: float):
+        with self._lock:
+            slow = latency >= self.slow_call_seconds
+            self._outcomes.append(not slow)
+            if self.state == self.HALF_OPEN:
+                if slow:
+                    self._trip()
+                else:
+                    self.state = self.CLOSED
+                    self.trial_started_at = 0.0
+                    self._outcomes.clear()
+                return
+            self._evaluate()
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(False)
+            if self.state == self.HALF_OPEN:
+                self._trip()
+                return
+            self._evaluate()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = len(self._outcomes)
+            failures = sum(1 for ok in self._outcomes if not ok)
+            return {
+                "state": self.state,
+                "recent_calls": calls,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "times_opened": self.times_opened
+            }
+
+    def _evaluate(self):
+        if self.state != self.CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        failures = sum(1 for ok in self._outcomes if not ok)
+        if failures / len(self._outcomes) >= self.failure_rate_threshold:
+            self._trip()
+
+    def _trip(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self.trial_started_at = 0.0
+        self._outcomes.clear()
+
+
+class CircuitBreakerBoard:
+    """Process-wide set of breakers, one per provider."""
+
+    _shared: Optional["CircuitBreakerBoard"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options or {
+            "failure_rate_threshold": float(os.getenv("BREAKER_FAILURE_RATE", "0.5")),
+            "slow_call_seconds": float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "30")),
+            "cooldown_seconds": float(os.getenv("BREAKER_COOLDOWN_SECONDS", "30")),
+        }
+        self._breakers: Dict[ProviderType, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "CircuitBreakerBoard":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def get(self, provider: ProviderType) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(**self.breaker_options)
+            return self._breakers[provider]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {provider.value: breaker.snapshot() for provider, breaker in self._breakers.items()}
@@ -4,14 +4,22 @@ import json
 import os
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-from .model_factory import ModelFactory
+from .provider_registry import ProviderRegistry
+from .structured_output import (
+    BIAS_ANALYSIS_SCHEMA,
+    ParseStats,
+    claude_messages_api,
+    claude_tool_input,
+    claude_tool_params,
+    parse_structured
+)
 
 load_dotenv()
 
 
 class ClaudeClient:
     def __init__(self):
-        self.client, self.model_name, self.provider = ModelFactory.get_model()
+        self.client, self.model_name, self.provider = ProviderRegistry.get_model()
         
     def analyze_bias(self, article_text: str) -> Dict[str, Any]:
         if not article_text or len(article_text.strip()) < 10:
@@ -20,15 +28,17 @@ class ClaudeClient:
         prompt = self._create_bias_analysis_prompt(article_text)
         
         try:
-            response = self.client.messages.create(
-                model=self.model,
+            response = claude_messages_api(self.client).create(
+                model=self.model_name,
                 max_tokens=2048,
                 temperature=0.1,
                 system="You are an expert media bias analyst. Always respond with valid JSON.",
-                messages=[{"role": "user", "content": prompt}]
+                messages=[{"role": "user", "content": prompt}],
+                **claude_tool_params(BIAS_ANALYSIS_SCHEMA)
             )
             
-            result_text = response.content[0].text
+            tool_input = claude_tool_input(response)
+            result_text = json.dumps(tool_input) if tool_input is not None else response.content[0].text
             result = self._extract_json(result_text)
             
             if self._validate_response(result):
@@ -69,15 +79,9 @@ class ClaudeClient:
         """
 
     def _extract_json(self, text: str) -> Dict[str, Any]:
-        try:
-            start = text.find('{')
-            end = text.rfind('}') + 1
-            if start != -1 and end != 0:
-                json_str = text[start:end]
-                return json.loads(json_str)
-            return self._get_fallback_response()
-        except:
-            return self._get_fallback_response()
+        result, status = parse_structured(text, BIAS_ANALYSIS_SCHEMA)
+        ParseStats.shared().record(self.provider.value, self.model_name, status)
+        return result if result is not None else self._get_fallback_response()
 
     def _validate_response(self, response: Dict[str, Any]) -> bool:
         required_fields = [
@@ -0,0 +1,210 @@
+# src/services/concurrency_limiter.py
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class DeadlineExceeded(Exception):
+    """Work was dropped because its deadline passed before a slot freed up."""
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on how many articles are analyzed at once.
+
+    The limit grows by one after a full round (`limit` calls) of healthy
+    completions while it is actually the bottleneck, and is multiplied by
+    DECREASE_FACTOR on a 429, a timeout, or when recent latency for a
+    model/token budget rises above its long-run average by LATENCY_TOLERANCE.
+    Decreases are spaced by a cooldown so one burst of errors counts once.
+
+    Waiters are served in order of the key they pass to acquire()/slot()
+    (lowest first, FIFO among equal keys), which is how the scheduler puts
+    interactive work ahead of background runs.
+    """
+
+    _shared: Optional["AdaptiveConcurrencyLimiter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        initial_limit: int = None,
+        min_limit: int = None,
+        max_limit: int = None,
+        decrease_factor: float = None,
+        latency_tolerance: float = None,
+        cooldown_seconds: float = None,
+        history_size: int = 200
+    ):
+        self.min_limit = min_limit or int(os.getenv("AIMD_MIN_LIMIT", "1"))
+        self.max_limit = max_limit or int(os.getenv("AIMD_MAX_LIMIT", "16"))
+        initial = initial_limit or int(os.getenv("AIMD_INITIAL_LIMIT", "3"))
+        self.limit = max(self.min_limit, min(self.max_limit, initial))
+        self.decrease_factor = decrease_factor or float(os.getenv("AIMD_DECREASE_FACTOR", "0.5"))
+        self.latency_tolerance = latency_tolerance or float(os.getenv("AIMD_LATENCY_TOLERANCE", "1.5"))
+        self.cooldown_seconds = cooldown_seconds if cooldown_seconds is not None else float(os.getenv("AIMD_COOLDOWN_SECONDS", "5"))
+
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.history: Deque[Tuple[float, int, str]] = deque([(time.time(), self.limit, "initial")], maxlen=history_size)
+
+        self._healthy_streak = 0
+        self._last_decrease = 0.0
+        # (short EWMA, long EWMA, samples) of call latency per model and token budget
+        self._latency: Dict[Tuple[str, int], Tuple[float, float, int]] = {}
+        self._lock = threading.Lock()
+        # (key, arrival, loop, future) for callers waiting on a slot
+        self._waiters = []
+        self._arrivals = itertools.count()
+
+    @classmethod
+    def shared(cls) -> "AdaptiveConcurrencyLimiter":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @asynccontextmanager
+    async def slot(self, key: Tuple = (0,), deadline: Optional[float] = None):
+        """Hold one unit of concurrency for the duration of the block."""
+        await self.acquire(key, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, key: Tuple = (0,), deadline: Optional[float] = None):
+        """
+        Wait for a slot.
+
+        Args:
+            key: Waiters with lower keys are served first
+            deadline: time.monotonic() after which to give up with DeadlineExceeded
+        """
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded("deadline passed before analysis started")
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return
+            granted = loop.create_future()
+            heapq.heappush(self._waiters, (key, next(self._arrivals), loop, granted))
+        # Entries left by cancelled waiters may be what kept us off the fast path
+        self._grant_waiters()
+
+        try:
+            if deadline is None:
+                await granted
+            else:
+                await asyncio.wait_for(granted, max(0.0, deadline - time.monotonic()))
+        except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+            # Gave up after the slot was handed over: give it back
+            if granted.done() and not granted.cancelled():
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                raise DeadlineExceeded("deadline passed while waiting for a slot") from None
+            raise
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._grant_waiters()
+
+    @property
+    def waiting(self) -> int:
+        with self._lock:
+            return sum(1 for *_, granted in self._waiters if not granted.done())
+
+    def record_success(self, model_name: str, max_tokens: int, latency: float):
+        """A call finished; grow the limit if latency is flat, shrink it if latency is rising."""
+        key = (model_name, max_tokens)
+        with self._lock:
+            short, long, samples = self._latency.get(key, (latency, latency, 0))
+            short = 0.3 * latency + 0.7 * short
+            long = 0.05 * latency + 0.95 * long
+            self._latency[key] = (short, long, samples + 1)
+            rising = samples >= 10 and short > long * self.latency_tolerance
+
+        if rising:
+            self.record_overload("latency_rising")
+            return
+
+        grew = False
+        with self._lock:
+            self._healthy_streak += 1
+            saturated = self.in_flight >= self.limit - 1
+            if saturated and self._healthy_streak >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self.increases += 1
+                self._healthy_streak = 0
+                self.history.append((time.time(), self.limit, "increase"))
+                grew = True
+        if grew:
+            self._grant_waiters()
+
+    def record_overload(self, reason: str):
+        """A 429, timeout or latency rise: cut the limit multiplicatively (once per cooldown)."""
+        now = time.monotonic()
+        with self._lock:
+            self._healthy_streak = 0
+            if now - self._last_decrease < self.cooldown_seconds:
+                return
+            new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+            self._last_decrease = now
+            if new_limit == self.limit:
+                return
+            self.limit = new_limit
+            self.decreases += 1
+            self.history.append((time.time(), self.limit, reason))
+        print(f"Concurrency limit lowered to {new_limit} ({reason})")
+
+    def snapshot(self, history: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "waiting": sum(1 for *_, granted in self._waiters if not granted.done()),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "history": [
+                    {"timestamp": timestamp, "limit": limit, "reason": reason}
+                    for timestamp, limit, reason in list(self.history)[-history:]
+                ]
+            }
+
+    def _grant_waiters(self):
+        """Hand free slots to the lowest-keyed waiters."""
+        grants = []
+        with self._lock:
+            while self._waiters and self.in_flight < self.limit:
+                _, _, loop, granted = heapq.heappop(self._waiters)
+                if granted.done() or loop.is_closed():
+                    continue
+                self.in_flight += 1
+                grants.append((loop, granted))
+        for loop, granted in grants:
+            loop.call_soon_threadsafe(self._resolve, granted)
+
+    def _resolve(self, granted: asyncio.Future):
+        if granted.done():
+            # The waiter was cancelled before the slot reached it
+            self.release()
+        else:
+            granted.set_result(True)
+
+
+def is_timeout_error(error: Exception) -> bool:
+    """asyncio/httpx/SDK timeouts, which all signal an overloaded provider."""
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "timeout" in type(error).__name__.lower()
@@ -0,0 +1,226 @@
+# src/services/fake_llm.py
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_CANNED_JSON: Dict[str, Any] = {
+    "emotional_bias_score": 35,
+    "framing_bias_score": 40,
+    "omission_bias_score": 25,
+    "overall_bias_score": 35,
+    "biased_phrases": [
+        {
+            "text": "reckless",
+            "bias_type": "emotional",
+            "explanation": "Loaded adjective",
+            "suggested_replacement": "disputed"
+        }
+    ],
+    "summary": "Moderate emotional framing in a few phrases",
+    # Fused-analysis fields; ignored by the plain detector schema
+    "neutral_text": "The council approved the budget after a long session.",
+    "neutral_title": "Council approves budget",
+    "explanation": "A few loaded adjectives were replaced with neutral wording."
+}
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+class FakeProviderError(Exception):
+    """A provider-side failure (HTTP 500) injected by the fake provider."""
+
+    status_code = 500
+
+
+class FakeRateLimitError(FakeProviderError):
+    """An injected 429; is_rate_limit_error() treats it like a real one."""
+
+    status_code = 429
+
+
+class FakeLLMProfile:
+    """
+    How the fake provider behaves: latency distribution, per-token
+    generation time, injected 500/429 rates and the canned answers.
+
+    Latency specs are "<distribution>:<params>" in seconds:
+    fixed:0.5, uniform:0.2,0.8, normal:0.5,0.1 (mean, stddev),
+    lognormal:0.5,0.4 (median, sigma), exponential:0.5 (mean).
+    """
+
+    def __init__(
+        self,
+        latency: str = "lognormal:0.3,0.4",
+        per_token_seconds: float = 0.001,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int = 0,
+        canned_json: Optional[Dict[str, Any]] = None,
+        canned_text: Optional[str] = None
+    ):
+        self.distribution, self.params = parse_latency(latency)
+        self.latency = latency
+        self.per_token_seconds = per_token_seconds
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.seed = seed
+        self.canned_json = canned_json or DEFAULT_CANNED_JSON
+        # None: echo part of the prompt, so rewrites scale with the article
+        self.canned_text = canned_text
+
+    @classmethod
+    def from_env(cls) -> "FakeLLMProfile":
+        canned_json = None
+        path = os.getenv("FAKE_LLM_JSON")
+        if path:
+            with open(path) as f:
+                canned_json = json.load(f)
+        return cls(
+            latency=os.getenv("FAKE_LLM_LATENCY", "lognormal:0.3,0.4"),
+            per_token_seconds=float(os.getenv("FAKE_LLM_PER_TOKEN_SECONDS", "0.001")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("FAKE_LLM_429_RATE", "0")),
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+            canned_json=canned_json
+        )
+
+    def draw_latency(self, rng: random.Random) -> float:
+        """Time to first token, in seconds."""
+        p = self.params
+        if self.distribution == "fixed":
+            value = p[0]
+        elif self.distribution == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.distribution == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.distribution == "lognormal":
+            value = rng.lognormvariate(math.log(p[0]), p[1])
+        else:
+            value = rng.expovariate(1.0 / p[0])
+        return max(0.0, value)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency,
+            "per_token_seconds": self.per_token_seconds,
+            "error_rate": self.error_rate,
+            "rate_limit_rate": self.rate_limit_rate,
+            "seed": self.seed
+        }
+
+
+def parse_latency(spec: str) -> Tuple[str, List[float]]:
+    distribution, _, raw = spec.partition(":")
+    distribution = distribution.strip().lower()
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+    if distribution not in expected:
+        raise ValueError(f"Unknown latency distribution {distribution!r}; use one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+    try:
+        params = [float(value) for value in raw.split(",") if value.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid latency parameters in {spec!r}") from None
+    if len(params) != expected[distribution]:
+        raise ValueError(f"{distribution} latency takes {expected[distribution]} parameter(s), got {spec!r}")
+    if distribution in ("lognormal", "exponential") and params[0] <= 0:
+        raise ValueError(f"{distribution} latency needs a positive median/mean, got {spec!r}")
+    return distribution, params
+
+
+class FakeLLMClient:
+    """
+    In-process stand-in for a chat-completions SDK client (the Groq/OpenAI
+    shape: client.chat.completions.create(...) returning choices and usage).
+
+    JSON-mode requests get the canned JSON, other requests get text; latency
+    is drawn from the profile plus per_token_seconds per completion token.
+    Draws are seeded by the prompt and how often it was sent, so a run is
+    reproducible however its calls interleave. The sync client sleeps, the
+    async one (as_async()) awaits; both share counters.
+    """
+
+    def __init__(self, profile: Optional[FakeLLMProfile] = None, asynchronous: bool = False):
+        self.profile = profile or FakeLLMProfile.from_env()
+        self.asynchronous = asynchronous
+        self.stats = {"calls": 0, "errors": 0, "rate_limited": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        create = self._create_async if asynchronous else self._create
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    def as_async(self) -> "FakeLLMClient":
+        """Async counterpart sharing this client's profile, counters and seeds."""
+        client = FakeLLMClient(self.profile, asynchronous=True)
+        client.stats, client._attempts, client._lock = self.stats, self._attempts, self._lock
+        return client
+
+    def _create(self, **kwargs):
+        delay, outcome = self._plan(kwargs)
+        time.sleep(delay)
+        return self._deliver(outcome)
+
+    async def _create_async(self, **kwargs):
+        delay, outcome = self._plan(kwargs)
+        await asyncio.sleep(delay)
+        return self._deliver(outcome)
+
+    def _plan(self, kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+        """(seconds to wait, response or exception) for one request."""
+        prompt = "\n".join(message["content"] for message in kwargs.get("messages", []))
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+            self.stats["calls"] += 1
+        rng = random.Random(f"{self.profile.seed}:{digest}:{attempt}")
+        latency = self.profile.draw_latency(rng)
+
+        roll = rng.random()
+        if roll < self.profile.rate_limit_rate:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            # Quota rejections come back quickly
+            return latency * 0.1, FakeRateLimitError("429 Too Many Requests: fake provider rate limit")
+        if roll < self.profile.rate_limit_rate + self.profile.error_rate:
+            with self._lock:
+                self.stats["errors"] += 1
+            return latency, FakeProviderError("500 Internal Server Error: injected fake provider failure")
+
+        if kwargs.get("response_format", {}).get("type") == "json_object":
+            text = json.dumps(self.profile.canned_json)
+        else:
+            text = self.profile.canned_text or _echo(prompt, kwargs.get("max_tokens", 1000))
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(text) // 4)
+        with self._lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+
+        response = SimpleNamespace(
+            model=kwargs.get("model"),
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop")],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        )
+        return latency + completion_tokens * self.profile.per_token_seconds, response
+
+    def _deliver(self, outcome):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _echo(prompt: str, max_tokens: int) -> str:
+    """The prompt's last words, up to max_tokens (~4 characters each)."""
+    budget = max_tokens * 4
+    text = prompt[-budget:]
+    if len(prompt) > budget and " " in text:
+        text = text.split(" ", 1)[1]
+    return text.strip() or "Neutral text."
@@ -1,17 +1,17 @@
 # src/services/gemini_client.py
 
-import json
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv
-from .model_factory import ModelFactory
+from .provider_registry import ProviderRegistry
+from .structured_output import BIAS_ANALYSIS_SCHEMA, ParseStats, gemini_json_config, parse_structured
 
 load_dotenv()
 
 
 class GeminiClient:
     def __init__(self) -> None:
-        self.client, self.model_name, self.provider = ModelFactory.get_model()
+        self.client, self.model_name, self.provider = ProviderRegistry.get_model()
 
     def analyze_bias(self, article_text: str) -> Dict[str, Any]:
         if not article_text or len(article_text.strip()) < 10:
@@ -20,7 +20,10 @@ class GeminiClient:
         prompt = self._create_bias_analysis_prompt(article_text)
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self.client.generate_content(
+                prompt,
+                generation_config=gemini_json_config(BIAS_ANALYSIS_SCHEMA) or None
+            )
             result = self._extract_json(response.text)
             
             if self._validate_response(result):
@@ -63,22 +66,9 @@ class GeminiClient:
         """
 
     def _extract_json(self, text: str) -> Dict[str, Any]:
-        try:
-            cleaned = text.strip().replace('```json', '').replace('```', '').strip()
-            
-            start = cleaned.find('{')
-            end = cleaned.rfind('}') + 1
-            
-            if start == -1 or end == 0:
-                return self._get_fallback_response()
-                
-            json_str = cleaned[start:end]
-            return json.loads(json_str)
-            
-        except json.JSONDecodeError:
-            return self._get_fallback_response()
-        except Exception:
-            return self._get_fallback_response()
+        result, status = parse_structured(text, BIAS_ANALYSIS_SCHEMA)
+        ParseStats.shared().record(self.provider.value, self.model_name, status)
+        return result if result is not None else self._get_fallback_response()
 
     def _validate_response(self, response: Dict[str, Any]) -> bool:
         required_fields = [
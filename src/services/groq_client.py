@@ -4,14 +4,14 @@ import json
 import os
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-from .model_factory import ModelFactory
+from .provider_registry import ProviderRegistry
 
 load_dotenv()
 
 
 class GroqClient:
     def __init__(self):
-        self.client, self.model_name, self.provider = ModelFactory.get_model()
+        self.client, self.model_name, self.provider = ProviderRegistry.get_model()
 
     def analyze_bias(self, article_text: str) -> Dict[str, Any]:
         if not article_text or len(article_text.strip()) < 10:
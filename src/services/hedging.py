@@ -0,0 +1,85 @@
+# src/services/hedging.py
+
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from .model_factory import ProviderType
+
+
+class HedgePolicy:
+    """
+    Decides when to hedge a slow call and keeps the numbers needed to tune it.
+
+    A hedge fires once a call has run longer than the configured percentile of
+    recent latencies for its provider/model and stage, so long rewrites don't
+    inflate the delay for short detection calls. Until enough samples exist
+    the fixed default delay is used.
+    """
+
+    _shared: Optional["HedgePolicy"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        percentile: float = None,
+        default_delay: float = None,
+        min_samples: int = 10,
+        window: int = 200
+    ):
+        self.percentile = percentile if percentile is not None else float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+        self.default_delay = default_delay if default_delay is not None else float(os.getenv("LLM_HEDGE_DELAY", "8"))
+        self.min_samples = min_samples
+        self.window = window
+
+        self.hedged_calls = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+
+        self._latencies: Dict[Tuple[ProviderType, str, Optional[str]], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "HedgePolicy":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def record_latency(self, provider: ProviderType, model_name: str, latency: float, stage: Optional[str] = None):
+        with self._lock:
+            key = (provider, model_name, stage)
+            if key not in self._latencies:
+                self._latencies[key] = deque(maxlen=self.window)
+            self._latencies[key].append(latency)
+
+    def hedge_delay(self, provider: ProviderType, model_name: str, stage: Optional[str] = None) -> float:
+        """Seconds to wait on the primary call before sending a hedge."""
+        with self._lock:
+            samples = sorted(self._latencies.get((provider, model_name, stage), ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return samples[index]
+
+    def record_outcome(self, hedge_sent: bool, hedge_won: bool):
+        with self._lock:
+            self.hedged_calls += 1
+            if hedge_sent:
+                self.hedges_sent += 1
+            if hedge_won:
+                self.hedge_wins += 1
+            else:
+                self.primary_wins += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hedged_calls": self.hedged_calls,
+                "hedges_sent": self.hedges_sent,
+                "hedge_rate": round(self.hedges_sent / self.hedged_calls, 3) if self.hedged_calls else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "primary_wins": self.primary_wins,
+                "percentile": self.percentile
+            }
@@ -0,0 +1,19 @@
+# src/services/llm_context.py
+
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+
+
+# Article the current LLM calls belong to (content hash), set by the orchestrator
+current_article: contextvars.ContextVar = contextvars.ContextVar("current_article", default=None)
+
+
+@contextmanager
+def article_context(article_key: Optional[str]):
+    """Attribute every LLM call made inside the block to one article."""
+    token = current_article.set(article_key)
+    try:
+        yield
+    finally:
+        current_article.reset(token)
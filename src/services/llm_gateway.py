@@ -0,0 +1,491 @@
+# src/services/llm_gateway.py
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+from .circuit_breaker import CircuitBreakerBoard
+from .concurrency_limiter import AdaptiveConcurrencyLimiter, is_timeout_error
+from .hedging import HedgePolicy
+from .llm_context import current_article
+from .metrics import PipelineMetrics
+from .model_factory import ProviderType
+from .provider_registry import ProviderRegistry
+from .rate_limiter import ProviderRateLimiter, is_rate_limit_error
+from .response_cache import ResponseCache
+from .structured_output import (
+    ParseStats,
+    claude_messages_api,
+    claude_tool_input,
+    claude_tool_params,
+    gemini_json_config,
+    parse_structured
+)
+from .tracing import Tracer, current_span
+
+
+class LLMGateway:
+    """
+    Single entry point for text completions across providers.
+
+    Calls go through each vendor's native async client (AsyncGroq,
+    AsyncAnthropic, GenerativeModel.generate_content_async) so concurrent
+    requests cost coroutines rather than threads. When no async client is
+    available the sync client runs on the default thread pool instead.
+
+    Every call first waits on the shared ProviderRateLimiter; a 429 that
+    slips through drains the budget and the call is queued again.
+
+    The provider is chosen per call: the agent's preferred provider goes
+    first, and when its circuit breaker is open or the call fails, the call
+    moves on to the next healthy provider in ProviderRegistry order.
+
+    With hedge=True a call that outlives the HedgePolicy delay gets a
+    duplicate sent to the next provider (or the same model when no other is
+    healthy); the first answer wins and the other request is cancelled.
+
+    Responses are stored in the shared ResponseCache keyed by prompt,
+    provider, model and sampling settings, so re-sent prompts for known
+    article text are answered locally.
+
+    Calls made inside llm_context.article_context() are written to the call
+    ledger with their stage, answering provider/model, token usage, latency,
+    retries and whether a fallback provider answered; every call is also a
+    trace span (llm.<stage>) carrying the same fields.
+
+    Passing a JSON schema requests provider-native structured output (Groq
+    JSON mode, Gemini JSON mime type/schema where the SDK supports it, a
+    forced Claude tool call). The answer is validated against the schema,
+    repaired locally when it is a near miss, and returned as canonical JSON;
+    per-model outcomes are kept in ParseStats.
+
+    Call latencies, 429s and timeouts feed the shared
+    AdaptiveConcurrencyLimiter that sets how many articles run at once.
+
+    Every finished call, article or not, is counted in PipelineMetrics
+    (latency, outcome, fallbacks, retries, tokens, parse outcome).
+    """
+
+    USE_ASYNC_CLIENTS = os.getenv("LLM_ASYNC_CLIENTS", "true").lower() != "false"
+    MAX_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "3"))
+    USE_CACHE = os.getenv("LLM_CACHE", "true").lower() != "false"
+    # Providers spoken to through the chat-completions shape (choices, usage)
+    CHAT_COMPLETION_PROVIDERS = (ProviderType.GROQ, ProviderType.FAKE)
+
+    def __init__(
+        self,
+        client,
+        model_name: str,
+        provider: ProviderType,
+        rate_limiter: ProviderRateLimiter = None,
+        breakers: CircuitBreakerBoard = None,
+        failover: bool = True,
+        hedging: HedgePolicy = None,
+        response_cache: ResponseCache = None,
+        use_cache: Optional[bool] = None,
+        concurrency: AdaptiveConcurrencyLimiter = None
+    ):
+        self.client = client
+        self.model_name = model_name
+        self.provider = provider
+        self.rate_limiter = rate_limiter or ProviderRateLimiter.shared()
+        self.breakers = breakers or CircuitBreakerBoard.shared()
+        self.failover = failover
+        self.hedging = hedging or HedgePolicy.shared()
+        self.concurrency = concurrency or AdaptiveConcurrencyLimiter.shared()
+        self.use_cache = self.USE_CACHE if use_cache is None else use_cache
+        self._response_cache = response_cache
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        if self._response_cache is None:
+            self._response_cache = ResponseCache.shared()
+        return self._response_cache
+
+    async def complete(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.1,
+        json_mode: bool = False,
+        hedge: bool = False,
+        stage: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Send one prompt and return the response text (None if empty)."""
+        request = {
+            "prompt": prompt,
+            "system": system,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "json_mode": json_mode or schema is not None,
+            "schema": schema
+        }
+        call = {"stage": stage, "retries": 0, "target": None, "usage": None, "cached": False}
+        started = time.monotonic()
+
+        with Tracer.shared().span(f"llm.{stage or 'call'}", preferred_provider=self.provider.value, hedge=hedge):
+            try:
+                text = await self._dispatch(request, hedge, call)
+            except Exception:
+                self._record_call(call, started, success=False)
+                raise
+
+            self._record_call(call, started, success=True)
+            return text
+
+    async def _dispatch(self, request: Dict[str, Any], hedge: bool, call: Dict[str, Any]) -> Optional[str]:
+        if self.use_cache:
+            cached = await self.response_cache.get_async(self._cache_key(request))
+            if cached is not None:
+                call["cached"] = True
+                call["target"] = (self.client, self.model_name, self.provider)
+                return cached
+
+        targets = self._targets()
+        if hedge:
+            return await self._complete_hedged(targets, request, call)
+
+        last_error = None
+        async for target in targets:
+            try:
+                return await self._attempt(target, request, call)
+            except Exception as e:
+                last_error = e
+
+        raise last_error or RuntimeError("No healthy AI providers available")
+
+    async def _complete_hedged(self, targets, request: Dict[str, Any], call: Dict[str, Any]) -> Optional[str]:
+        """Race the primary call against a delayed duplicate; the first success wins."""
+        primary = await self._next_target(targets)
+        if primary is None:
+            raise RuntimeError("No healthy AI providers available")
+
+        tasks = {asyncio.create_task(self._attempt(primary, request, call)): "primary"}
+        delay = self.hedging.hedge_delay(primary[2], primary[1], call["stage"])
+        done, _ = await asyncio.wait(set(tasks), timeout=delay)
+
+        if not done:
+            secondary = await self._next_target(targets) or primary
+            tasks[asyncio.create_task(self._attempt(secondary, request, call))] = "hedge"
+
+        last_error = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    self.hedging.record_outcome(len(tasks) > 1, tasks[task] == "hedge")
+                    return task.result()
+                last_error = task.exception()
+
+        # Every raced request failed; continue with ordinary failover
+        async for target in targets:
+            try:
+                return await self._attempt(target, request, call)
+            except Exception as e:
+                last_error = e
+
+        raise last_error
+
+    async def _next_target(self, targets) -> Optional[Tuple[Any, str, ProviderType]]:
+        try:
+            return await targets.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    async def _attempt(
+        self,
+        target: Tuple[Any, str, ProviderType],
+        request: Dict[str, Any],
+        call: Dict[str, Any]
+    ) -> Optional[str]:
+        """One call to one provider, with breaker and latency bookkeeping."""
+        client, model_name, provider = target
+        breaker = self.breakers.get(provider)
+
+        started = time.monotonic()
+        try:
+            text = await self._complete_with(target, request, call)
+        except Exception as e:
+            call["retries"] += 1
+            breaker.record_failure()
+            if is_timeout_error(e):
+                self.concurrency.record_overload("timeout")
+            elif is_rate_limit_error(e):
+                self.concurrency.record_overload("rate_limited")
+            if breaker.state == breaker.OPEN:
+                print(f"{provider.value} circuit opened: {e}")
+                ProviderRegistry.report_failure(provider)
+            elif self.failover:
+                print(f"{provider.value} call failed, trying next provider: {e}")
+            raise
+
+        latency = time.monotonic() - started
+        breaker.record_success(latency)
+        self.hedging.record_latency(provider, model_name, latency, call["stage"])
+        self.concurrency.record_success(model_name, request["max_tokens"], latency)
+        call["target"] = target
+
+        if self.use_cache and text and not call.get("parse_failed"):
+            # Keyed on the preferred target, so failover and hedged answers are found on a re-run
+            await self.response_cache.put_async(self._cache_key(request), provider.value, model_name, request["temperature"], text)
+        return text
+
+    def _cache_key(self, request: Dict[str, Any]) -> str:
+        return ResponseCache.make_key(self.provider.value, self.model_name, request)
+
+    async def _targets(self):
+        """Yield (client, model_name, provider) candidates whose breaker admits calls."""
+        self._schedule_reprobes()
+
+        if self.breakers.get(self.provider).allow_request():
+            yield self.client, self.model_name, self.provider
+
+        if not self.failover:
+            return
+
+        loop = asyncio.get_running_loop()
+        for provider in ProviderRegistry.PROVIDER_ORDER:
+            if provider == self.provider or not self.breakers.get(provider).allow_request():
+                continue
+            # Looking up another provider may probe it; keep that off the event loop
+            target = await loop.run_in_executor(None, ProviderRegistry.get_provider, provider)
+            if target is not None:
+                yield target
+
+    def _schedule_reprobes(self):
+        """Start a background re-probe for every open breaker that has cooled down."""
+        for provider in ProviderRegistry.PROVIDER_ORDER:
+            breaker = self.breakers.get(provider)
+            if breaker.needs_probe() and breaker.start_probe():
+                asyncio.get_running_loop().create_task(self._reprobe(provider, breaker))
+
+    async def _reprobe(self, provider: ProviderType, breaker):
+        ProviderRegistry.report_failure(provider)
+        try:
+            target = await asyncio.get_running_loop().run_in_executor(None, ProviderRegistry.get_provider, provider)
+        except Exception:
+            target = None
+        breaker.probe_finished(target is not None)
+
+    async def _complete_with(
+        self,
+        target: Tuple[Any, str, ProviderType],
+        request: Dict[str, Any],
+        call: Dict[str, Any]
+    ) -> Optional[str]:
+        client, model_name, provider = target
+        estimated_tokens = ProviderRateLimiter.estimate_tokens(request["prompt"], request["max_tokens"])
+
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.acquire(provider, model_name, estimated_tokens)
+            try:
+                response = await self._send(target, request)
+                break
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                    raise
+                print(f"{provider.value} rate limited ({model_name}), queueing retry")
+                self.rate_limiter.penalize(provider, model_name)
+                self.concurrency.record_overload("rate_limited")
+                call["retries"] += 1
+
+        text = self._extract_text(provider, response)
+        call["usage"] = self._extract_usage(provider, response, request, text)
+
+        if request["schema"] is not None:
+            data, status = parse_structured(text, request["schema"])
+            ParseStats.shared().record(provider.value, model_name, status)
+            PipelineMetrics.shared().inc(
+                "bias_llm_structured_responses_total", provider=provider.value, model=model_name, status=status
+            )
+            call["parse_failed"] = data is None
+            if data is not None:
+                text = json.dumps(data)
+        return text
+
+    def _record_call(self, call: Dict[str, Any], started: float, success: bool):
+        """Count the finished call in the metrics and its span, and ledger it when it belongs to an article."""
+        target = call["target"]
+        provider = target[2] if target else self.provider
+        model_name = target[1] if target else self.model_name
+        prompt_tokens, completion_tokens = call["usage"] or (0, 0)
+        latency = time.monotonic() - started
+        # Failures are counted by `success`; only an answer from another provider is a fallback
+        fell_back = provider != self.provider
+
+        self._record_metrics(call, provider, model_name, latency, success, fell_back)
+        span = current_span()
+        if span is not None:
+            span.set_attributes(
+                provider=provider.value,
+                model=model_name,
+                cached=call["cached"],
+                retries=call["retries"],
+                fell_back=fell_back,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens
+            )
+
+        article_hash = current_article.get()
+        if article_hash is None:
+            return
+
+        from src.database.call_ledger import enqueue_llm_call
+
+        # Written by the ledger's background thread; SQLite stays off the event loop
+        enqueue_llm_call({
+            "article_hash": article_hash,
+            "stage": call["stage"],
+            "provider": provider.value,
+            "model_name": model_name,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency_ms": latency * 1000,
+            "retries": call["retries"],
+            "fell_back": fell_back,
+            "success": success,
+            "cached": call["cached"]
+        })
+
+    def _record_metrics(
+        self,
+        call: Dict[str, Any],
+        provider: ProviderType,
+        model_name: str,
+        latency: float,
+        success: bool,
+        fell_back: bool
+    ):
+        metrics = PipelineMetrics.shared()
+        labels = {"stage": call["stage"] or "unknown", "provider": provider.value, "model": model_name}
+        status = "failure" if not success else "cached" if call["cached"] else "success"
+
+        metrics.inc("bias_llm_calls_total", status=status, **labels)
+        if call["cached"]:
+            return
+        metrics.observe("bias_llm_call_seconds", latency, **labels)
+        if fell_back:
+            metrics.inc("bias_llm_fallbacks_total", **labels)
+        if call["retries"]:
+            metrics.inc("bias_llm_retries_total", call["retries"], **labels)
+        if call["usage"]:
+            metrics.inc("bias_llm_tokens_total", call["usage"][0], direction="prompt", **labels)
+            metrics.inc("bias_llm_tokens_total", call["usage"][1], direction="completion", **labels)
+
+    async def _send(self, target: Tuple[Any, str, ProviderType], request: Dict[str, Any]):
+        client, model_name, provider = target
+
+        async_client = None
+        if self.USE_ASYNC_CLIENTS:
+            async_client = ProviderRegistry.get_async_client(provider, model_name, client)
+
+        if async_client is not None:
+            return await self._call_async(async_client, model_name, provider, request)
+
+        return await asyncio.get_event_loop().run_in_executor(
+            None,
+            lambda: self._call_sync(client, model_name, provider, request)
+        )
+
+    async def _call_async(self, client, model_name: str, provider: ProviderType, request: Dict[str, Any]):
+        if provider in self.CHAT_COMPLETION_PROVIDERS:
+            return await client.chat.completions.create(**self._chat_kwargs(model_name, request))
+        elif provider == ProviderType.GEMINI:
+            return await client.generate_content_async(
+                request["prompt"],
+                generation_config=self._gemini_config(request)
+            )
+        elif provider == ProviderType.CLAUDE:
+            if request["schema"] is not None:
+                return await claude_messages_api(client).create(**self._claude_kwargs(model_name, request))
+            return await client.messages.create(**self._claude_kwargs(model_name, request))
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    def _call_sync(self, client, model_name: str, provider: ProviderType, request: Dict[str, Any]):
+        if provider in self.CHAT_COMPLETION_PROVIDERS:
+            return client.chat.completions.create(**self._chat_kwargs(model_name, request))
+        elif provider == ProviderType.GEMINI:
+            return client.generate_content(
+                request["prompt"],
+                generation_config=self._gemini_config(request)
+            )
+        elif provider == ProviderType.CLAUDE:
+            if request["schema"] is not None:
+                return claude_messages_api(client).create(**self._claude_kwargs(model_name, request))
+            return client.messages.create(**self._claude_kwargs(model_name, request))
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    def _chat_kwargs(self, model_name: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        messages = []
+        if request["system"]:
+            messages.append({"role": "system", "content": request["system"]})
+        messages.append({"role": "user", "content": request["prompt"]})
+
+        kwargs = {
+            "model": model_name,
+            "messages": messages,
+            "max_tokens": request["max_tokens"],
+            "temperature": request["temperature"]
+        }
+        if request["json_mode"]:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def _claude_kwargs(self, model_name: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = {
+            "model": model_name,
+            "max_tokens": request["max_tokens"],
+            "temperature": request["temperature"],
+            "messages": [{"role": "user", "content": request["prompt"]}]
+        }
+        if request["system"]:
+            kwargs["system"] = request["system"]
+        if request["schema"] is not None:
+            kwargs.update(claude_tool_params(request["schema"]))
+        return kwargs
+
+    def _gemini_config(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        config = {
+            "temperature": request["temperature"],
+            "max_output_tokens": request["max_tokens"]
+        }
+        if request["json_mode"]:
+            config.update(gemini_json_config(request["schema"]))
+        return config
+
+    def _extract_usage(self, provider: ProviderType, response, request: Dict[str, Any], text: Optional[str]) -> Tuple[int, int]:
+        """(prompt_tokens, completion_tokens) as reported by the provider, estimated when missing."""
+        usage = None
+        if provider in self.CHAT_COMPLETION_PROVIDERS:
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                return usage.prompt_tokens or 0, usage.completion_tokens or 0
+        elif provider == ProviderType.CLAUDE:
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                return usage.input_tokens or 0, usage.output_tokens or 0
+        elif provider == ProviderType.GEMINI:
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                return usage.prompt_token_count or 0, usage.candidates_token_count or 0
+
+        prompt_chars = len(request["prompt"]) + len(request["system"] or "")
+        return prompt_chars // 4, len(text or "") // 4
+
+    def _extract_text(self, provider: ProviderType, response) -> Optional[str]:
+        if provider in self.CHAT_COMPLETION_PROVIDERS:
+            return response.choices[0].message.content
+        elif provider == ProviderType.GEMINI:
+            return response.text
+        elif provider == ProviderType.CLAUDE:
+            tool_input = claude_tool_input(response)
+            if tool_input is not None:
+                return json.dumps(tool_input)
+            return response.content[0].text
+        return None
@@ -0,0 +1,253 @@
+# src/services/metrics.py
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import httpx
+
+
+# Seconds; covers a fast SQLite write up to a slow, retried LLM call
+DEFAULT_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+# name -> (type, help, label names)
+METRIC_DEFINITIONS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "bias_pipeline_step_seconds": (
+        "histogram", "Duration of pipeline steps (fetch, categorize, store, analyze, persist)", ("step",)),
+    "bias_pipeline_steps_total": (
+        "counter", "Pipeline steps run, by outcome", ("step", "status")),
+    "bias_llm_call_seconds": (
+        "histogram", "LLM call latency per stage, answering provider and model", ("stage", "provider", "model")),
+    "bias_llm_calls_total": (
+        "counter", "LLM calls by outcome (success, failure, cached)", ("stage", "provider", "model", "status")),
+    "bias_llm_fallbacks_total": (
+        "counter", "LLM calls answered by a fallback provider, or by none", ("stage", "provider", "model")),
+    "bias_llm_retries_total": (
+        "counter", "Retried LLM attempts (429s and failed providers)", ("stage", "provider", "model")),
+    "bias_llm_tokens_total": (
+        "counter", "Prompt and completion tokens", ("stage", "provider", "model", "direction")),
+    "bias_llm_structured_responses_total": (
+        "counter", "Structured responses by parse outcome (clean, repaired, failed)", ("provider", "model", "status")),
+    "bias_analysis_fallbacks_total": (
+        "counter", "Placeholder analyses returned instead of a model analysis", ("reason",)),
+    "bias_articles_fetched_total": (
+        "counter", "Articles returned by the news sources", ("source",)),
+}
+
+
+class PipelineMetrics:
+    """
+    Process-wide counters and histograms in the Prometheus text format.
+
+    Kept in-process without a client library: render() produces what
+    GET /metrics serves, dump() writes a node_exporter textfile and push()
+    sends it to a Pushgateway for CLI runs that end before any scrape.
+    Collectors registered with add_collector() report gauges (queue depth,
+    concurrency) computed at render time.
+    """
+
+    _shared: Optional["PipelineMetrics"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[Tuple[str, ...], float]] = {}
+        # label values -> (bucket counts, sum, count)
+        self._histograms: Dict[str, Dict[Tuple[str, ...], Tuple[List[int], float, int]]] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, Dict[str, str], float]]]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "PipelineMetrics":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                cls._shared.add_collector(_concurrency_gauges)
+                cls._shared.add_collector(_job_queue_gauges)
+            return cls._shared
+
+    def _label_values(self, name: str, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(label, "")) for label in METRIC_DEFINITIONS[name][2])
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = self._label_values(name, labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._label_values(name, labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            counts, total, count = series.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            series[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time_step(self, step: str) -> Iterator[None]:
+        """Time a pipeline step and count it as ok or error."""
+        started = time.monotonic()
+        status = "error"
+        try:
+            yield
+            status = "ok"
+        finally:
+            self.observe("bias_pipeline_step_seconds", time.monotonic() - started, step=step)
+            self.inc("bias_pipeline_steps_total", step=step, status=status)
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, Dict[str, str], float]]]):
+        """Register a callable returning (name, help, labels, value) gauge samples."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def value(self, name: str, **labels) -> float:
+        """Current counter value, or observation count for a histogram."""
+        key = self._label_values(name, labels)
+        with self._lock:
+            if name in self._histograms:
+                return self._histograms[name].get(key, ([], 0.0, 0))[2]
+            return self._counters.get(name, {}).get(key, 0.0)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {key: (list(c), s, n) for key, (c, s, n) in series.items()}
+                          for name, series in self._histograms.items()}
+            collectors = list(self._collectors)
+
+        for name, (kind, help_text, label_names) in METRIC_DEFINITIONS.items():
+            if name not in counters and name not in histograms:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for key, value in sorted(counters[name].items()):
+                    lines.append(f"{name}{_format_labels(label_names, key)} {_format_value(value)}")
+                continue
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(label_names + ("le",), key + (_format_value(bound),))
+                    lines.append(f"{name}_bucket{labels} {bucket_count}")
+                lines.append(f"{name}_bucket{_format_labels(label_names + ('le',), key + ('+Inf',))} {count}")
+                lines.append(f"{name}_sum{_format_labels(label_names, key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(label_names, key)} {count}")
+
+        gauges: Dict[str, Tuple[str, List[Tuple[Dict[str, str], float]]]] = {}
+        for collector in collectors:
+            try:
+                samples = collector()
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+                continue
+            for name, help_text, labels, value in samples:
+                gauges.setdefault(name, (help_text, []))[1].append((labels, value))
+        for name, (help_text, samples) in gauges.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Write the metrics for node_exporter's textfile collector (atomically)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def push(self, gateway_url: str, job: str = "bias_pipeline", instance: Optional[str] = None):
+        """Replace this job's (and instance's) metrics on a Prometheus Pushgateway."""
+        url = f"{gateway_url.rstrip('/')}/metrics/job/{job}"
+        if instance:
+            url += f"/instance/{instance}"
+        response = httpx.put(
+            url,
+            content=self.render(),
+            headers={"Content-Type": "text/plain; version=0.0.4"},
+            timeout=10.0
+        )
+        response.raise_for_status()
+
+
+def timed_step(step: str):
+    """Decorator form of PipelineMetrics.time_step for synchronous functions."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with PipelineMetrics.shared().time_step(step):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        for value in values
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _concurrency_gauges() -> List[Tuple[str, str, Dict[str, str], float]]:
+    from .concurrency_limiter import AdaptiveConcurrencyLimiter
+    snapshot = AdaptiveConcurrencyLimiter.shared().snapshot()
+    return [
+        ("bias_concurrency_limit", "Current adaptive (AIMD) article concurrency limit", {}, snapshot["limit"]),
+        ("bias_concurrency_in_flight", "Articles being analyzed", {}, snapshot["in_flight"]),
+        ("bias_concurrency_waiting", "Articles waiting for a concurrency slot", {}, snapshot["waiting"]),
+    ]
+
+
+def _job_queue_gauges() -> List[Tuple[str, str, Dict[str, str], float]]:
+    from src.database.job_queue import get_queue_stats
+    return [
+        ("bias_jobs", "Durable analysis jobs per state", {"state": state}, count)
+        for state, count in get_queue_stats().items()
+    ]
+
+
+def export_cli_metrics(
+    path: Optional[str] = None,
+    gateway_url: Optional[str] = None,
+    job: str = "bias_pipeline",
+    instance: Optional[str] = None,
+    verbose: bool = True
+):
+    """
+    Export for processes nobody scrapes (CLI runs, workers): a textfile at
+    `path`/METRICS_FILE and/or a push to `gateway_url`/METRICS_PUSHGATEWAY.
+    Does nothing when neither is configured.
+    """
+    metrics = PipelineMetrics.shared()
+    path = path or os.getenv("METRICS_FILE")
+    gateway_url = gateway_url or os.getenv("METRICS_PUSHGATEWAY")
+    if path:
+        try:
+            metrics.dump(path)
+            if verbose:
+                print(f"Metrics written to {path}")
+        except OSError as e:
+            print(f"Metrics file write failed: {e}")
+    if gateway_url:
+        try:
+            metrics.push(gateway_url, job, instance)
+            if verbose:
+                print(f"Metrics pushed to {gateway_url}")
+        except httpx.HTTPError as e:
+            print(f"Metrics push failed: {e}")
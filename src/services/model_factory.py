@@ -1,11 +1,14 @@
 # src/services/model_factory.py
 
 import os
+import time
 from dotenv import load_dotenv
 import google.generativeai as genai
-from groq import Groq
+from groq import Groq, AsyncGroq
 import anthropic
 from enum import Enum
+from .cassette import Cassette, RecordingClient, ReplayClient
+from .fake_llm import FakeLLMClient, FakeLLMProfile
 
 load_dotenv()
 
@@ -13,6 +16,8 @@ class ProviderType(Enum):
     GEMINI = "gemini"
     GROQ = "groq"
     CLAUDE = "claude"
+    # In-process fake for benchmarks and offline runs (FAKE_LLM=true)
+    FAKE = "fake"
 
 class ModelFactory:
     GEMINI_MODELS = [
@@ -35,32 +40,115 @@ class ModelFactory:
         'claude-3-sonnet-20240229',
     ]
     
+    FAKE_MODELS = [
+        'fake-llm',
+    ]
+    
+    # Latency (seconds) of the last successful probe per provider
+    probe_latencies = {}
+    
+    # Profile for fake clients; None reads FAKE_LLM_* from the environment
+    fake_profile = None
+    
     @classmethod
     def get_model(cls):
-        """Get the best available model (Groq first, then Gemini, then Claude)."""
+        """Get the best available model (Groq first, then Gemini, then Claude; only the fake with FAKE_LLM=true)."""
+        if fake_llm_enabled():
+            return cls.get_fake_client()
+        
+        cassette = Cassette.active()
+        if cassette is not None and cassette.replaying:
+            return cls._replay_model(cassette)
+        
         # Try Groq first (completely free)
         try:
-            return cls.get_groq_client()
+            return cls._with_cassette(cls.get_groq_client())
         except Exception as e:
             print(f"Groq failed: {e}")
             pass
             
         # Try Gemini Flash second (free tier)
         try:
-            return cls.get_gemini_model()
+            return cls._with_cassette(cls.get_gemini_model())
         except Exception as e:
             print(f"Gemini failed: {e}")
             pass
             
         # Try Claude as fallback (paid but high quality)
         try:
-            return cls.get_claude_client()
+            return cls._with_cassette(cls.get_claude_client())
         except Exception as e:
             print(f"Claude failed: {e}")
             pass
             
         raise RuntimeError("No AI models available")
     
+    @classmethod
+    def get_provider_client(cls, provider: ProviderType):
+        """Probe a single provider - returns (client, model_name, provider_type)."""
+        probes = {
+            ProviderType.GROQ: cls.get_groq_client,
+            ProviderType.GEMINI: cls.get_gemini_model,
+            ProviderType.CLAUDE: cls.get_claude_client,
+            ProviderType.FAKE: cls.get_fake_client,
+        }
+        if provider not in probes:
+            raise ValueError(f"Unsupported provider: {provider}")
+        cassette = Cassette.active()
+        if cassette is not None and cassette.replaying and provider != ProviderType.FAKE:
+            client = cassette.replay_client(provider.value)
+            return client, client.model_name, provider
+        return cls._with_cassette(probes[provider]())
+    
+    @classmethod
+    def build_client(cls, provider: ProviderType, model_name: str):
+        """Build a client for a known model without probing - returns (client, model_name, provider_type)."""
+        cassette = Cassette.active()
+        if cassette is not None and cassette.replaying and provider != ProviderType.FAKE:
+            client = cassette.replay_client(provider.value, model_name)
+            return client, client.model_name, provider
+        return cls._with_cassette(cls._build_live_client(provider, model_name))
+    
+    @classmethod
+    def _build_live_client(cls, provider: ProviderType, model_name: str):
+        if provider == ProviderType.GROQ:
+            api_key = os.getenv("GROQ_API_KEY")
+            if not api_key:
+                raise ValueError("GROQ_API_KEY environment variable is required")
+            return Groq(api_key=api_key), model_name, provider
+        elif provider == ProviderType.GEMINI:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY environment variable is required")
+            genai.configure(api_key=api_key)
+            return genai.GenerativeModel(model_name), model_name, provider
+        elif provider == ProviderType.CLAUDE:
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key:
+                raise ValueError("ANTHROPIC_API_KEY environment variable is required")
+            return anthropic.Anthropic(api_key=api_key), model_name, provider
+        elif provider == ProviderType.FAKE:
+            return FakeLLMClient(cls.fake_profile), model_name, provider
+        raise ValueError(f"Unsupported provider: {provider}")
+    
+    @classmethod
+    def build_async_client(cls, provider: ProviderType, client):
+        """Build the native async counterpart of a sync client."""
+        if isinstance(client, ReplayClient):
+            return client.as_async()
+        if isinstance(client, RecordingClient):
+            return client.rewrap(cls.build_async_client(provider, client.target))
+        if provider == ProviderType.GROQ:
+            return AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+        elif provider == ProviderType.GEMINI:
+            # GenerativeModel exposes generate_content_async itself
+            return client
+        elif provider == ProviderType.CLAUDE:
+            return anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        elif provider == ProviderType.FAKE:
+            return client.as_async()
+        raise ValueError(f"Unsupported provider: {provider}")
+    
     @classmethod
     def get_gemini_model(cls):
         """Get Gemini model - returns (client, model_name, provider_type)."""
@@ -72,9 +160,11 @@ class ModelFactory:
         
         for model_name in cls.GEMINI_MODELS:
             try:
+                started = time.perf_counter()
                 model = genai.GenerativeModel(model_name)
                 test_response = model.generate_content("Test")
                 if test_response.text:
+                    cls.probe_latencies[ProviderType.GEMINI] = time.perf_counter() - started
                     return model, model_name, ProviderType.GEMINI
             except Exception:
                 continue
@@ -92,12 +182,14 @@ class ModelFactory:
         
         for model_name in cls.GROQ_MODELS:
             try:
+                started = time.perf_counter()
                 test_response = client.chat.completions.create(
                     model=model_name,
                     messages=[{"role": "user", "content": "Test"}],
                     max_tokens=5
                 )
                 if test_response.choices[0].message.content:
+                    cls.probe_latencies[ProviderType.GROQ] = time.perf_counter() - started
                     return client, model_name, ProviderType.GROQ
             except Exception:
                 continue
@@ -116,14 +208,44 @@ class ModelFactory:
         for model_name in cls.CLAUDE_MODELS:
             try:
                 # Test the model with a simple message
+                started = time.perf_counter()
                 test_response = client.messages.create(
                     model=model_name,
                     max_tokens=5,
                     messages=[{"role": "user", "content": "Test"}]
                 )
                 if test_response.content:
+                    cls.probe_latencies[ProviderType.CLAUDE] = time.perf_counter() - started
                     return client, model_name, ProviderType.CLAUDE
             except Exception:
                 continue
         
-        raise RuntimeError("No compatible Claude model found")
\ No newline at end of file
+        raise RuntimeError("No compatible Claude model found")
+
+    @classmethod
+    def get_fake_client(cls):
+        """Get the fake client (no network, nothing to probe) - returns (client, model_name, provider_type)."""
+        cls.probe_latencies[ProviderType.FAKE] = 0.0
+        return FakeLLMClient(cls.fake_profile), cls.FAKE_MODELS[0], ProviderType.FAKE
+
+    @classmethod
+    def _with_cassette(cls, entry):
+        """Wrap a live (client, model_name, provider_type) for recording when a cassette records."""
+        cassette = Cassette.active()
+        client, model_name, provider = entry
+        if cassette is None or not cassette.recording or provider == ProviderType.FAKE:
+            return entry
+        return cassette.wrap_client(client, provider.value, model_name), model_name, provider
+
+    @classmethod
+    def _replay_model(cls, cassette: Cassette):
+        """The first provider (Groq, Gemini, Claude) with recorded traffic."""
+        for provider in (ProviderType.GROQ, ProviderType.GEMINI, ProviderType.CLAUDE):
+            if cassette.models(provider.value):
+                client = cassette.replay_client(provider.value)
+                return client, client.model_name, provider
+        raise RuntimeError(f"No LLM traffic recorded in {cassette.path}")
+
+
+def fake_llm_enabled() -> bool:
+    return os.getenv("FAKE_LLM", "false").lower() == "true"
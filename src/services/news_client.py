@@ -1,11 +1,13 @@
 # src/services/news_client.py
 
 import os
-import requests
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import httpx
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from .cassette import Cassette
+from .metrics import PipelineMetrics
+from .tracing import Tracer, traced
 
 load_dotenv()
 
@@ -14,6 +16,13 @@ class NewsClient:
     def __init__(self) -> None:
         self.newsapi_ai_key = os.getenv("NEWSAPI_AI_KEY")
         self.newsapi_key = os.getenv("NEWS_API_KEY")
+        
+        # Record or replay news traffic when a cassette is active (default transports otherwise)
+        self.cassette = Cassette.active()
+        if self.cassette is not None and self.cassette.replaying:
+            # Recorded responses need no credentials
+            self.newsapi_ai_key = self.newsapi_ai_key or "replay"
+            self.newsapi_key = self.newsapi_key or "replay"
 
     async def fetch_articles(self, query: Optional[str] = None, count: int = 5) -> List[Dict]:
         """
@@ -26,6 +35,22 @@ class NewsClient:
         Returns:
             List of article dictionaries
         """
+        metrics = PipelineMetrics.shared()
+        with Tracer.shared().span("news.fetch", query=query, count=count) as span, metrics.time_step("fetch"):
+            articles, source = await self._fetch_from_sources(query, count)
+            span.set_attributes(source=source, articles=len(articles))
+        metrics.inc("bias_articles_fetched_total", len(articles), source=source)
+        return articles
+
+    def _async_transport(self) -> Optional[httpx.AsyncBaseTransport]:
+        # A new one per client: closing the client closes its transport
+        return self.cassette.async_transport() if self.cassette else None
+
+    def _sync_transport(self) -> Optional[httpx.BaseTransport]:
+        return self.cassette.sync_transport() if self.cassette else None
+
+    async def _fetch_from_sources(self, query: Optional[str], count: int) -> Tuple[List[Dict], str]:
+        """Articles and the source that supplied them (NewsAPI.ai, NewsAPI, then demo data)."""
         if query:
             print(f"Fetching {count} articles for query: '{query}'")
             articles = await self._fetch_fresh_newsapi_ai(query, count)
@@ -35,16 +60,17 @@ class NewsClient:
         
         if articles:
             print(f"NewsAPI.ai returned {len(articles)} articles")
-            return articles
+            return articles, "newsapi_ai"
         
         articles = await self._fetch_newsapi(query or "news", count)
         if articles:
             print(f"NewsAPI returned {len(articles)} articles")
-            return articles
+            return articles, "newsapi"
         
         print("No articles found from APIs, using demo data")
-        return self._get_demo_articles()
+        return self._get_demo_articles(), "demo"
 
+    @traced("news.newsapi_ai.recent")
     async def _fetch_recent_newsapi_ai(self, count: int = 5) -> List[Dict]:
         """Fetch recent articles without specific query."""
         if not self.newsapi_ai_key:
@@ -54,7 +80,7 @@ class NewsClient:
             today = datetime.now()
             yesterday = today - timedelta(days=1)
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=self._async_transport()) as client:
                 payload = {
                     "action": "getArticles",
                     "articlesPage": 1,
@@ -109,6 +135,7 @@ class NewsClient:
             print(f"NewsAPI.ai recent fetch failed: {e}")
             return []
 
+    @traced("news.newsapi_ai.search")
     async def _fetch_fresh_newsapi_ai(self, query: str, count: int = 5) -> List[Dict]:
         """Fetch recent articles with specific query."""
         if not self.newsapi_ai_key:
@@ -118,7 +145,7 @@ class NewsClient:
             today = datetime.now()
             yesterday = today - timedelta(days=1)
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=self._async_transport()) as client:
                 payload = {
                     "action": "getArticles",
                     "keyword": query,
@@ -174,6 +201,7 @@ class NewsClient:
             print(f"NewsAPI.ai fetch failed: {e}")
             return []
 
+    @traced("news.newsapi.search")
     async def _fetch_newsapi(self, query: str, count: int = 5) -> List[Dict]:
         """Fetch from regular NewsAPI with recent articles."""
         if not self.newsapi_key:
@@ -182,7 +210,7 @@ class NewsClient:
         try:
             yesterday = datetime.now() - timedelta(days=1)
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=30.0, transport=self._async_transport()) as client:
                 response = await client.get(
                     "https://newsapi.org/v2/everything",
                     params={
@@ -226,6 +254,11 @@ class NewsClient:
         """Categorize article content using EventRegistry analytics."""
         if not text or len(text.strip()) < 50:
             return "Uncategorized"
+        # Blocking HTTP call on the event loop; its span shows how long it holds it
+        with Tracer.shared().span("news.categorize", chars=len(text)), PipelineMetrics.shared().time_step("categorize"):
+            return self._request_category(text)
+
+    def _request_category(self, text: str) -> str:
 
         url = "https://analytics.eventregistry.org/api/v1/categorize"
         payload = {
@@ -236,7 +269,8 @@ class NewsClient:
         headers = {"Content-Type": "application/json"}
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            with httpx.Client(timeout=30.0, transport=self._sync_transport()) as client:
+                response = client.post(url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
 
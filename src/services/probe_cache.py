@@ -0,0 +1,78 @@
+# src/services/probe_cache.py
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from .model_factory import ProviderType
+
+
+PROBE_CACHE_PATH = os.getenv("PROBE_CACHE_PATH", "data/cache/provider_probes.json")
+
+
+class ProbeCache:
+    """
+    Small JSON file remembering which model answered each provider's probe.
+
+    Each entry stores the model name (None when every model failed), the probe
+    latency in seconds and the wall-clock time it was checked.
+    """
+
+    # How long a cached probe result is trusted at startup
+    FRESH_SECONDS = float(os.getenv("PROBE_CACHE_TTL", "21600"))
+
+    def __init__(self, path: str = PROBE_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(self, provider: ProviderType) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a provider if it is still fresh."""
+        entry = self._load().get(provider.value)
+        if not entry:
+            return None
+
+        checked_at = entry.get("checked_at", 0)
+        if time.time() - checked_at > self.FRESH_SECONDS:
+            return None
+
+        return entry
+
+    def record(self, provider: ProviderType, model_name: Optional[str], latency: Optional[float] = None):
+        """Store a probe outcome; model_name=None records a failed probe."""
+        with self._lock:
+            data = self._load()
+            data[provider.value] = {
+                "model_name": model_name,
+                "latency": round(latency, 4) if latency is not None else None,
+                "checked_at": time.time()
+            }
+            self._save(data)
+
+    def clear(self):
+        """Remove the cache file."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: Dict[str, Any]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write atomically so concurrent workers never read a half-written file
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write probe cache: {e}")
@@ -0,0 +1,251 @@
+# src/services/provider_registry.py
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Set, Tuple
+from .cassette import Cassette
+from .model_factory import ModelFactory, ProviderType, fake_llm_enabled
+from .probe_cache import ProbeCache
+
+
+class ProviderRegistry:
+    """
+    Process-wide registry of probed provider clients.
+
+    ModelFactory fires live "Test" completions every time it is asked for a
+    model. The registry probes each provider lazily, at most once per TTL, and
+    hands the same SDK client to every agent in the process. Probes never run
+    under the registry lock: an expired entry keeps being served while a
+    background thread re-probes it, and a cold lookup probes with only that
+    provider's probe lock held.
+    """
+
+    PROVIDER_ORDER = [ProviderType.FAKE] if fake_llm_enabled() else [
+        ProviderType.GROQ,
+        ProviderType.GEMINI,
+        ProviderType.CLAUDE,
+    ]
+
+    # Providers whose probe results are never written to the disk cache (nor
+    # any provider while a cassette is replayed)
+    EPHEMERAL_PROVIDERS = {ProviderType.FAKE}
+
+    # How long a successful probe is trusted before re-probing
+    TTL_SECONDS = float(os.getenv("PROVIDER_REGISTRY_TTL", "1800"))
+
+    # How long a provider that failed its probe is skipped
+    FAILURE_RETRY_SECONDS = float(os.getenv("PROVIDER_REGISTRY_RETRY", "300"))
+
+    probe_cache = ProbeCache()
+
+    _entries: Dict[ProviderType, Tuple[Any, str, ProviderType, float]] = {}
+    _failures: Dict[ProviderType, float] = {}
+    _skip_disk_cache: Set[ProviderType] = set()
+    _verifiers: Dict[ProviderType, threading.Thread] = {}
+    # One blocking probe per provider at a time; other lookups wait for its result
+    _probe_locks: Dict[ProviderType, threading.Lock] = {}
+    _async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    # Clients for specific models other than a provider's probed one
+    _pinned: Dict[Tuple[ProviderType, str], Tuple[Any, str, ProviderType]] = {}
+    _lock = threading.RLock()
+
+    # _get_entry's answer when only a live probe can tell
+    _NEEDS_PROBE = object()
+
+    @classmethod
+    def get_model(cls):
+        """Get the best available model - returns (client, model_name, provider_type)."""
+        for provider in cls.PROVIDER_ORDER:
+            entry = cls.get_provider(provider)
+            if entry is not None:
+                return entry
+
+        raise RuntimeError("No AI models available")
+
+    @classmethod
+    def get_provider(cls, provider: ProviderType) -> Optional[Tuple[Any, str, ProviderType]]:
+        """Get the shared client for one provider, or None if it is unavailable."""
+        with cls._lock:
+            entry = cls._get_entry(provider)
+            probe_lock = cls._probe_locks.setdefault(provider, threading.Lock())
+        if entry is not cls._NEEDS_PROBE:
+            return entry
+
+        with probe_lock:
+            # Another thread may have finished the probe while we waited
+            with cls._lock:
+                entry = cls._get_entry(provider)
+            if entry is not cls._NEEDS_PROBE:
+                return entry
+            outcome = cls._run_probe(provider)
+            with cls._lock:
+                return cls._record_probe(provider, outcome)
+
+    @classmethod
+    def get_pinned_model(cls, provider: ProviderType, model_name: str) -> Optional[Tuple[Any, str, ProviderType]]:
+        """
+        A client for one specific model (e.g. the cascade's triage model), or
+        None while its provider is unavailable. The provider is probed and
+        failed over like any other; the model's client is built once.
+        """
+        entry = cls.get_provider(provider)
+        if entry is None or entry[1] == model_name:
+            return entry
+        with cls._lock:
+            key = (provider, model_name)
+            if key not in cls._pinned:
+                cls._pinned[key] = ModelFactory.build_client(provider, model_name)
+            return cls._pinned[key]
+
+    @classmethod
+    def get_async_client(cls, provider: ProviderType, model_name: str, client) -> Optional[Any]:
+        """
+        Get the shared native async client for the running event loop.
+
+        Async SDK clients hold a connection pool bound to one event loop, so
+        they are cached per loop. Returns None when no async client can be
+        built and callers should use the thread pool instead.
+        """
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            clients = cls._async_clients.setdefault(loop, {})
+            key = (provider, model_name)
+            if key not in clients:
+                try:
+                    clients[key] = ModelFactory.build_async_client(provider, client)
+                except Exception as e:
+                    print(f"Async {provider.value} client unavailable: {e}")
+                    clients[key] = None
+            return clients[key]
+
+    @classmethod
+    def report_failure(cls, provider: ProviderType):
+        """Drop a provider's cached client so the next lookup re-probes it."""
+        with cls._lock:
+            cls._entries.pop(provider, None)
+            cls._skip_disk_cache.add(provider)
+
+    @classmethod
+    def use_fake_provider(cls, profile=None):
+        """Route every agent to the in-process fake LLM (benchmarks, offline runs)."""
+        with cls._lock:
+            ModelFactory.fake_profile = profile
+            cls.PROVIDER_ORDER = [ProviderType.FAKE]
+            cls.reset()
+            # Async clients are cached per loop and would keep the old profile
+            cls._async_clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def reset(cls):
+        """Forget every in-process probe result (the disk cache is kept)."""
+        with cls._lock:
+            cls._entries.clear()
+            cls._failures.clear()
+            cls._pinned.clear()
+            cls._skip_disk_cache.clear()
+            cls._verifiers.clear()
+
+    @classmethod
+    def _get_entry(cls, provider: ProviderType):
+        """The cached entry, None while the provider is failed, or _NEEDS_PROBE. Call with the lock held."""
+        now = time.monotonic()
+
+        entry = cls._entries.get(provider)
+        if entry is not None:
+            if now - entry[3] >= cls.TTL_SECONDS:
+                # Keep serving the expired client while it is re-probed
+                cls._refresh_in_background(provider)
+            return entry[:3]
+
+        failed_at = cls._failures.get(provider)
+        if failed_at is not None and now - failed_at < cls.FAILURE_RETRY_SECONDS:
+            return None
+
+        if provider not in cls._skip_disk_cache and cls._uses_disk_cache(provider):
+            cached = cls.probe_cache.get(provider)
+            if cached is not None and not cached.get("model_name"):
+                # A recent probe failed in some process; honour its retry window
+                if time.time() - cached.get("checked_at", 0) < cls.FAILURE_RETRY_SECONDS:
+                    cls._failures[provider] = now
+                    return None
+            elif cached is not None:
+                entry = cls._use_cached_model(provider, cached["model_name"])
+                if entry is not None:
+                    return entry
+
+        return cls._NEEDS_PROBE
+
+    @classmethod
+    def _uses_disk_cache(cls, provider: ProviderType) -> bool:
+        cassette = Cassette.active()
+        return provider not in cls.EPHEMERAL_PROVIDERS and not (cassette is not None and cassette.replaying)
+
+    @classmethod
+    def _run_probe(cls, provider: ProviderType):
+        """Run the live probe - returns (client, model_name, provider_type) or the exception."""
+        try:
+            return ModelFactory.get_provider_client(provider)
+        except Exception as e:
+            print(f"{provider.value.capitalize()} failed: {e}")
+            return e
+
+    @classmethod
+    def _record_probe(cls, provider: ProviderType, outcome) -> Optional[Tuple[Any, str, ProviderType]]:
+        """Store a probe outcome in memory and on disk."""
+        now = time.monotonic()
+
+        if isinstance(outcome, Exception):
+            cls._entries.pop(provider, None)
+            cls._failures[provider] = now
+            if cls._uses_disk_cache(provider):
+                cls.probe_cache.record(provider, None)
+            return None
+
+        client, model_name, provider_type = outcome
+        cls._entries[provider] = (client, model_name, provider_type, now)
+        cls._failures.pop(provider, None)
+        cls._skip_disk_cache.discard(provider)
+        if cls._uses_disk_cache(provider):
+            cls.probe_cache.record(provider, model_name, ModelFactory.probe_latencies.get(provider))
+        return client, model_name, provider_type
+
+    @classmethod
+    def _use_cached_model(cls, provider: ProviderType, model_name: str) -> Optional[Tuple[Any, str, ProviderType]]:
+        """Trust a fresh on-disk probe result and verify it in the background."""
+        try:
+            client, model_name, provider_type = ModelFactory.build_client(provider, model_name)
+        except Exception as e:
+            print(f"Cached {provider.value} model unusable: {e}")
+            return None
+
+        cls._entries[provider] = (client, model_name, provider_type, time.monotonic())
+        cls._start_verification(provider)
+        return client, model_name, provider_type
+
+    @classmethod
+    def _refresh_in_background(cls, provider: ProviderType):
+        verifier = cls._verifiers.get(provider)
+        if verifier is None or not verifier.is_alive():
+            cls._start_verification(provider)
+
+    @classmethod
+    def _start_verification(cls, provider: ProviderType) -> threading.Thread:
+        thread = threading.Thread(
+            target=cls._verify_in_background,
+            args=(provider,),
+            name=f"probe-{provider.value}",
+            daemon=True
+        )
+        cls._verifiers[provider] = thread
+        thread.start()
+        return thread
+
+    @classmethod
+    def _verify_in_background(cls, provider: ProviderType):
+        # Probe outside the lock so agents are never blocked by verification
+        outcome = cls._run_probe(provider)
+        with cls._lock:
+            cls._record_probe(provider, outcome)
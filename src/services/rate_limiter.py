@@ -0,0 +1,138 @@
+# src/services/rate_limiter.py
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from .model_factory import ProviderType
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously up to its capacity."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the provider answered 429."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class ProviderRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budgets per provider/model.
+
+    Every LLM call awaits acquire() before it is sent, so calls queue locally
+    instead of being rejected by the provider. Quotas default to the free
+    tiers and can be overridden with <PROVIDER>_RPM / <PROVIDER>_TPM.
+    """
+
+    DEFAULT_QUOTAS = {
+        ProviderType.GROQ: {"rpm": 30, "tpm": 6000},
+        ProviderType.GEMINI: {"rpm": 15, "tpm": 1000000},
+        ProviderType.CLAUDE: {"rpm": 50, "tpm": 40000},
+        # Effectively unlimited unless FAKE_RPM / FAKE_TPM mimic a real tier
+        ProviderType.FAKE: {"rpm": 1000000, "tpm": 1000000000},
+    }
+
+    # Models whose quota differs from their provider default
+    MODEL_QUOTAS = {
+        'llama-3.1-8b-instant': {"rpm": 30, "tpm": 20000},
+        'models/gemini-2.0-flash-lite': {"rpm": 30, "tpm": 1000000},
+    }
+
+    _shared: Optional["ProviderRateLimiter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, quotas: Optional[Dict[ProviderType, Dict[str, float]]] = None):
+        self.quotas = {
+            provider: self._env_quota(provider, quota)
+            for provider, quota in (quotas or self.DEFAULT_QUOTAS).items()
+        }
+        self._buckets: Dict[Tuple[ProviderType, str], Tuple[TokenBucket, TokenBucket]] = {}
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+
+    @classmethod
+    def shared(cls) -> "ProviderRateLimiter":
+        """Process-wide limiter used by every agent."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """Rough token estimate: ~4 characters per prompt token plus the output budget."""
+        return len(prompt) // 4 + max_tokens
+
+    async def acquire(self, provider: ProviderType, model_name: str, estimated_tokens: int):
+        """Wait until both the request and token budgets allow one more call."""
+        requests, tokens = self._get_buckets(provider, model_name)
+
+        waited = 0.0
+        while True:
+            delay = max(requests.wait_time(1), tokens.wait_time(estimated_tokens))
+            if delay <= 0:
+                requests.consume(1)
+                tokens.consume(estimated_tokens)
+                break
+            waited += delay
+            await asyncio.sleep(delay)
+
+        if waited:
+            self.waits += 1
+            self.total_wait_seconds += waited
+
+    def penalize(self, provider: ProviderType, model_name: str):
+        """Back off after the provider rejected a call despite the local budget."""
+        requests, tokens = self._get_buckets(provider, model_name)
+        requests.drain()
+        tokens.drain()
+
+    def _get_buckets(self, provider: ProviderType, model_name: str) -> Tuple[TokenBucket, TokenBucket]:
+        key = (provider, model_name)
+        if key not in self._buckets:
+            quota = self.MODEL_QUOTAS.get(model_name) or self.quotas.get(provider) or {"rpm": 60, "tpm": 100000}
+            self._buckets[key] = (
+                TokenBucket(quota["rpm"], quota["rpm"] / 60.0),
+                TokenBucket(quota["tpm"], quota["tpm"] / 60.0),
+            )
+        return self._buckets[key]
+
+    def _env_quota(self, provider: ProviderType, quota: Dict[str, float]) -> Dict[str, float]:
+        prefix = provider.value.upper()
+        return {
+            "rpm": float(os.getenv(f"{prefix}_RPM", quota["rpm"])),
+            "tpm": float(os.getenv(f"{prefix}_TPM", quota["tpm"])),
+        }
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for provider 429 / quota-exhausted errors."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "resource exhausted" in message or "quota" in message
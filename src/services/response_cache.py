@@ -0,0 +1,231 @@
+# src/services/response_cache.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+LLM_CACHE_DB = os.getenv("LLM_CACHE_PATH", "data/databases/llm_cache.db")
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of LLM responses.
+
+    An in-memory LRU sits in front of an SQLite table. Keys hash the full
+    prompt together with provider, model, temperature and the other request
+    settings, so identical article text re-sent by the detector, rewriter or
+    explainer is answered locally. The async variants answer memory hits
+    directly and run the SQLite work in an executor, off the event loop.
+    """
+
+    _shared: Optional["ResponseCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str = LLM_CACHE_DB,
+        memory_entries: int = None,
+        max_rows: int = None,
+        ttl_seconds: float = None
+    ):
+        self.db_path = db_path
+        self.memory_entries = memory_entries or int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+        self.max_rows = max_rows or int(os.getenv("LLM_CACHE_MAX_ROWS", "20000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+        self._init_db()
+
+    @classmethod
+    def shared(cls) -> "ResponseCache":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def make_key(provider: str, model_name: str, request: Dict[str, Any]) -> str:
+        """Hash of the prompt plus everything that changes the answer."""
+        material = {
+            "provider": provider,
+            "model": model_name,
+            "prompt": request.get("prompt"),
+            "system": request.get("system"),
+            "temperature": request.get("temperature"),
+            "max_tokens": request.get("max_tokens"),
+            "json_mode": request.get("json_mode", False)
+        }
+        if request.get("schema") is not None:
+            material["schema"] = request["schema"]
+        material = json.dumps(material, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        response = self._get_memory(key)
+        if response is not None:
+            return response
+        return self._get_disk(key)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        response = self._get_memory(key)
+        if response is not None:
+            return response
+        return await asyncio.get_running_loop().run_in_executor(None, self._get_disk, key)
+
+    async def put_async(self, key: str, provider: str, model_name: str, temperature: float, response: str):
+        await asyncio.get_running_loop().run_in_executor(None, self.put, key, provider, model_name, temperature, response)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, created_at = entry
+                if now - created_at < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return response
+                del self._memory[key]
+        return None
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                row = conn.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE cache_key = ?",
+                    (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl_seconds:
+                    conn.execute("UPDATE llm_responses SET last_used = ? WHERE cache_key = ?", (now, key))
+                    conn.commit()
+                elif row is not None:
+                    conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+                    conn.commit()
+                    row = None
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"LLM cache read error: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def put(self, key: str, provider: str, model_name: str, temperature: float, response: str):
+        if not response:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            self._writes_since_trim += 1
+            trim = self._writes_since_trim >= 100
+            if trim:
+                self._writes_since_trim = 0
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute("""
+                    INSERT OR REPLACE INTO llm_responses
+                    (cache_key, provider, model_name, temperature, response, created_at, last_used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (key, provider, model_name, temperature, response, now, now))
+                conn.commit()
+                if trim:
+                    self._trim(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"LLM cache write error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "evictions": self.evictions
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM llm_responses")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _remember(self, key: str, response: str, created_at: float):
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _trim(self, conn: sqlite3.Connection):
+        """Drop expired rows, then the least recently used rows above max_rows."""
+        cur = conn.cursor()
+        cur.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        expired = cur.rowcount
+        cur.execute("""
+            DELETE FROM llm_responses WHERE cache_key IN (
+                SELECT cache_key FROM llm_responses
+                ORDER BY last_used DESC
+                LIMIT -1 OFFSET ?
+            )
+        """, (self.max_rows,))
+        with self._lock:
+            self.evictions += max(expired, 0) + max(cur.rowcount, 0)
+        conn.commit()
+
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model_name TEXT,
+                    temperature REAL,
+                    response TEXT,
+                    created_at REAL,
+                    last_used REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used)")
+            conn.commit()
+        finally:
+            conn.close()
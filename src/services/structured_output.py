@@ -0,0 +1,322 @@
+# src/services/structured_output.py
+
+import inspect
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import google.generativeai as genai
+
+
+BIAS_ANALYSIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "emotional_bias_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "framing_bias_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "omission_bias_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "overall_bias_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "biased_phrases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "text": {"type": "string"},
+                    "bias_type": {"type": "string"},
+                    "explanation": {"type": "string"},
+                    "suggested_replacement": {"type": "string"}
+                },
+                "required": ["text"]
+            }
+        },
+        "summary": {"type": "string"}
+    },
+    "required": [
+        "emotional_bias_score",
+        "framing_bias_score",
+        "omission_bias_score",
+        "overall_bias_score",
+        "biased_phrases",
+        "summary"
+    ]
+}
+
+# Fused mode adds the rewritten body, headline and explanation to the analysis
+FUSED_ANALYSIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": dict(
+        BIAS_ANALYSIS_SCHEMA["properties"],
+        neutral_text={"type": "string"},
+        neutral_title={"type": "string"},
+        explanation={"type": "string"}
+    ),
+    "required": BIAS_ANALYSIS_SCHEMA["required"] + ["neutral_text", "neutral_title", "explanation"]
+}
+
+STRUCTURED_TOOL_NAME = "record_result"
+
+# google-generativeai gained JSON output (response_mime_type/response_schema) after 0.3
+GEMINI_SUPPORTS_JSON = "response_mime_type" in inspect.signature(genai.types.GenerationConfig).parameters
+GEMINI_SUPPORTS_SCHEMA = "response_schema" in inspect.signature(genai.types.GenerationConfig).parameters
+
+
+def claude_tool_params(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Tool definition that forces Claude to answer with schema-shaped input."""
+    return {
+        "tools": [{
+            "name": STRUCTURED_TOOL_NAME,
+            "description": "Record the result in the required structure.",
+            "input_schema": schema
+        }],
+        # Passed through the body so older SDKs without a tool_choice argument still send it
+        "extra_body": {"tool_choice": {"type": "tool", "name": STRUCTURED_TOOL_NAME}}
+    }
+
+
+def claude_messages_api(client):
+    """Messages resource that accepts tools (beta.tools on older anthropic SDKs)."""
+    tools = getattr(getattr(client, "beta", None), "tools", None)
+    return tools.messages if tools is not None else client.messages
+
+
+def claude_tool_input(response) -> Optional[Dict[str, Any]]:
+    """The forced tool call's input, if the response has one."""
+    for block in getattr(response, "content", None) or []:
+        if getattr(block, "type", None) == "tool_use":
+            return block.input
+    return None
+
+
+def gemini_json_config(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Generation config entries for Gemini JSON output, where the SDK supports it."""
+    config = {}
+    if GEMINI_SUPPORTS_JSON:
+        config["response_mime_type"] = "application/json"
+        if schema is not None and GEMINI_SUPPORTS_SCHEMA:
+            config["response_schema"] = _gemini_schema(schema)
+    return config
+
+
+def _gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Gemini accepts an OpenAPI subset without numeric bounds."""
+    converted = {key: value for key, value in schema.items() if key not in ("minimum", "maximum")}
+    if "properties" in converted:
+        converted["properties"] = {name: _gemini_schema(sub) for name, sub in converted["properties"].items()}
+    if "items" in converted:
+        converted["items"] = _gemini_schema(converted["items"])
+    return converted
+
+
+def validate(data: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """Schema violations in `data` (the type/properties/required/items/bounds subset used here)."""
+    expected = schema.get("type")
+    if expected == "object":
+        if not isinstance(data, dict):
+            return [f"{path}: expected object"]
+        errors = [f"{path}.{name}: missing" for name in schema.get("required", []) if name not in data]
+        for name, sub_schema in schema.get("properties", {}).items():
+            if name in data:
+                errors.extend(validate(data[name], sub_schema, f"{path}.{name}"))
+        return errors
+    if expected == "array":
+        if not isinstance(data, list):
+            return [f"{path}: expected array"]
+        errors = []
+        for i, item in enumerate(data):
+            errors.extend(validate(item, schema.get("items", {}), f"{path}[{i}]"))
+        return errors
+    if expected == "integer":
+        if isinstance(data, bool) or not isinstance(data, int):
+            return [f"{path}: expected integer"]
+        if data < schema.get("minimum", data) or data > schema.get("maximum", data):
+            return [f"{path}: out of range"]
+        return []
+    if expected == "string":
+        return [] if isinstance(data, str) else [f"{path}: expected string"]
+    return []
+
+
+def _repair_value(value: Any, schema: Dict[str, Any]) -> Any:
+    expected = schema.get("type")
+    if expected == "integer":
+        if isinstance(value, str):
+            match = re.search(r"-?\d+(\.\d+)?", value)
+            value = float(match.group()) if match else None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = int(round(value))
+            return max(schema.get("minimum", value), min(schema.get("maximum", value), value))
+        return None
+    if expected == "string":
+        if value is None:
+            return ""
+        return value if isinstance(value, str) else json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+    if expected == "array":
+        if isinstance(value, dict):
+            value = [value]
+        if not isinstance(value, list):
+            return []
+        item_schema = schema.get("items", {})
+        items = [_repair_value(item, item_schema) for item in value]
+        # One unusable item (e.g. a phrase without "text") must not sink the whole response
+        return [item for item in items if item is not None and not validate(item, item_schema)]
+    if expected == "object":
+        if isinstance(value, str) and schema.get("required"):
+            # A bare string where an object belongs becomes its first required field
+            value = {schema["required"][0]: value}
+        if not isinstance(value, dict):
+            return None
+        repaired = dict(value)
+        for name, sub_schema in schema.get("properties", {}).items():
+            if name in repaired:
+                fixed = _repair_value(repaired[name], sub_schema)
+                if fixed is None:
+                    del repaired[name]
+                else:
+                    repaired[name] = fixed
+        return repaired
+    return value
+
+
+def repair(data: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Coerce a near-miss response into the schema without another model call.
+
+    Numbers given as strings are parsed and clamped, scalars and lone objects
+    are wrapped into arrays, and missing integer fields are filled with the
+    mean of their sibling integers (e.g. a missing overall score becomes the
+    mean of the other scores). Missing strings and arrays default to empty,
+    and array items that still fail validation are dropped.
+    """
+    repaired = _repair_value(data, schema) or {}
+    properties = schema.get("properties", {})
+
+    integers = [repaired[name] for name, sub in properties.items()
+                if sub.get("type") == "integer" and isinstance(repaired.get(name), int)]
+    for name in schema.get("required", []):
+        if name in repaired:
+            continue
+        kind = properties.get(name, {}).get("type")
+        if kind == "integer" and integers:
+            repaired[name] = int(round(sum(integers) / len(integers)))
+        elif kind == "array":
+            repaired[name] = []
+        elif kind == "string":
+            repaired[name] = ""
+    return repaired
+
+
+def load_json_object(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse the JSON object in a model response, tolerating code fences,
+    surrounding prose, trailing commas, smart quotes and truncated endings.
+    """
+    if not text:
+        return None
+
+    cleaned = text.strip()
+    cleaned = re.sub(r"^```(?:json)?", "", cleaned).strip()
+    cleaned = re.sub(r"```$", "", cleaned).strip()
+
+    start = cleaned.find('{')
+    if start == -1:
+        return None
+    end = cleaned.rfind('}') + 1
+    candidates = [cleaned[start:end]] if end > start else []
+    candidates.append(_close_truncated(cleaned[start:]))
+
+    for candidate in candidates:
+        for attempt in (candidate, _fix_common_mistakes(candidate)):
+            try:
+                result = json.loads(attempt)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(result, dict):
+                return result
+    return None
+
+
+def _fix_common_mistakes(text: str) -> str:
+    text = text.replace("“", '"').replace("”", '"').replace("‘", "'").replace("’", "'")
+    return re.sub(r",\s*([}\]])", r"\1", text)
+
+
+def _close_truncated(text: str) -> str:
+    """Close the strings, arrays and objects left open by a cut-off response."""
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    closed = text + ('"' if in_string else "")
+    closed = re.sub(r",\s*$", "", closed.rstrip())
+    closed = re.sub(r'(,\s*"[^"]*"\s*:?\s*)$', "", closed)
+    return closed + "".join(reversed(stack))
+
+
+def parse_structured(text: Optional[str], schema: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Parse and validate a structured response, repairing it when needed.
+
+    Returns:
+        (data, status) with status "clean", "repaired" or "failed" (data None)
+    """
+    data = load_json_object(text)
+    if data is None:
+        return None, "failed"
+    if not validate(data, schema):
+        return data, "clean"
+
+    repaired = repair(data, schema)
+    if validate(repaired, schema):
+        return None, "failed"
+    return repaired, "repaired"
+
+
+class ParseStats:
+    """Structured-output outcomes per provider/model: clean, repaired, failed."""
+
+    _shared: Optional["ParseStats"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "ParseStats":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def record(self, provider: str, model_name: str, status: str):
+        with self._lock:
+            counts = self._counts.setdefault((provider, model_name), {"clean": 0, "repaired": 0, "failed": 0})
+            counts[status] += 1
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = []
+            for (provider, model_name), counts in sorted(self._counts.items()):
+                total = sum(counts.values())
+                rows.append(dict(
+                    counts,
+                    provider=provider,
+                    model_name=model_name,
+                    responses=total,
+                    parse_failure_rate=round(counts["failed"] / total, 3) if total else 0.0,
+                    repair_rate=round(counts["repaired"] / total, 3) if total else 0.0
+                ))
+            return rows
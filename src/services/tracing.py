@@ -0,0 +1,248 @@
+# src/services/tracing.py
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import httpx
+
+
+# Span open in the current task/thread; asyncio tasks inherit it when created
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+# OTLP span status codes
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+class Span:
+    """One timed operation; children share its trace_id and point at its span_id."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = {key: value for key, value in attributes.items() if value is not None}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attributes(self, **attributes):
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status, "message": self.status_message} if self.status_message
+            else {"code": self.status}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Tracer:
+    """
+    Parent/child spans across fetch, store, analyze (with every LLM call)
+    and persist, without an OpenTelemetry SDK dependency.
+
+    The current span lives in a contextvar, so spans opened in asyncio tasks
+    (the scheduler's gather, hedged calls) nest under the span that created
+    the task. Spans are buffered per trace and exported when the trace's root
+    span ends, in the OTLP/JSON encoding:
+    - TRACE_EXPORT=file: one ExportTraceServiceRequest per line in TRACE_FILE,
+      readable by the OpenTelemetry Collector's otlpjsonfile receiver
+    - TRACE_EXPORT=otlp: POSTed to OTEL_EXPORTER_OTLP_ENDPOINT/v1/traces
+    - TRACE_EXPORT=none (default): trace IDs are still issued, nothing is kept
+    """
+
+    _shared: Optional["Tracer"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        export: Optional[str] = None,
+        path: Optional[str] = None,
+        otlp_endpoint: Optional[str] = None,
+        service_name: Optional[str] = None
+    ):
+        self.export = (export or os.getenv("TRACE_EXPORT", "none")).lower()
+        self.path = path or os.getenv("TRACE_FILE", "data/traces/spans.jsonl")
+        self.otlp_endpoint = otlp_endpoint or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+        self.service_name = service_name or os.getenv("OTEL_SERVICE_NAME", "bias-detection")
+        # trace_id -> finished spans waiting for their root span
+        self._pending: Dict[str, List[Span]] = {}
+        self._open_roots: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "Tracer":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def enabled(self) -> bool:
+        return self.export in ("file", "otlp")
+
+    @contextmanager
+    def span(self, name: str, trace_id: Optional[str] = None, **attributes) -> Iterator[Span]:
+        """
+        Open a span under the current one; without a current span (or with an
+        explicit trace_id) it starts a trace.
+        """
+        parent = _current_span.get()
+        if trace_id is not None and (parent is None or parent.trace_id != trace_id):
+            parent = None
+        span = Span(name, trace_id or (parent.trace_id if parent else new_trace_id()),
+                    parent.span_id if parent else None, attributes)
+        is_root = parent is None
+        if is_root:
+            with self._lock:
+                self._open_roots[span.trace_id] = self._open_roots.get(span.trace_id, 0) + 1
+
+        token = _current_span.set(span)
+        try:
+            yield span
+            if span.status == STATUS_UNSET:
+                span.status = STATUS_OK
+        except BaseException as e:
+            span.status = STATUS_ERROR
+            span.status_message = f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span, is_root)
+
+    def _finish(self, span: Span, is_root: bool):
+        if not self.enabled:
+            if is_root:
+                with self._lock:
+                    self._release_root(span.trace_id)
+            return
+        with self._lock:
+            if is_root:
+                self._release_root(span.trace_id)
+            if span.trace_id in self._open_roots:
+                self._pending.setdefault(span.trace_id, []).append(span)
+                return
+            # Root done (or a straggler after it): the trace is complete
+            spans = self._pending.pop(span.trace_id, []) + [span]
+        self._export(spans)
+
+    def _release_root(self, trace_id: str):
+        remaining = self._open_roots.get(trace_id, 0) - 1
+        if remaining > 0:
+            self._open_roots[trace_id] = remaining
+        else:
+            self._open_roots.pop(trace_id, None)
+
+    def to_otlp(self, spans: List[Span]) -> Dict[str, Any]:
+        """An OTLP ExportTraceServiceRequest (JSON encoding) for the spans."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "src.services.tracing"},
+                    "spans": [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+
+    def _export(self, spans: List[Span]):
+        payload = self.to_otlp(spans)
+        try:
+            if self.export == "file":
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with self._lock, open(self.path, "a") as f:
+                    f.write(json.dumps(payload) + "\n")
+            elif self.export == "otlp":
+                # Off the event loop; a slow or absent collector must not stall analysis
+                threading.Thread(target=self._post, args=(payload,), daemon=True).start()
+        except OSError as e:
+            print(f"Trace export failed: {e}")
+
+    def _post(self, payload: Dict[str, Any]):
+        try:
+            response = httpx.post(f"{self.otlp_endpoint.rstrip('/')}/v1/traces", json=payload, timeout=10.0)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"Trace export to {self.otlp_endpoint} failed: {e}")
+
+
+def span(name: str, trace_id: Optional[str] = None, **attributes):
+    """Tracer.shared().span(); see Tracer.span."""
+    return Tracer.shared().span(name, trace_id=trace_id, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def traced(name: str):
+    """Run a sync or async function inside a span named `name`."""
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with Tracer.shared().span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Tracer.shared().span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """Run a blocking call (e.g. SQLite) in the default executor, keeping the current span as its parent."""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
@@ -3,6 +3,7 @@ import sys
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -34,6 +35,7 @@ app.add_middleware(
 class AnalysisRequest(BaseModel):
     query: Optional[str] = Field(None, description="Search query for articles")
     article_count: int = Field(3, ge=1, le=20, description="Number of articles to process")
+    deadline_seconds: Optional[float] = Field(None, gt=0, description="Drop articles not started within this time (interactive only)")
 
 class BiasScore(BaseModel):
     overall_bias_score: int
@@ -58,6 +60,7 @@ class AnalysisResponse(BaseModel):
     failed_analyses: int
     results: List[ArticleAnalysis]
     timestamp: str
+    trace_id: Optional[str] = Field(None, description="Trace of this request's spans (TRACE_EXPORT file or OTLP collector)")
 
 class HealthResponse(BaseModel):
     status: str
@@ -75,13 +78,34 @@ class BiasDetectionPipeline:
     def __init__(self):
         from src.services.news_client import NewsClient
         from src.agents.orchestrator import BiasAnalysisOrchestrator
+        from src.agents.scheduler import AnalysisScheduler
+        from src.agents.job_runner import JobRunner
         
         self.news_client = NewsClient()
-        self.orchestrator = BiasAnalysisOrchestrator(max_concurrent=3)
+        self.orchestrator = BiasAnalysisOrchestrator()
+        # One scheduler for all requests, so interactive ones overtake background runs
+        self.scheduler = AnalysisScheduler(self.orchestrator)
+        self.job_runner = JobRunner(self.scheduler)
+        self.interactive_deadline = float(os.getenv("INTERACTIVE_DEADLINE_SECONDS", "120"))
+        # Analysis workers (src/workers) share the database: leave their results alone
+        self.external_workers = os.getenv("EXTERNAL_ANALYSIS_WORKERS", "false").lower() == "true"
     
-    async def run_full_pipeline(self, query: Optional[str] = None, article_count: int = 5):
+    async def run_full_pipeline(
+        self,
+        query: Optional[str] = None,
+        article_count: int = 5,
+        interactive: bool = False,
+        deadline_seconds: Optional[float] = None
+    ):
         """
         Run the complete bias detection pipeline - USING YOUR EXISTING LOGIC
+        
+        Both go through the durable job queue and survive a restart.
+        Interactive runs are scheduled ahead of background ones; articles
+        that have not started by the deadline are dropped from the response.
+        With EXTERNAL_ANALYSIS_WORKERS their jobs are left pending for
+        src/workers/analysis.py; otherwise nothing would claim them again,
+        so they are cancelled.
         """
         print("Starting Bias Detection Pipeline")
         print("=" * 50)
@@ -91,11 +115,11 @@ class BiasDetectionPipeline:
                 get_connection_to_news_db, 
                 add_news, 
                 prepare_data_for_llm,
-                add_bias,
                 clear_old_articles,
                 get_article_stats,
                 clear_processed_articles
             )
+            from src.database.job_queue import enqueue_articles
             
             query_display = f"'{query}'" if query else "all recent articles"
             print(f"Processing parameters - Query: {query_display}, Count: {article_count}")
@@ -103,7 +127,8 @@ class BiasDetectionPipeline:
             # Clear any previously processed articles to ensure fresh analysis
             print("Step 1: Clearing previously processed articles...")
             get_connection_to_news_db()
-            clear_processed_articles()
+            if not self.external_workers:
+                clear_processed_articles()
             
             print("Step 2: Fetching fresh articles...")
             articles = await self.news_client.fetch_articles(query, article_count)
@@ -142,27 +167,39 @@ class BiasDetectionPipeline:
             print(f"Prepared {len(llm_articles)} articles for bias analysis")
             
             print("Step 5: Analyzing biases with AI agents...")
-            analysis_results = await self.orchestrator.analyze_multiple_articles(llm_articles)
+            # Both paths hold their articles as leased jobs, so the ingest worker
+            # does not queue them for the analysis workers as well
+            if interactive:
+                job_ids = enqueue_articles(llm_articles, priority=self.scheduler.INTERACTIVE)
+                analysis_results = await self.job_runner.run_jobs(
+                    len(job_ids),
+                    priority=self.scheduler.INTERACTIVE,
+                    job_ids=job_ids,
+                    deadline_seconds=deadline_seconds or self.interactive_deadline,
+                    retry_dropped=self.external_workers
+                )
+            else:
+                job_ids = enqueue_articles(llm_articles, priority=self.scheduler.BACKGROUND)
+                analysis_results = await self.job_runner.run_jobs(len(job_ids), job_ids=job_ids)
             
             # Verify we got real LLM analysis, not fallbacks
             valid_results = self._verify_llm_results(analysis_results)
             
-            print("Step 6: Storing analysis results...")
-            db_ready_results = self._format_results_for_db(valid_results, llm_articles)
-            
-            if db_ready_results:
-                add_bias(db_ready_results)
-            
-            print("Step 7: Generating summary...")
+            print("Step 6: Generating summary...")
             self._display_summary(valid_results)
             get_article_stats()
             
             # Format for API response
             formatted_results = self._format_api_response(valid_results)
+            dropped = sum(1 for result in analysis_results if result.get("dropped"))
+            message = f"Successfully analyzed {len(formatted_results)} articles"
+            if dropped:
+                fate = "left for the analysis workers" if self.external_workers else "cancelled"
+                message += f"; {dropped} not started before the deadline ({fate})"
             
             return {
                 "status": "success",
-                "message": f"Successfully analyzed {len(valid_results)} articles",
+                "message": message,
                 "results": formatted_results
             }
             
@@ -189,35 +226,6 @@ class BiasDetectionPipeline:
         # Return all results, even fallbacks
         return analysis_results
     
-    def _format_results_for_db(self, analysis_results, original_articles):
-        """Format analysis results for database storage."""
-        db_results = []
-        
-        for i, result in enumerate(analysis_results):
-            if "error" in result or not result:
-                print(f"Skipping invalid result for article {i}")
-                continue
-                
-            original_title = original_articles[i]["title"] if i < len(original_articles) else "Unknown"
-            analysis = result.get("analysis", {})
-            neutral_version = result.get("neutral_version", "")
-            
-            # Ensure we have valid data to store
-            if not analysis or not neutral_version:
-                print(f"Skipping empty analysis for: {original_title[:50]}...")
-                continue
-            
-            # Convert analysis dict to string
-            bias_string = str(analysis) if analysis else "{}"
-            
-            db_results.append({
-                "title": original_title,
-                "bias": bias_string,
-                "rewritten_article": neutral_version
-            })
-        
-        return db_results
-    
     def _format_api_response(self, analysis_results):
         """Format results for API response."""
         formatted = []
@@ -303,7 +311,13 @@ async def root():
         "endpoints": {
             "health": "/health",
             "analyze": "/api/v1/analyze",
-            "stats": "/api/v1/stats"
+            "stats": "/api/v1/stats",
+            "cache": "/api/v1/cache",
+            "ledger": "/api/v1/ledger",
+            "structured_output": "/api/v1/structured-output",
+            "concurrency": "/api/v1/concurrency",
+            "queue": "/api/v1/queue",
+            "metrics": "/metrics"
         }
     }
 
@@ -329,12 +343,19 @@ async def analyze_articles(request: AnalysisRequest):
     - *query*: Optional search query for articles
     - *article_count*: Number of articles to analyze (1-20)
     """
+    from src.services.tracing import Tracer, new_trace_id
+    
+    trace_id = new_trace_id()
     try:
         pipe = get_pipeline()
-        result = await pipe.run_full_pipeline(
-            query=request.query,
-            article_count=request.article_count
-        )
+        with Tracer.shared().span("POST /api/v1/analyze", trace_id=trace_id,
+                                  query=request.query, article_count=request.article_count):
+            result = await pipe.run_full_pipeline(
+                query=request.query,
+                article_count=request.article_count,
+                interactive=True,
+                deadline_seconds=request.deadline_seconds
+            )
         
         if result["status"] == "error":
             raise HTTPException(status_code=500, detail=result["message"])
@@ -349,11 +370,12 @@ async def analyze_articles(request: AnalysisRequest):
             successful_analyses=successful,
             failed_analyses=failed,
             results=result["results"],
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.utcnow().isoformat(),
+            trace_id=trace_id
         )
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}", headers={"X-Trace-Id": trace_id})
 
 @app.get("/api/v1/stats", response_model=StatsResponse, tags=["Statistics"])
 async def get_statistics():
@@ -372,26 +394,83 @@ async def get_statistics():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
+@app.get("/api/v1/cache", tags=["Statistics"])
+async def get_cache_statistics():
+    """Get hit/miss counters for the LLM response cache."""
+    from src.services.response_cache import ResponseCache
+    return ResponseCache.shared().stats()
+
+@app.get("/api/v1/ledger", tags=["Statistics"])
+def get_ledger_report():
+    """Get LLM call counts, tokens, cost and p50/p95 latency per stage and model."""
+    from src.database.call_ledger import get_ledger_report as build_ledger_report
+    try:
+        return build_ledger_report()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to build ledger report: {str(e)}")
+
+@app.get("/api/v1/structured-output", tags=["Statistics"])
+async def get_structured_output_statistics():
+    """Get clean/repaired/failed structured-response counts and parse-failure rate per model."""
+    from src.services.structured_output import ParseStats
+    return ParseStats.shared().snapshot()
+
+@app.get("/api/v1/concurrency", tags=["Statistics"])
+async def get_concurrency_statistics():
+    """Get the adaptive concurrency limit, in-flight articles and recent limit changes."""
+    from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+    return AdaptiveConcurrencyLimiter.shared().snapshot()
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Statistics"])
+def get_metrics():
+    """Prometheus scrape endpoint: per-step and per-LLM-stage histograms and counters, queue and concurrency gauges."""
+    # Plain def: the queue gauges read SQLite, so FastAPI runs this in its threadpool
+    from src.services.metrics import PipelineMetrics
+    return PlainTextResponse(PipelineMetrics.shared().render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/v1/queue", tags=["Statistics"])
+def get_queue_statistics():
+    """Get scheduler outcomes (completed, dropped past deadline) and durable job counts per state."""
+    from src.database.job_queue import get_queue_stats
+    return {
+        "scheduler": get_pipeline().scheduler.snapshot(),
+        "jobs": get_queue_stats()
+    }
+
 @app.post("/api/v1/analyze/background", tags=["Analysis"])
 async def analyze_articles_background(request: AnalysisRequest, background_tasks: BackgroundTasks):
     """
     Analyze articles in the background.
-    Returns immediately while processing continues.
+    Returns immediately while processing continues; the articles are queued
+    as durable jobs at background priority.
     """
+    from src.services.tracing import Tracer, new_trace_id
+    
+    pipe = get_pipeline()
+    # Issued now, used by the task once the response has gone out
+    trace_id = new_trace_id()
+    
     async def run_analysis():
-        pipe = get_pipeline()
-        await pipe.run_full_pipeline(
-            query=request.query,
-            article_count=request.article_count
-        )
+        with Tracer.shared().span("POST /api/v1/analyze/background", trace_id=trace_id,
+                                  query=request.query, article_count=request.article_count):
+            if pipe.external_workers:
+                # Fetch and queue only; the analysis workers pick the jobs up
+                from src.workers.ingest import IngestWorker
+                await IngestWorker(pipe.news_client).run_once(request.query, request.article_count)
+                return
+            await pipe.run_full_pipeline(
+                query=request.query,
+                article_count=request.article_count
+            )
     
     background_tasks.add_task(run_analysis)
     
     return {
-        "status": "processing",
-        "message": "Analysis started in background",
+        "status": "queued" if pipe.external_workers else "processing",
+        "message": "Articles queued for the analysis workers" if pipe.external_workers else "Analysis started in background",
         "query": request.query,
-        "article_count": request.article_count
+        "article_count": request.article_count,
+        "trace_id": trace_id
     }
 
 @app.delete("/api/v1/clear", tags=["Database"])
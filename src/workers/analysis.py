@@ -0,0 +1,120 @@
+# src/workers/analysis.py
+"""
+Analysis worker: claim queued jobs from the database and analyze them.
+
+Start as many as the providers' rate limits allow, on one machine or on
+several sharing the database file (the filesystem must support SQLite
+locking). Jobs are leased, so each is analyzed by one worker at a time, and
+a worker that dies leaves its jobs, with their stage checkpoints, to the
+others once the lease expires.
+
+    python -m src.workers.analysis --cascade
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.agents.job_runner import JobRunner
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.agents.scheduler import AnalysisScheduler
+from src.database.news_db import get_connection_to_news_db
+from src.services.metrics import export_cli_metrics
+from src.services.tracing import Tracer
+
+
+class AnalysisWorker:
+    def __init__(
+        self,
+        orchestrator: Optional[BiasAnalysisOrchestrator] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.orchestrator = orchestrator or BiasAnalysisOrchestrator()
+        self.scheduler = AnalysisScheduler(self.orchestrator)
+        self.runner = JobRunner(self.scheduler, worker_id=worker_id)
+        # Default: claim as many jobs as the adaptive limit lets run at once
+        self.batch_size = batch_size or int(os.getenv("WORKER_BATCH_SIZE", "0"))
+        self.poll_interval = poll_interval or float(os.getenv("WORKER_POLL_SECONDS", "5"))
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def worker_id(self) -> str:
+        return self.runner.worker_id
+
+    async def run_once(self) -> List[Dict[str, Any]]:
+        """Claim and analyze one batch; empty when the queue has nothing runnable."""
+        with Tracer.shared().span("worker.analysis_batch", worker_id=self.worker_id) as span:
+            results = await self.runner.run_jobs(self.batch_size or self.orchestrator.concurrency.limit)
+            span.set_attributes(jobs=len(results))
+        failed = sum(1 for result in results if "error" in result)
+        self.completed += len(results) - failed
+        self.failed += failed
+        return results
+
+    async def run_forever(self, stop: asyncio.Event):
+        """Keep claiming batches; poll while the queue is empty. A claimed batch always finishes."""
+        while not stop.is_set():
+            try:
+                results = await self.run_once()
+            except Exception as e:
+                print(f"Analysis worker {self.worker_id} batch failed: {e}")
+                results = []
+            if results:
+                export_cli_metrics(job="bias_analysis_worker", instance=self.worker_id, verbose=False)
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Analysis worker: analyze queued articles')
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help='Jobs claimed at a time (default: the adaptive concurrency limit)')
+    parser.add_argument('--poll-interval', type=float, default=None, help='Seconds between polls of an empty queue')
+    parser.add_argument('--worker-id', type=str, default=None, help='Lease owner name (default: host-pid-random)')
+    parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+    parser.add_argument('--hedge', action='store_true', help='Hedge slow detection calls to a second provider')
+    parser.add_argument('--fused', action='store_true', help='One LLM request per article')
+    parser.add_argument('--cascade', action='store_true', help='Triage with a small model first')
+    parser.add_argument('--rewrite-mode', choices=['llm', 'local', 'paragraph'], default=None)
+    parser.add_argument('--prescore', action='store_true', help='Score with the local lexicon first')
+    args = parser.parse_args()
+
+    get_connection_to_news_db()
+    orchestrator = BiasAnalysisOrchestrator(
+        hedge_detection=args.hedge or None, fused=args.fused or None, cascade=args.cascade or None,
+        rewrite_mode=args.rewrite_mode, prescore=args.prescore or None
+    )
+    worker = AnalysisWorker(orchestrator, args.batch_size, args.poll_interval, args.worker_id)
+
+    if args.once:
+        results = await worker.runner.drain(worker.batch_size or orchestrator.concurrency.limit)
+        print(f"Analysis worker {worker.worker_id}: {len(results)} jobs processed")
+        return
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Analysis worker {worker.worker_id} started")
+    await worker.run_forever(stop)
+    print(f"Analysis worker {worker.worker_id} stopped: {worker.completed} completed, {worker.failed} failed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
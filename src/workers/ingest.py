@@ -0,0 +1,108 @@
+# src/workers/ingest.py
+"""
+Ingest worker: fetch articles, store them and queue them for analysis.
+
+Runs beside any number of analysis workers (src/workers/analysis.py) that
+share the same database; it never touches analyzed rows except through the
+optional age-based retention.
+
+    python -m src.workers.ingest --query "climate" --count 10 --interval 600
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.database.job_queue import enqueue_articles, unqueued_articles
+from src.database.news_db import add_news, clear_old_articles, get_connection_to_news_db
+from src.services.metrics import export_cli_metrics
+from src.services.news_client import NewsClient
+from src.services.tracing import Tracer
+
+
+class IngestWorker:
+    def __init__(self, news_client: Optional[NewsClient] = None, retention_days: Optional[int] = None):
+        self.news_client = news_client or NewsClient()
+        # Age-based cleanup instead of clear_processed_articles, which would
+        # delete results other workers just stored
+        self.retention_days = retention_days
+
+    async def run_once(self, query: Optional[str] = None, count: int = 5) -> Dict[str, int]:
+        """Fetch, store and queue one round of articles."""
+        get_connection_to_news_db()
+
+        with Tracer.shared().span("worker.ingest_round", query=query, count=count):
+            articles = await self.news_client.fetch_articles(query, count)
+            added = add_news(data=articles) if articles else 0
+
+            # Every unanalyzed article without a job, not only this round's: earlier
+            # rounds may have stored articles without queueing them (e.g. a crash
+            # in between). Articles the API is analyzing already have a job.
+            pending = unqueued_articles()
+            job_ids = enqueue_articles(pending, requeue_finished=False)
+
+            if self.retention_days:
+                clear_old_articles(self.retention_days)
+
+        stats = {"fetched": len(articles or []), "added": added, "queued": len(job_ids)}
+        print(f"Ingest round: {stats['fetched']} fetched, {stats['added']} new, {stats['queued']} queued for analysis")
+        return stats
+
+    async def run_forever(self, queries: List[Optional[str]], count: int, interval: float, stop: asyncio.Event):
+        """Ingest each query in turn every `interval` seconds until `stop` is set."""
+        while not stop.is_set():
+            for query in queries:
+                if stop.is_set():
+                    break
+                try:
+                    await self.run_once(query, count)
+                except Exception as e:
+                    print(f"Ingest round failed for {query!r}: {e}")
+            export_cli_metrics(job="bias_ingest_worker", verbose=False)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Ingest worker: fetch and queue articles for analysis workers')
+    parser.add_argument('--query', action='append', dest='queries',
+                        help='Search query (repeat for several; default: recent articles)')
+    parser.add_argument('--count', type=int, default=5, help='Articles to fetch per query and round')
+    parser.add_argument('--interval', type=float, default=float(os.getenv("INGEST_INTERVAL_SECONDS", "600")),
+                        help='Seconds between ingest rounds')
+    parser.add_argument('--retention-days', type=int, default=None,
+                        help='Delete stored articles older than this many days after each round')
+    parser.add_argument('--once', action='store_true', help='Run a single round and exit')
+    args = parser.parse_args()
+
+    worker = IngestWorker(retention_days=args.retention_days)
+    queries = args.queries or [None]
+
+    if args.once:
+        for query in queries:
+            await worker.run_once(query, args.count)
+        return
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Ingest worker started: {len(queries)} queries every {args.interval:.0f}s")
+    await worker.run_forever(queries, args.count, args.interval, stop)
+    print("Ingest worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
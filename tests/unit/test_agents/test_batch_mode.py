@@ -0,0 +1,101 @@
+# tests/unit/test_agents/test_batch_mode.py
+
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.services.batch_client import LocalBatchService
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+
+
+def _responder(request):
+    """Biased analysis for detection prompts, a fixed neutral rewrite otherwise."""
+    if request["json_mode"]:
+        return json.dumps({
+            "emotional_bias_score": 70,
+            "framing_bias_score": 60,
+            "omission_bias_score": 20,
+            "overall_bias_score": 65,
+            "biased_phrases": [{"text": "disastrous", "suggested_replacement": "difficult"}],
+            "summary": "Loaded language"
+        })
+    return f"Neutral rewrite for {request['custom_id']}"
+
+
+def test_batch_mode_runs_offline(tmp_path, monkeypatch):
+    """Detection and rewrite batches round-trip through the local stand-in."""
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "claude-test", ProviderType.CLAUDE)))
+    orchestrator = BiasAnalysisOrchestrator()
+    service = LocalBatchService(str(tmp_path), responder=_responder, complete_after_polls=2)
+
+    articles = [
+        {"title": "First", "body": "A disastrous quarter for the company."},
+        {"title": "Second", "body": "Another disastrous decision by the board."},
+    ]
+    results = asyncio.run(orchestrator.analyze_articles_batch(articles, service=service))
+
+    assert [r["analysis"]["overall_bias_score"] for r in results] == [65, 65]
+    assert [r["neutral_version"] for r in results] == ["Neutral rewrite for rewrite-0", "Neutral rewrite for rewrite-1"]
+    assert results[1]["original_title"] == "Second"
+    assert len(list(tmp_path.glob("*.output.jsonl"))) == 2
+
+
+def test_batch_mode_skips_rewrites_for_neutral_and_fallback_analyses(tmp_path, monkeypatch):
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "claude-test", ProviderType.CLAUDE)))
+    orchestrator = BiasAnalysisOrchestrator()
+    rewrites = []
+
+    def responder(request):
+        if not request["json_mode"]:
+            rewrites.append(request["custom_id"])
+            return "A difficult quarter for the company."
+        if "calm" in request["prompt"]:
+            return json.dumps({"emotional_bias_score": 2, "framing_bias_score": 2, "omission_bias_score": 2,
+                               "overall_bias_score": 2, "biased_phrases": [], "summary": "Neutral"})
+        if "garbled" in request["prompt"]:
+            return None
+        return _responder(request)
+
+    service = LocalBatchService(str(tmp_path), responder=responder)
+    articles = [
+        {"title": "Calm", "body": "A calm report on the budget."},
+        {"title": "Garbled", "body": "A garbled response comes back for this one."},
+        {"title": "Loaded", "body": "A disastrous quarter for the company."},
+    ]
+    results = asyncio.run(orchestrator.analyze_articles_batch(articles, service=service))
+
+    assert rewrites == ["rewrite-2"]
+    assert [r["neutral_version"] for r in results] == [articles[0]["body"], articles[1]["body"],
+                                                       "A difficult quarter for the company."]
+
+
+def test_batch_mode_matches_the_online_threshold_and_length_check(tmp_path, monkeypatch):
+    """A score between the cascade's neutral threshold and 20 is not rewritten; a truncated rewrite is dropped."""
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "claude-test", ProviderType.CLAUDE)))
+    orchestrator = BiasAnalysisOrchestrator()
+    rewrites = []
+
+    def responder(request):
+        if not request["json_mode"]:
+            rewrites.append(request["custom_id"])
+            return "Cut."
+        score = 17 if "mild" in request["prompt"] else 65
+        return json.dumps({"emotional_bias_score": score, "framing_bias_score": score, "omission_bias_score": score,
+                           "overall_bias_score": score, "biased_phrases": [], "summary": "Scored"})
+
+    service = LocalBatchService(str(tmp_path), responder=responder)
+    articles = [
+        {"title": "Mild", "body": "A mild report on the budget."},
+        {"title": "Loaded", "body": "A disastrous quarter for the company."},
+    ]
+    results = asyncio.run(orchestrator.analyze_articles_batch(articles, service=service))
+
+    assert orchestrator.neutral_threshold < 17 < orchestrator.rewriter.REWRITE_MIN_SCORE
+    assert rewrites == ["rewrite-1"]
+    assert [r["neutral_version"] for r in results] == [articles[0]["body"], articles[1]["body"]]
@@ -0,0 +1,93 @@
+# tests/unit/test_agents/test_cascade.py
+
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ModelFactory, ProviderType
+from src.services.provider_registry import ProviderRegistry
+
+TRIAGE_SCORES = {"calm": 5, "slanted": 25, "furious": 80}
+
+
+def _analysis(score):
+    return json.dumps({
+        "emotional_bias_score": score,
+        "framing_bias_score": score,
+        "omission_bias_score": score,
+        "overall_bias_score": score,
+        "biased_phrases": [],
+        "summary": f"score {score}"
+    })
+
+
+def _use_models(monkeypatch, main_model):
+    main = (object(), main_model, ProviderType.GROQ)
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: main))
+    monkeypatch.setattr(ProviderRegistry, "get_provider", classmethod(lambda cls, provider: main))
+    monkeypatch.setattr(ProviderRegistry, "_pinned", {})
+    monkeypatch.setattr(ModelFactory, "build_client", classmethod(lambda cls, provider, name: (object(), name, provider)))
+
+
+def test_cascade_routes_articles_by_triage_score(monkeypatch):
+    """Neutral articles skip rewriting; mid scores stay on the small model; only high scores reach the main model."""
+    _use_models(monkeypatch, "llama-large")
+    calls = []
+
+    async def complete(self, prompt, **kwargs):
+        stage = kwargs.get("stage")
+        calls.append((self.model_name, stage))
+        if stage == "detect":
+            if self.model_name == "llama-3.1-8b-instant":
+                word = next(w for w in TRIAGE_SCORES if w in prompt)
+                return _analysis(TRIAGE_SCORES[word])
+            return _analysis(90)
+        return f"{stage} answer"
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    orchestrator = BiasAnalysisOrchestrator(cascade=True)
+
+    async def run():
+        return [
+            await orchestrator.analyze_article(f"A {word} report about the council budget.", "")
+            for word in TRIAGE_SCORES
+        ]
+
+    neutral, slanted, furious = asyncio.run(run())
+
+    assert neutral["neutral_version"] == neutral["original_text"]
+    assert neutral["analysis"]["overall_bias_score"] == 5
+    assert slanted["analysis"]["overall_bias_score"] == 25
+    assert slanted["neutral_version"] == "rewrite answer"
+    assert furious["analysis"]["overall_bias_score"] == 90
+
+    assert [c for c in calls if c[0] == "llama-large" and c[1] == "detect"] == [("llama-large", "detect")]
+    # The slanted article is rewritten and explained by the triage model, the furious one by the main model
+    assert calls.count(("llama-3.1-8b-instant", "rewrite")) == 1
+    assert calls.count(("llama-large", "rewrite")) == 1
+    assert orchestrator.get_cascade_stats() == {
+        "neutral": 1, "triage": 1, "escalated": 1, "total": 3, "main_model_share": 0.333
+    }
+
+
+def test_escalation_is_skipped_when_triage_runs_on_the_main_model(monkeypatch):
+    _use_models(monkeypatch, "llama-3.1-8b-instant")
+    stages = []
+
+    async def complete(self, prompt, **kwargs):
+        stages.append(kwargs.get("stage"))
+        return _analysis(80) if kwargs.get("stage") == "detect" else "answer"
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    orchestrator = BiasAnalysisOrchestrator(cascade=True)
+
+    result = asyncio.run(orchestrator.analyze_article("A furious report about the council budget.", ""))
+
+    assert result["analysis"]["overall_bias_score"] == 80
+    assert stages.count("detect") == 1
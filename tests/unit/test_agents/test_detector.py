@@ -0,0 +1,67 @@
+# tests/unit/test_agents/test_detector.py
+
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+import pytest
+
+from src.agents.detector import BiasDetector
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+    detector = BiasDetector()
+    detector.CHUNK_CHARS = 200
+    return detector
+
+
+def test_short_articles_are_not_chunked(detector):
+    assert detector._split_into_chunks("One short paragraph.") == ["One short paragraph."]
+
+
+def test_chunks_follow_paragraph_boundaries(detector):
+    """Paragraphs are packed into chunks without being cut mid-paragraph."""
+    paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(6)]
+    chunks = detector._split_into_chunks("\n\n".join(paragraphs))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= detector.CHUNK_CHARS for chunk in chunks)
+    assert "\n\n".join(chunks).split("\n\n") == [p.strip() for p in paragraphs]
+
+
+def test_chunk_results_are_merged_by_length(detector, monkeypatch):
+    """Scores are length-weighted and phrases de-duplicated across chunks."""
+    long_paragraph = "calm " * 30
+    short_paragraph = "outrageous " * 8
+    article = f"{long_paragraph}\n\n{short_paragraph}"
+
+    async def fake_analyze(prompt):
+        if "outrageous" in prompt:
+            return {
+                "emotional_bias_score": 90, "framing_bias_score": 90,
+                "omission_bias_score": 90, "overall_bias_score": 90,
+                "biased_phrases": [{"text": "Outrageous"}, {"text": "outrageous"}],
+                "summary": "Loaded."
+            }
+        return {
+            "emotional_bias_score": 10, "framing_bias_score": 10,
+            "omission_bias_score": 10, "overall_bias_score": 10,
+            "biased_phrases": [], "summary": "Calm."
+        }
+
+    monkeypatch.setattr(detector, "_analyze", fake_analyze)
+    detector.CHUNK_CHARS = 160
+    result = asyncio.run(detector.detect_biases(article))
+
+    long_len, short_len = len(long_paragraph.strip()), len(short_paragraph.strip())
+    expected = round((10 * long_len + 90 * short_len) / (long_len + short_len))
+    assert result["overall_bias_score"] == expected
+    assert result["biased_phrases"] == [{"text": "Outrageous"}]
+    assert result["summary"] == "Calm. Loaded."
@@ -0,0 +1,92 @@
+# tests/unit/test_agents/test_fused_analysis.py
+
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+
+FUSED_RESPONSE = {
+    "emotional_bias_score": 70,
+    "framing_bias_score": 60,
+    "omission_bias_score": 20,
+    "overall_bias_score": 65,
+    "biased_phrases": [{"text": "disastrous", "suggested_replacement": "difficult"}],
+    "summary": "Loaded language",
+    "neutral_text": "The company reported a difficult quarter.",
+    "neutral_title": "Company reports weaker quarterly results",
+    "explanation": "Words like 'disastrous' steer readers toward a verdict."
+}
+
+
+def _orchestrator(monkeypatch, fused_response):
+    """Fused orchestrator whose gateway answers by stage and records the stages called."""
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+    stages = []
+
+    async def complete(self, prompt, **kwargs):
+        stages.append(kwargs.get("stage"))
+        if kwargs.get("stage") == "fused":
+            return json.dumps(fused_response)
+        if kwargs.get("stage") == "rewrite_title":
+            return "Board approves a new strategy"
+        return f"separate {kwargs.get('stage')} answer"
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    return BiasAnalysisOrchestrator(fused=True), stages
+
+
+def test_valid_fused_response_needs_one_request(monkeypatch):
+    orchestrator, stages = _orchestrator(monkeypatch, FUSED_RESPONSE)
+
+    result = asyncio.run(orchestrator.analyze_article("A disastrous quarter for the company.", "Disastrous quarter!"))
+
+    assert stages == ["fused"]
+    assert result["analysis"]["overall_bias_score"] == 65
+    assert "neutral_text" not in result["analysis"]
+    assert result["neutral_version"] == FUSED_RESPONSE["neutral_text"]
+    assert result["neutral_title"] == FUSED_RESPONSE["neutral_title"]
+    assert result["explanation"] == FUSED_RESPONSE["explanation"]
+
+
+def test_only_invalid_fields_fall_back_to_separate_calls(monkeypatch):
+    """A too-short title and a missing explanation are re-run; the rest is kept."""
+    partial = dict(FUSED_RESPONSE, neutral_title="No")
+    del partial["explanation"]
+    orchestrator, stages = _orchestrator(monkeypatch, partial)
+
+    result = asyncio.run(orchestrator.analyze_article("A disastrous quarter for the company.", "Disastrous quarter!"))
+
+    assert stages == ["fused", "rewrite_title", "explain"]
+    assert result["neutral_version"] == FUSED_RESPONSE["neutral_text"]
+    assert result["neutral_title"] == "Board approves a new strategy"
+    assert result["explanation"] == "separate explain answer"
+
+
+def test_unparseable_fused_response_runs_the_full_pipeline(monkeypatch):
+    orchestrator, stages = _orchestrator(monkeypatch, None)
+
+    asyncio.run(orchestrator.analyze_article("A disastrous quarter for the company.", "Disastrous quarter!"))
+
+    assert stages == ["fused", "detect", "rewrite", "rewrite_title", "explain"]
+
+
+def test_truncated_fused_rewrite_is_rerun_and_prompt_reuses_the_detector(monkeypatch):
+    truncated = dict(FUSED_RESPONSE, neutral_text="The company.")
+    orchestrator, stages = _orchestrator(monkeypatch, truncated)
+    article = "A disastrous quarter for the company, which missed every target it had set for itself."
+
+    result = asyncio.run(orchestrator.analyze_article(article, "Disastrous quarter!"))
+
+    assert stages == ["fused", "rewrite"]
+    assert result["neutral_version"] == "separate rewrite answer"
+    prompt = orchestrator.fused_analyzer._create_fused_prompt(article, "Disastrous quarter!")
+    assert prompt.startswith(orchestrator.detector._create_bias_analysis_prompt(article))
+    assert orchestrator.fused_analyzer._max_tokens(article) < 6000
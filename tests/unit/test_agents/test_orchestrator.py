@@ -0,0 +1,55 @@
+# tests/unit/test_agents/test_orchestrator.py
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+
+ANALYSIS = {
+    "emotional_bias_score": 70,
+    "framing_bias_score": 60,
+    "omission_bias_score": 20,
+    "overall_bias_score": 65,
+    "biased_phrases": [],
+    "summary": "Loaded language"
+}
+
+
+def test_downstream_stages_run_concurrently_after_detection(monkeypatch):
+    """Rewrite, title and explanation start together once detection returns."""
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+    started = {}
+
+    async def complete(self, prompt, **kwargs):
+        stage = kwargs.get("stage")
+        started[stage] = time.monotonic()
+        await asyncio.sleep(0.2)
+        if stage == "detect":
+            return json.dumps(ANALYSIS)
+        if stage == "rewrite_title":
+            return "Company reports weaker quarterly results"
+        return f"{stage} answer"
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    orchestrator = BiasAnalysisOrchestrator()
+
+    began = time.monotonic()
+    result = asyncio.run(orchestrator.analyze_article("A disastrous quarter for the company.", "Disastrous quarter!"))
+    elapsed = time.monotonic() - began
+
+    assert started["rewrite"] - started["detect"] >= 0.2
+    assert max(started["rewrite"], started["rewrite_title"], started["explain"]) - min(
+        started["rewrite"], started["rewrite_title"], started["explain"]) < 0.1
+    assert elapsed < 0.6
+    assert result["neutral_version"] == "rewrite answer"
+    assert result["neutral_title"] == "Company reports weaker quarterly results"
+    assert result["explanation"] == "explain answer"
@@ -0,0 +1,115 @@
+# tests/unit/test_agents/test_phrase_rewriter.py
+
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.phrase_rewriter import PhraseMatcher, apply_phrase_replacements
+from src.agents.rewriter import ArticleRewriter
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+
+PHRASES = [
+    {"text": "disastrous", "suggested_replacement": "difficult"},
+    {"text": "slammed", "suggested_replacement": "'criticized'"},
+    {"text": "radical left", "suggested_replacement": "progressive"},
+]
+
+
+def test_matcher_reports_overlapping_matches():
+    """Classic Aho-Corasick example: every pattern ending at each position is found."""
+    matcher = PhraseMatcher(["he", "she", "his", "hers"])
+    assert sorted(matcher.find_all("ushers")) == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+
+
+def test_replacements_keep_casing_and_word_boundaries():
+    text = "DISASTROUS news: a Disastrous plan, disastrously slammed. Radical left groups slammed it."
+
+    rewritten, missing = apply_phrase_replacements(text, PHRASES)
+
+    assert rewritten == "DIFFICULT news: a Difficult plan, disastrously criticized. Progressive groups criticized it."
+    assert missing == []
+
+
+def test_unlocated_phrases_are_reported():
+    _, missing = apply_phrase_replacements("A calm report.", PHRASES)
+    assert missing == ["disastrous", "slammed", "radical left"]
+
+
+def _rewriter(monkeypatch):
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+
+    async def complete(self, prompt, **kwargs):
+        return "LLM rewrite"
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    return ArticleRewriter(mode="local")
+
+
+def test_local_mode_skips_the_llm_for_moderate_bias(monkeypatch):
+    rewriter = _rewriter(monkeypatch)
+    analysis = {"overall_bias_score": 45, "biased_phrases": PHRASES[:1]}
+
+    result = asyncio.run(rewriter.rewrite_neutral("A disastrous quarter.", analysis))
+
+    assert result == "A difficult quarter."
+    assert (rewriter.rewrite_counts["local"], rewriter.rewrite_counts["llm"]) == (1, 0)
+
+
+def test_local_mode_uses_llm_for_missing_phrases_or_high_scores(monkeypatch):
+    rewriter = _rewriter(monkeypatch)
+
+    missing = asyncio.run(rewriter.rewrite_neutral("A calm quarter.", {"overall_bias_score": 45, "biased_phrases": PHRASES}))
+    severe = asyncio.run(rewriter.rewrite_neutral("A disastrous quarter.", {"overall_bias_score": 90, "biased_phrases": PHRASES}))
+
+    assert missing == severe == "LLM rewrite"
+    assert (rewriter.rewrite_counts["local"], rewriter.rewrite_counts["llm"]) == (0, 2)
+
+
+def test_paragraph_mode_rewrites_only_biased_paragraphs(monkeypatch):
+    """Clean paragraphs and separators survive untouched; biased ones are regenerated concurrently."""
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+    prompts = []
+
+    async def complete(self, prompt, **kwargs):
+        prompts.append((prompt, kwargs))
+        return "  Neutral paragraph.  "
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    rewriter = ArticleRewriter(mode="paragraph")
+    article = "The council met on Monday.\n\nCritics slammed the disastrous plan.\n\n\nThe vote is next week."
+    analysis = {"overall_bias_score": 70, "biased_phrases": PHRASES[:2]}
+
+    result = asyncio.run(rewriter.rewrite_neutral(article, analysis))
+
+    assert result == "The council met on Monday.\n\nNeutral paragraph.\n\n\nThe vote is next week."
+    assert len(prompts) == 1
+    assert "Critics slammed" in prompts[0][0] and "council met" not in prompts[0][0]
+    assert prompts[0][1]["stage"] == "rewrite_paragraph"
+    assert (rewriter.paragraphs_rewritten, rewriter.paragraphs_kept) == (1, 2)
+
+
+def test_paragraph_mode_keeps_clean_articles_and_ignores_matches_inside_words(monkeypatch):
+    """No phrases means nothing to rewrite; "war" inside "award" is not a match, so the full rewrite runs."""
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+    prompts = []
+
+    async def complete(self, prompt, **kwargs):
+        prompts.append(kwargs["stage"])
+        return "LLM rewrite"
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    rewriter = ArticleRewriter(mode="paragraph")
+    article = "The mayor received an award.\n\nThe vote is next week."
+
+    clean = asyncio.run(rewriter.rewrite_neutral(article, {"overall_bias_score": 10, "biased_phrases": []}))
+    unlocated = asyncio.run(rewriter.rewrite_neutral(article, {"overall_bias_score": 50, "biased_phrases": [{"text": "war"}]}))
+
+    assert clean == article
+    assert unlocated == "LLM rewrite"
+    assert prompts == ["rewrite"]
+    assert (rewriter.rewrite_counts["paragraph"], rewriter.rewrite_counts["llm"]) == (1, 1)
@@ -0,0 +1,124 @@
+# tests/unit/test_agents/test_scheduler.py
+
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.job_runner import JobRunner
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.agents.scheduler import AnalysisScheduler
+from src.database import job_queue, news_db
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+
+ANALYSIS = {
+    "emotional_bias_score": 70,
+    "framing_bias_score": 60,
+    "omission_bias_score": 20,
+    "overall_bias_score": 65,
+    "biased_phrases": [],
+    "summary": "Loaded language"
+}
+
+
+class RecordingOrchestrator:
+    """Takes a slot like the real orchestrator and records the order articles start in."""
+
+    def __init__(self, limit: int = 1, work_seconds: float = 0.02):
+        self.concurrency = AdaptiveConcurrencyLimiter(initial_limit=limit, max_limit=limit)
+        self.work_seconds = work_seconds
+        self.started = []
+
+    async def analyze_article(self, article_text, original_title="", source="unknown",
+                              schedule_key=(0,), deadline=None, checkpoints=None):
+        async with self.concurrency.slot(schedule_key, deadline):
+            self.started.append(original_title)
+            await asyncio.sleep(self.work_seconds)
+            return {"original_title": original_title, "analysis": {"overall_bias_score": 10}}
+
+
+def _articles(prefix, count):
+    return [{"title": f"{prefix}{i}", "body": "text"} for i in range(count)]
+
+
+def test_interactive_work_overtakes_queued_background_work():
+    orchestrator = RecordingOrchestrator()
+    scheduler = AnalysisScheduler(orchestrator, slice_size=2)
+
+    async def run():
+        background = asyncio.create_task(scheduler.run(_articles("bg", 4), priority=scheduler.BACKGROUND))
+        await asyncio.sleep(0.005)
+        await scheduler.run(_articles("ui", 2), priority=scheduler.INTERACTIVE)
+        await background
+
+    asyncio.run(run())
+
+    # bg0 already held the only slot; the interactive pair goes next
+    assert orchestrator.started[:3] == ["bg0", "ui0", "ui1"]
+
+
+def test_large_batches_share_slots_slice_by_slice():
+    orchestrator = RecordingOrchestrator()
+    scheduler = AnalysisScheduler(orchestrator, slice_size=2)
+
+    async def run():
+        first = asyncio.create_task(scheduler.run(_articles("a", 6)))
+        await asyncio.sleep(0.005)
+        await asyncio.gather(first, scheduler.run(_articles("b", 4)))
+
+    asyncio.run(run())
+
+    assert orchestrator.started == ["a0", "a1", "b0", "b1", "a2", "a3", "b2", "b3", "a4", "a5"]
+
+
+def test_work_past_its_deadline_is_dropped():
+    orchestrator = RecordingOrchestrator(work_seconds=0.1)
+    scheduler = AnalysisScheduler(orchestrator, slice_size=2)
+
+    results = asyncio.run(scheduler.run(_articles("ui", 3), priority=scheduler.INTERACTIVE, deadline_seconds=0.05))
+
+    assert orchestrator.started == ["ui0"]
+    assert [bool(r.get("dropped")) for r in results] == [False, True, True]
+    assert scheduler.snapshot()["dropped"] == 2
+    assert orchestrator.concurrency.in_flight == 0
+
+
+def test_resumed_job_skips_checkpointed_stages(tmp_path, monkeypatch):
+    """A job whose detection was checkpointed before a crash does not pay for detection again."""
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+    stages = []
+
+    async def complete(self, prompt, **kwargs):
+        stages.append(kwargs.get("stage"))
+        if kwargs.get("stage") == "detect":
+            return json.dumps(ANALYSIS)
+        if kwargs.get("stage") == "rewrite_title":
+            return "Company reports weaker quarterly results"
+        return f"{kwargs.get('stage')} answer"
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    article = {"title": "Disastrous quarter!", "body": "A disastrous quarter for the company.", "source": "test"}
+    [job_id] = job_queue.enqueue_articles([article])
+
+    # First worker checkpoints detection, then dies holding the lease
+    [job] = job_queue.claim_jobs("crashed-worker", lease_seconds=0.01)
+    job_queue.save_checkpoint(job_id, "crashed-worker", "analysis", ANALYSIS, lease_seconds=0.01)
+    asyncio.run(asyncio.sleep(0.05))
+
+    orchestrator = BiasAnalysisOrchestrator(concurrency=AdaptiveConcurrencyLimiter(initial_limit=2))
+    runner = JobRunner(AnalysisScheduler(orchestrator), worker_id="worker-2")
+    [result] = asyncio.run(runner.drain(batch_size=5))
+
+    assert "detect" not in stages
+    assert sorted(stages) == ["explain", "rewrite", "rewrite_title"]
+    assert result["analysis"] == ANALYSIS
+    finished = job_queue.get_job(job_id)
+    assert finished["state"] == "done"
+    assert set(finished["checkpoints"]) == {"analysis", "neutral_text", "neutral_title", "explanation"}
@@ -0,0 +1,72 @@
+# tests/unit/test_benchmarks/test_throughput.py
+
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+import pytest
+
+from src.benchmarks.throughput import compare_to_baseline, load_baseline, make_articles, percentile, run_sweep, save_baseline
+from src.database import news_db
+from src.services.circuit_breaker import CircuitBreakerBoard
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.services.fake_llm import FakeLLMProfile
+from src.services.hedging import HedgePolicy
+from src.services.model_factory import ModelFactory
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def restore_shared_state(monkeypatch):
+    """The sweep swaps process-wide singletons; put them back afterwards."""
+    for owner, name in (
+        (ProviderRegistry, "PROVIDER_ORDER"), (ProviderRegistry, "_entries"), (ProviderRegistry, "_failures"),
+        (ProviderRegistry, "_async_clients"), (ModelFactory, "fake_profile"),
+        (AdaptiveConcurrencyLimiter, "_shared"), (ProviderRateLimiter, "_shared"),
+        (CircuitBreakerBoard, "_shared"), (HedgePolicy, "_shared")
+    ):
+        monkeypatch.setattr(owner, name, getattr(owner, name))
+
+
+def test_articles_have_the_requested_size_and_are_distinct():
+    articles = make_articles(3, 500)
+
+    assert all(len(article["body"]) == 500 for article in articles)
+    assert len({article["body"] for article in articles}) == 3
+    assert make_articles(3, 500) == articles
+
+
+def test_percentile_interpolates():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([5], 99) == 5
+
+
+def test_sweep_reports_each_point_without_touching_the_real_database():
+    real_db = news_db.news_DB
+    profile = FakeLLMProfile(latency="fixed:0.005", per_token_seconds=0.0)
+
+    results = asyncio.run(run_sweep([1, 4], [4], [300], profile, verbose=False))
+
+    assert [point["concurrency"] for point in results] == [1, 4]
+    assert all(point["llm_calls"] == 16 and point["fallback_analyses"] == 0 for point in results)
+    assert all(point["p50"] <= point["p95"] <= point["p99"] for point in results)
+    assert results[1]["articles_per_sec"] > results[0]["articles_per_sec"]
+    assert news_db.news_DB == real_db
+
+
+def test_regressions_are_reported_against_a_saved_baseline(tmp_path):
+    point = {"concurrency": 4, "articles": 10, "body_chars": 2000,
+             "articles_per_sec": 10.0, "p50": 0.5, "p95": 1.0, "p99": 1.2}
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, [point], FakeLLMProfile())
+
+    slower = dict(point, articles_per_sec=8.0, p95=1.1)
+    regressions = compare_to_baseline([slower], load_baseline(path), tolerance=0.15)
+
+    assert len(regressions) == 1
+    assert "articles/sec" in regressions[0]
+    assert compare_to_baseline([point], load_baseline(path)) == []
@@ -0,0 +1,112 @@
+# tests/unit/test_database/test_call_ledger.py
+
+import asyncio
+import os
+import sqlite3
+import sys
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.database import call_ledger, news_db
+from src.services.llm_context import article_context
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+
+UNLIMITED = ProviderRateLimiter({ProviderType.GROQ: {"rpm": 1000000, "tpm": 1000000000}})
+
+
+class UsageReportingClient:
+    """Mimics AsyncGroq responses, including the usage block."""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="answer"))],
+            usage=SimpleNamespace(prompt_tokens=1200, completion_tokens=300)
+        )
+
+
+def _gateway(monkeypatch, tmp_path):
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+    client = UsageReportingClient()
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, *args: client))
+    return LLMGateway(client, "llama-3.1-70b-versatile", ProviderType.GROQ, rate_limiter=UNLIMITED, use_cache=False)
+
+
+def test_calls_inside_article_context_are_ledgered(tmp_path, monkeypatch):
+    """Each call lands in llm_calls with tokens, cost and stage; the report aggregates them."""
+    gateway = _gateway(monkeypatch, tmp_path)
+    article_hash = news_db.get_content_hash("Title", "Body")
+
+    async def run():
+        with article_context(article_hash):
+            await gateway.complete("detect this", stage="detect")
+            await gateway.complete("detect again", stage="detect")
+            await gateway.complete("rewrite this", stage="rewrite")
+
+    asyncio.run(run())
+    call_ledger.flush_ledger()
+
+    conn = sqlite3.connect(news_db.news_DB)
+    rows = conn.execute(
+        "SELECT article_hash, stage, provider, prompt_tokens, completion_tokens, fell_back, cost_usd FROM llm_calls"
+    ).fetchall()
+    conn.close()
+
+    assert len(rows) == 3
+    assert rows[0][:6] == (article_hash, "detect", "groq", 1200, 300, 0)
+    assert abs(rows[0][6] - call_ledger.estimate_cost("llama-3.1-70b-versatile", 1200, 300)) < 1e-12
+
+    report = call_ledger.get_ledger_report()
+    by_stage = {row["stage"]: row for row in report["by_stage"]}
+    assert by_stage["detect"]["calls"] == 2
+    assert by_stage["detect"]["prompt_tokens"] == 2400
+    assert by_stage["rewrite"]["calls"] == 1
+    assert report["by_model"][0]["model_name"] == "llama-3.1-70b-versatile"
+
+
+def test_calls_outside_article_context_are_not_ledgered(tmp_path, monkeypatch):
+    gateway = _gateway(monkeypatch, tmp_path)
+
+    asyncio.run(gateway.complete("ad-hoc prompt", stage="detect"))
+
+    assert call_ledger.get_ledger_report() == {"by_stage": [], "by_model": []}
+
+
+def test_unreachable_ledger_database_is_reported_not_raised(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "missing" / "news.db"))
+
+    call_ledger.record_llm_call({"article_hash": "abc", "stage": "detect", "success": True})
+
+
+def test_queued_calls_are_written_by_the_background_writer(tmp_path, monkeypatch):
+    """Queued rows reach the database the caller was using once the writer is flushed."""
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+
+    for stage in ("detect", "detect", "rewrite"):
+        call_ledger.enqueue_llm_call({"article_hash": "abc", "stage": stage, "success": True})
+    call_ledger.flush_ledger()
+
+    by_stage = {row["stage"]: row["calls"] for row in call_ledger.get_ledger_report()["by_stage"]}
+    assert by_stage == {"detect": 2, "rewrite": 1}
+
+
+def test_report_counts_failures_cache_hits_and_uncached_latency(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+    for latency, success, cached, fell_back in ((100.0, True, False, False), (300.0, True, False, True),
+                                                (900.0, False, False, False), (1.0, True, True, False)):
+        call_ledger.record_llm_call({
+            "article_hash": "abc", "stage": "detect", "provider": "groq", "model_name": "llama-3.1-70b-versatile",
+            "prompt_tokens": 10, "latency_ms": latency, "success": success, "cached": cached, "fell_back": fell_back
+        })
+
+    row = call_ledger.get_ledger_report()["by_model"][0]
+
+    assert (row["calls"], row["prompt_tokens"], row["failures"], row["cache_hits"], row["fallbacks"]) == (4, 40, 1, 1, 1)
+    assert (row["p50_latency_ms"], row["p95_latency_ms"]) == (300.0, 900.0)
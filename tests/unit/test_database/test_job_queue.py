@@ -0,0 +1,163 @@
+# tests/unit/test_database/test_job_queue.py
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.job_runner import JobRunner
+from src.database import job_queue, news_db
+
+ARTICLES = [
+    {"title": f"Headline {i}", "body": f"Body of article {i}", "source": "test"}
+    for i in range(3)
+]
+
+
+def _use_tmp_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+
+
+def test_enqueue_is_idempotent_for_unfinished_jobs(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+
+    first = job_queue.enqueue_articles(ARTICLES)
+    again = job_queue.enqueue_articles(ARTICLES)
+
+    assert first == again
+    assert job_queue.get_queue_stats()["pending"] == 3
+
+
+def test_claims_are_exclusive_until_the_lease_expires(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+    job_queue.enqueue_articles(ARTICLES)
+
+    first = job_queue.claim_jobs("worker-a", limit=2, lease_seconds=0.05)
+    second = job_queue.claim_jobs("worker-b", limit=5)
+    assert [job["title"] for job in first] == ["Headline 0", "Headline 1"]
+    assert [job["title"] for job in second] == ["Headline 2"]
+    assert job_queue.claim_jobs("worker-b", limit=5) == []
+
+    # worker-a dies; its jobs become claimable once the lease runs out
+    time.sleep(0.1)
+    reclaimed = job_queue.claim_jobs("worker-c", limit=5)
+    assert [job["id"] for job in reclaimed] == [job["id"] for job in first]
+    assert all(job["attempts"] == 2 for job in reclaimed)
+    assert not job_queue.complete_job(first[0]["id"], "worker-a", {"stale": True})
+
+
+def test_checkpoints_survive_a_lost_worker(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+    [job_id] = job_queue.enqueue_articles(ARTICLES[:1])
+
+    [job] = job_queue.claim_jobs("worker-a", lease_seconds=0.05)
+    checkpoints = job_queue.StageCheckpoints(job_id, "worker-a", job["checkpoints"], lease_seconds=0.05)
+    checkpoints.save("analysis", {"overall_bias_score": 40, "biased_phrases": []})
+    checkpoints.save("neutral_title", "Headline 0")
+
+    time.sleep(0.1)
+    [resumed] = job_queue.claim_jobs("worker-b")
+    assert resumed["checkpoints"] == {
+        "analysis": {"overall_bias_score": 40, "biased_phrases": []},
+        "neutral_title": "Headline 0"
+    }
+
+    # The old worker can no longer write into the job
+    assert not job_queue.save_checkpoint(job_id, "worker-a", "explanation", "late")
+    assert job_queue.complete_job(job_id, "worker-b", {"analysis": {}})
+    assert job_queue.get_job(job_id)["state"] == "done"
+
+
+def test_failed_attempts_retry_until_max_attempts(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+    [job_id] = job_queue.enqueue_articles(ARTICLES[:1], max_attempts=2)
+
+    job_queue.claim_jobs("worker-a")
+    job_queue.fail_job(job_id, "worker-a", "provider down")
+    assert job_queue.get_job(job_id)["state"] == "pending"
+
+    job_queue.claim_jobs("worker-a")
+    job_queue.fail_job(job_id, "worker-a", "provider down again")
+    job = job_queue.get_job(job_id)
+    assert job["state"] == "failed"
+    assert job["error"] == "provider down again"
+    assert job_queue.claim_jobs("worker-a") == []
+
+    # Queuing the article again starts it over
+    job_queue.enqueue_articles(ARTICLES[:1])
+    assert job_queue.get_job(job_id)["state"] == "pending"
+    assert job_queue.get_job(job_id)["attempts"] == 0
+
+
+class _SlowScheduler:
+    """Stands in for AnalysisScheduler: jobs wait well past one lease, then come back empty."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.stolen = None
+
+    async def run(self, articles, priority=None, deadline_seconds=None, checkpoints=None):
+        await asyncio.sleep(self.seconds)
+        self.stolen = job_queue.claim_jobs("worker-b", limit=5)
+        return [{"analysis": {}, "neutral_version": ""} for _ in articles]
+
+
+def test_running_jobs_keep_their_lease_and_empty_results_are_retried(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+    job_ids = job_queue.enqueue_articles(ARTICLES[:2])
+    scheduler = _SlowScheduler(0.4)
+
+    asyncio.run(JobRunner(scheduler, worker_id="worker-a", lease_seconds=0.15).run_jobs(2, job_ids=job_ids))
+
+    assert scheduler.stolen == []
+    for job_id in job_ids:
+        job = job_queue.get_job(job_id)
+        assert job["state"] == "pending"
+        assert "empty analysis" in job["error"]
+
+
+def test_checkpoints_are_saved_off_the_event_loop(tmp_path, monkeypatch):
+    """A checkpoint write may wait on another process's lock; it must not block the loop's thread."""
+    _use_tmp_db(monkeypatch, tmp_path)
+    job_queue.enqueue_articles(ARTICLES[:1])
+    [job] = job_queue.claim_jobs("worker-a")
+    checkpoints = job_queue.StageCheckpoints(job["id"], "worker-a")
+    writers = []
+    save_checkpoint = job_queue.save_checkpoint
+
+    def recording_save(*args, **kwargs):
+        writers.append(threading.current_thread())
+        return save_checkpoint(*args, **kwargs)
+
+    monkeypatch.setattr(job_queue, "save_checkpoint", recording_save)
+    asyncio.run(checkpoints.save_async("neutral_title", "Headline 0"))
+
+    assert writers and writers[0] is not threading.main_thread()
+    assert job_queue.get_job(job["id"])["checkpoints"] == {"neutral_title": "Headline 0"}
+
+
+class _DroppingScheduler:
+    """Stands in for AnalysisScheduler: every article misses its deadline."""
+
+    async def run(self, articles, priority=None, deadline_seconds=None, checkpoints=None):
+        return [{"error": "deadline passed", "original_title": a["title"], "dropped": True} for a in articles]
+
+
+def test_dropped_jobs_are_cancelled_when_nothing_would_retry_them(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+    retried, cancelled = job_queue.enqueue_articles(ARTICLES[:2])
+    runner = JobRunner(_DroppingScheduler(), worker_id="api")
+
+    asyncio.run(runner.run_jobs(1, job_ids=[retried], deadline_seconds=1))
+    asyncio.run(runner.run_jobs(1, job_ids=[cancelled], deadline_seconds=1, retry_dropped=False))
+
+    assert job_queue.get_job(retried)["state"] == "pending"
+    assert job_queue.get_job(cancelled)["state"] == "cancelled"
+    assert job_queue.get_queue_stats()["pending"] == 1
+    # Asking for the article again queues it from scratch
+    assert job_queue.enqueue_articles(ARTICLES[1:2]) == [cancelled]
+    assert job_queue.get_job(cancelled)["state"] == "pending"
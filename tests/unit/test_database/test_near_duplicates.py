@@ -0,0 +1,90 @@
+# tests/unit/test_database/test_near_duplicates.py
+
+import os
+import sqlite3
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.database import news_db
+from src.database.near_duplicates import band_keys, estimate_similarity, minhash_signature
+
+WIRE_STORY = (
+    "The central bank held interest rates steady on Wednesday, citing persistent inflation "
+    "in services and a labor market that remains tighter than policymakers expected. "
+    "Officials signaled that cuts could come later in the year if price pressures ease, "
+    "while several members argued for patience given uncertainty about global demand. "
+    "Markets had largely priced in the decision, and bond yields moved little after the announcement."
+)
+SYNDICATED_COPY = WIRE_STORY + " Reporting by staff; editing by the wire desk."
+UNRELATED_STORY = (
+    "A local football club unveiled plans for a new stadium that would seat forty thousand fans, "
+    "with construction expected to begin next spring pending approval from the city council."
+)
+
+
+def test_signatures_separate_near_duplicates_from_unrelated_text():
+    """Boilerplate-only changes keep similarity high; different stories stay low."""
+    original = minhash_signature(WIRE_STORY)
+    assert estimate_similarity(original, minhash_signature(SYNDICATED_COPY)) > 0.8
+    assert estimate_similarity(original, minhash_signature(UNRELATED_STORY)) < 0.2
+    assert set(band_keys(original)) & set(band_keys(minhash_signature(SYNDICATED_COPY)))
+
+
+def test_syndicated_copy_reuses_stored_analysis(tmp_path, monkeypatch):
+    """A near-duplicate ingested after analysis gets the stored bias and rewrite."""
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+    news_db.get_connection_to_news_db()
+
+    news_db.add_news([{"title": "Rates held", "body": WIRE_STORY}])
+    news_db.add_bias([{"title": "Rates held", "bias": "{'overall_bias_score': 12}", "rewritten_article": "neutral"}])
+
+    news_db.add_news([{"title": "Central bank pauses again", "body": SYNDICATED_COPY}])
+
+    conn = sqlite3.connect(news_db.news_DB)
+    row = conn.execute("SELECT bias, rewritten_article FROM data_news WHERE title = 'Central bank pauses again'").fetchone()
+    conn.close()
+    assert row == ("{'overall_bias_score': 12}", "neutral")
+    assert news_db.prepare_data_for_llm(limit=10, processed_only=True) == []
+
+
+def test_pending_near_duplicate_waits_for_original(tmp_path, monkeypatch):
+    """Copies in the same batch are analyzed once and share the result."""
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+    news_db.get_connection_to_news_db()
+
+    news_db.add_news([
+        {"title": "Rates held", "body": WIRE_STORY},
+        {"title": "Central bank pauses again", "body": SYNDICATED_COPY},
+        {"title": "Stadium plans", "body": UNRELATED_STORY},
+    ])
+
+    pending = news_db.prepare_data_for_llm(limit=10, processed_only=True)
+    assert sorted(article["title"] for article in pending) == ["Rates held", "Stadium plans"]
+
+    news_db.add_bias([{"title": "Rates held", "bias": "{}", "rewritten_article": "neutral"}])
+
+    conn = sqlite3.connect(news_db.news_DB)
+    row = conn.execute("SELECT rewritten_article FROM data_news WHERE title = 'Central bank pauses again'").fetchone()
+    conn.close()
+    assert row == ("neutral",)
+
+
+def test_short_bodies_are_not_fingerprinted(tmp_path, monkeypatch):
+    """Empty or near-empty bodies must not match each other and inherit an analysis."""
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+    news_db.get_connection_to_news_db()
+    assert minhash_signature("") is None and minhash_signature("Breaking news now") is None
+
+    news_db.add_news([{"title": "Empty one", "body": ""}])
+    conn = sqlite3.connect(news_db.news_DB)
+    conn.execute("UPDATE data_news SET bias = 'analysis', rewritten_article = 'rewrite'")
+    conn.commit()
+    conn.close()
+    news_db.add_news([{"title": "Empty two", "body": ""}])
+
+    conn = sqlite3.connect(news_db.news_DB)
+    row = conn.execute("SELECT bias, duplicate_of FROM data_news WHERE title = 'Empty two'").fetchone()
+    conn.close()
+    assert row == (None, None)
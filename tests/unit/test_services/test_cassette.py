@@ -0,0 +1,139 @@
+# tests/unit/test_services/test_cassette.py
+
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+import httpx
+import pytest
+
+from src.benchmarks.throughput import run_sweep
+from src.services.cassette import Cassette, CassetteMiss, RecordingTransport, ReplayTransport
+from src.services.circuit_breaker import CircuitBreakerBoard
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.services.fake_llm import DEFAULT_CANNED_JSON, FakeLLMClient, FakeLLMProfile, FakeRateLimitError
+from src.services.hedging import HedgePolicy
+from src.services.model_factory import ModelFactory, ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter, is_rate_limit_error
+
+
+@pytest.fixture(autouse=True)
+def restore_shared_state(monkeypatch):
+    """Tests switch the process-wide cassette and registry; put them back afterwards."""
+    for owner, name in (
+        (Cassette, "_active"), (Cassette, "_configured"),
+        (ProviderRegistry, "PROVIDER_ORDER"), (ProviderRegistry, "_entries"), (ProviderRegistry, "_failures"),
+        (ProviderRegistry, "_async_clients"), (ModelFactory, "fake_profile"),
+        (AdaptiveConcurrencyLimiter, "_shared"), (ProviderRateLimiter, "_shared"),
+        (CircuitBreakerBoard, "_shared"), (HedgePolicy, "_shared")
+    ):
+        monkeypatch.setattr(owner, name, getattr(owner, name))
+    monkeypatch.setenv("FAKE_LLM", "false")
+
+
+def _request(prompt, json_mode=False):
+    kwargs = {"model": "llama-3.3-70b-versatile", "messages": [{"role": "user", "content": prompt}], "max_tokens": 50}
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+def _record_groq_traffic(path, rate_limit_rate=0.0):
+    """Stand in for a live Groq client with the fake one and record two calls."""
+    cassette = Cassette(path, "record")
+    live = FakeLLMClient(FakeLLMProfile(latency="fixed:0.05", per_token_seconds=0.0, rate_limit_rate=rate_limit_rate))
+    client = cassette.wrap_client(live, "groq", "llama-3.3-70b-versatile")
+    for request in (_request("Analyze this article", json_mode=True), _request("Rewrite: the vote passed")):
+        try:
+            client.chat.completions.create(**request)
+        except FakeRateLimitError:
+            pass
+    return cassette
+
+
+def test_recorded_llm_calls_replay_through_the_model_factory(tmp_path):
+    path = str(tmp_path / "traffic.jsonl")
+    assert _record_groq_traffic(path).counts["recorded"] == 2
+
+    Cassette.use(path, "replay", match="exact")
+    client, model_name, provider = ModelFactory.get_provider_client(ProviderType.GROQ)
+    async_client = ModelFactory.build_async_client(provider, client)
+
+    structured = asyncio.run(async_client.chat.completions.create(**_request("Analyze this article", json_mode=True)))
+    text = client.chat.completions.create(**_request("Rewrite: the vote passed"))
+
+    assert (model_name, provider) == ("llama-3.3-70b-versatile", ProviderType.GROQ)
+    assert json.loads(structured.choices[0].message.content) == DEFAULT_CANNED_JSON
+    assert text.choices[0].message.content.endswith("the vote passed")
+    assert text.usage.completion_tokens > 0
+    with pytest.raises(CassetteMiss):
+        client.chat.completions.create(**_request("Something never recorded"))
+
+
+def test_replay_keeps_latency_and_recorded_rate_limits(tmp_path):
+    path = str(tmp_path / "traffic.jsonl")
+    _record_groq_traffic(path, rate_limit_rate=1.0)
+    client = Cassette(path, "replay", speed=2.0).replay_client("groq")
+
+    with pytest.raises(Exception) as raised:
+        client.chat.completions.create(**_request("Rewrite: the vote passed"))
+
+    entry = json.loads(open(path).readline())
+    assert entry["error"]["status_code"] == 429
+    assert is_rate_limit_error(raised.value)
+    assert Cassette(path, "replay", speed=2.0).delay(entry) == pytest.approx(entry["latency"] * 2)
+
+
+def test_unrecorded_prompts_are_loosely_matched_by_request_kind(tmp_path):
+    path = str(tmp_path / "traffic.jsonl")
+    _record_groq_traffic(path)
+    cassette = Cassette(path, "replay", match="loose")
+    client = cassette.replay_client("groq", "a-model-that-was-not-recorded")
+
+    structured = client.chat.completions.create(**_request("A different article", json_mode=True))
+
+    assert json.loads(structured.choices[0].message.content) == DEFAULT_CANNED_JSON
+    assert cassette.counts == {"recorded": 0, "exact": 0, "loose": 1, "miss": 0}
+
+
+def test_news_api_traffic_is_recorded_without_the_api_key(tmp_path):
+    path = str(tmp_path / "traffic.jsonl")
+    body = {"articles": {"results": [{"title": "Council vote", "body": "The council voted."}]}}
+    live = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+
+    async def fetch(transport, date_start):
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.post("https://eventregistry.org/api/v1/article/getArticles", json={
+                "apiKey": "secret-key", "keyword": "budget", "dateStart": date_start
+            })
+            return response.json()
+
+    assert asyncio.run(fetch(RecordingTransport(Cassette(path, "record"), inner=live), "2026-01-01")) == body
+    assert "secret-key" not in open(path).read()
+
+    # A later day and a placeholder key still match the recording exactly
+    replay = Cassette(path, "replay", match="exact")
+    assert asyncio.run(fetch(ReplayTransport(replay), "2026-03-01")) == body
+    assert replay.counts["exact"] == 1
+
+
+def test_benchmark_replays_a_cassette_instead_of_the_fake_provider(tmp_path, monkeypatch):
+    # Replay keeps the local Groq quotas; lift them so the sweep isn't throttled
+    monkeypatch.setenv("GROQ_RPM", "100000")
+    monkeypatch.setenv("GROQ_TPM", "100000000")
+    path = str(tmp_path / "traffic.jsonl")
+    _record_groq_traffic(path)
+    Cassette.use(None)
+
+    results = asyncio.run(run_sweep([2], [3], [300], FakeLLMProfile(), verbose=False,
+                                    cassette_path=path))
+
+    assert results[0]["llm_calls"] == 12
+    assert results[0]["fallback_analyses"] == 0
+    assert results[0]["p50"] >= 0.05
+    assert Cassette.active() is None
@@ -0,0 +1,103 @@
+# tests/unit/test_services/test_circuit_breaker.py
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.circuit_breaker import CircuitBreaker, CircuitBreakerBoard
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+
+UNLIMITED = ProviderRateLimiter({provider: {"rpm": 1000000, "tpm": 1000000000} for provider in ProviderType})
+
+
+def test_breaker_opens_on_error_rate():
+    """Enough failures in the window open the breaker."""
+    breaker = CircuitBreaker(min_calls=4, failure_rate_threshold=0.5)
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_slow_calls_count_against_breaker():
+    """Calls slower than the latency threshold are treated like failures."""
+    breaker = CircuitBreaker(min_calls=3, failure_rate_threshold=0.6, slow_call_seconds=1.0)
+    for _ in range(3):
+        breaker.record_success(5.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_closes_after_successful_call():
+    """A passed re-probe lets one call through; success closes the breaker."""
+    breaker = CircuitBreaker(min_calls=1, cooldown_seconds=0)
+    breaker.record_failure()
+    assert breaker.needs_probe() and breaker.start_probe()
+    assert not breaker.start_probe()
+
+    breaker.probe_finished(healthy=True)
+    assert breaker.state == CircuitBreaker.HALF_OPEN and breaker.allow_request()
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_one_trial_call_at_a_time():
+    """Concurrent callers are refused while the half-open trial call is in flight."""
+    breaker = CircuitBreaker(min_calls=1, cooldown_seconds=0)
+    breaker.record_failure()
+    breaker.start_probe()
+    breaker.probe_finished(healthy=True)
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow_request()
+
+
+def _claude_client(calls):
+    async def create(**kwargs):
+        calls.append("claude")
+        return SimpleNamespace(content=[SimpleNamespace(text="claude answer")])
+    return SimpleNamespace(messages=SimpleNamespace(create=create))
+
+
+def _failing_groq_client(calls):
+    async def create(**kwargs):
+        calls.append("groq")
+        raise RuntimeError("Error code: 503 - service unavailable")
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_gateway_fails_over_and_skips_open_provider(monkeypatch):
+    """Calls move to the next provider, and stop trying Groq once its breaker opens."""
+    calls = []
+    groq = _failing_groq_client(calls)
+    claude = _claude_client(calls)
+    targets = {ProviderType.CLAUDE: (claude, "claude-test", ProviderType.CLAUDE)}
+
+    monkeypatch.setattr(ProviderRegistry, "get_provider", classmethod(lambda cls, provider: targets.get(provider)))
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, provider, model, client: client))
+    monkeypatch.setattr(ProviderRegistry, "report_failure", classmethod(lambda cls, provider: None))
+
+    board = CircuitBreakerBoard(min_calls=2, failure_rate_threshold=0.5, cooldown_seconds=3600)
+    gateway = LLMGateway(groq, "llama-test", ProviderType.GROQ, rate_limiter=UNLIMITED, breakers=board, use_cache=False)
+
+    async def run():
+        return [await gateway.complete("prompt") for _ in range(4)]
+
+    assert asyncio.run(run()) == ["claude answer"] * 4
+    assert calls.count("groq") == 2
+    assert calls.count("claude") == 4
+    assert board.get(ProviderType.GROQ).state == CircuitBreaker.OPEN
@@ -0,0 +1,68 @@
+# tests/unit/test_services/test_concurrency_limiter.py
+
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+def test_slots_never_exceed_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    active = []
+    peak = []
+
+    async def work():
+        async with limiter.slot():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+    async def run():
+        await asyncio.gather(*[work() for _ in range(6)])
+
+    asyncio.run(run())
+
+    assert max(peak) == 2
+    assert limiter.in_flight == 0
+
+
+def test_limit_grows_additively_when_saturated_and_healthy():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+    limiter.in_flight = 2
+
+    for _ in range(2):
+        limiter.record_success("llama-test", 2000, 1.0)
+    assert limiter.limit == 3
+
+    limiter.in_flight = 0
+    for _ in range(10):
+        limiter.record_success("llama-test", 2000, 1.0)
+    assert limiter.limit == 3
+
+
+def test_overload_cuts_limit_multiplicatively_once_per_cooldown():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, cooldown_seconds=60)
+
+    limiter.record_overload("rate_limited")
+    limiter.record_overload("timeout")
+
+    assert limiter.limit == 4
+    assert limiter.snapshot()["history"][-1]["reason"] == "rate_limited"
+
+
+def test_rising_latency_counts_as_overload():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, cooldown_seconds=0)
+
+    for _ in range(10):
+        limiter.record_success("llama-test", 2000, 1.0)
+    for _ in range(3):
+        limiter.record_success("llama-test", 2000, 6.0)
+
+    assert limiter.limit < 8
+    assert limiter.decreases >= 1
+    assert limiter.snapshot()["history"][-1]["reason"] == "latency_rising"
@@ -0,0 +1,86 @@
+# tests/unit/test_services/test_fake_llm.py
+
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+import pytest
+
+from src.services.fake_llm import DEFAULT_CANNED_JSON, FakeLLMClient, FakeLLMProfile, FakeRateLimitError, parse_latency
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ModelFactory, ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter, is_rate_limit_error
+from src.services.structured_output import BIAS_ANALYSIS_SCHEMA
+
+
+def _request(prompt, json_mode=False):
+    kwargs = {"model": "fake-llm", "messages": [{"role": "user", "content": prompt}], "max_tokens": 50}
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+def test_latency_specs_are_validated():
+    assert parse_latency("uniform:0.1,0.5") == ("uniform", [0.1, 0.5])
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1")
+    with pytest.raises(ValueError):
+        parse_latency("lognormal:0.5")
+
+
+def test_latency_draws_are_seeded_by_prompt_and_attempt():
+    """The same prompts get the same latencies in any order; a resend gets a new draw."""
+    profile = FakeLLMProfile(latency="lognormal:0.2,0.5", per_token_seconds=0.0, seed=7)
+    first, second = FakeLLMClient(profile), FakeLLMClient(profile)
+
+    a1, _ = first._plan(_request("alpha"))
+    b1, _ = first._plan(_request("beta"))
+    b2, _ = second._plan(_request("beta"))
+    a2, _ = second._plan(_request("alpha"))
+    resent, _ = second._plan(_request("alpha"))
+
+    assert (a1, b1) == (a2, b2)
+    assert resent != a2
+
+
+def test_json_mode_returns_canned_json_and_text_echoes_the_prompt():
+    client = FakeLLMClient(FakeLLMProfile(latency="fixed:0", per_token_seconds=0.0))
+
+    structured = client.chat.completions.create(**_request("Analyze this", json_mode=True))
+    text = client.chat.completions.create(**_request("Rewrite: the council approved the budget"))
+
+    assert json.loads(structured.choices[0].message.content) == DEFAULT_CANNED_JSON
+    assert text.choices[0].message.content.endswith("the council approved the budget")
+    assert client.stats["calls"] == 2
+    assert text.usage.completion_tokens > 0
+
+
+def test_injected_429_looks_like_a_provider_rate_limit():
+    client = FakeLLMClient(FakeLLMProfile(latency="fixed:0", rate_limit_rate=1.0)).as_async()
+
+    with pytest.raises(FakeRateLimitError) as raised:
+        asyncio.run(client.chat.completions.create(**_request("hello")))
+
+    assert is_rate_limit_error(raised.value)
+    assert client.stats["rate_limited"] == 1
+
+
+def test_gateway_uses_the_fake_through_the_registry(monkeypatch):
+    for name in ("PROVIDER_ORDER", "_entries", "_failures", "_async_clients"):
+        monkeypatch.setattr(ProviderRegistry, name, getattr(ProviderRegistry, name))
+    monkeypatch.setattr(ModelFactory, "fake_profile", None)
+    ProviderRegistry.use_fake_provider(FakeLLMProfile(latency="fixed:0.001", per_token_seconds=0.0))
+
+    client, model_name, provider = ProviderRegistry.get_model()
+    limiter = ProviderRateLimiter({ProviderType.FAKE: {"rpm": 1000000, "tpm": 1000000000}})
+    gateway = LLMGateway(client, model_name, provider, rate_limiter=limiter, use_cache=False)
+    text = asyncio.run(gateway.complete("Analyze this article", stage="detect", schema=BIAS_ANALYSIS_SCHEMA))
+
+    assert provider == ProviderType.FAKE
+    assert json.loads(text)["overall_bias_score"] == DEFAULT_CANNED_JSON["overall_bias_score"]
+    assert client.stats["calls"] == 1
@@ -0,0 +1,100 @@
+# tests/unit/test_services/test_hedging.py
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.circuit_breaker import CircuitBreakerBoard
+from src.services.hedging import HedgePolicy
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+
+UNLIMITED = ProviderRateLimiter({provider: {"rpm": 1000000, "tpm": 1000000000} for provider in ProviderType})
+
+
+def _chat_client(delay, text, log):
+    async def create(**kwargs):
+        log.append(f"{text}-start")
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log.append(f"{text}-cancelled")
+            raise
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def _claude_client(delay, text, log):
+    async def create(**kwargs):
+        log.append(f"{text}-start")
+        await asyncio.sleep(delay)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+    return SimpleNamespace(messages=SimpleNamespace(create=create))
+
+
+def _gateway(monkeypatch, primary_delay, hedge_delay, policy):
+    log = []
+    groq = _chat_client(primary_delay, "slow", log)
+    claude = _claude_client(hedge_delay, "fast", log)
+    targets = {ProviderType.CLAUDE: (claude, "claude-test", ProviderType.CLAUDE)}
+
+    monkeypatch.setattr(ProviderRegistry, "get_provider", classmethod(lambda cls, provider: targets.get(provider)))
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, provider, model, client: client))
+
+    gateway = LLMGateway(
+        groq, "llama-test", ProviderType.GROQ,
+        rate_limiter=UNLIMITED, breakers=CircuitBreakerBoard(), hedging=policy, use_cache=False
+    )
+    return gateway, log
+
+
+def test_hedge_delay_uses_recent_percentile():
+    """The hedge fires at the configured percentile once enough samples exist."""
+    policy = HedgePolicy(percentile=90, default_delay=5.0, min_samples=10)
+    assert policy.hedge_delay(ProviderType.GROQ, "m") == 5.0
+
+    for latency in range(1, 11):
+        policy.record_latency(ProviderType.GROQ, "m", float(latency))
+    assert policy.hedge_delay(ProviderType.GROQ, "m") == 10.0
+
+
+def test_slow_stages_do_not_raise_the_detection_hedge_delay():
+    policy = HedgePolicy(percentile=90, default_delay=5.0, min_samples=10)
+    for latency in range(1, 11):
+        policy.record_latency(ProviderType.GROQ, "m", float(latency) / 10, stage="detect")
+        policy.record_latency(ProviderType.GROQ, "m", float(latency) * 10, stage="rewrite")
+
+    assert policy.hedge_delay(ProviderType.GROQ, "m", "detect") == 1.0
+    assert policy.hedge_delay(ProviderType.GROQ, "m", "rewrite") == 100.0
+
+
+def test_slow_primary_is_hedged_and_cancelled(monkeypatch):
+    """A duplicate goes out after the delay; the faster answer wins and the loser is cancelled."""
+    policy = HedgePolicy(default_delay=0.05)
+    gateway, log = _gateway(monkeypatch, primary_delay=2.0, hedge_delay=0.01, policy=policy)
+
+    async def run():
+        result = await gateway.complete("prompt", hedge=True)
+        await asyncio.sleep(0)  # let the cancellation land
+        return result
+
+    assert asyncio.run(run()) == "fast"
+    assert "slow-cancelled" in log
+    assert policy.snapshot()["hedges_sent"] == 1
+    assert policy.snapshot()["hedge_wins"] == 1
+
+
+def test_fast_primary_is_not_hedged(monkeypatch):
+    """Calls that finish before the hedge delay never send a duplicate."""
+    policy = HedgePolicy(default_delay=1.0)
+    gateway, log = _gateway(monkeypatch, primary_delay=0.01, hedge_delay=0.01, policy=policy)
+
+    assert asyncio.run(gateway.complete("prompt", hedge=True)) == "slow"
+    assert "fast-start" not in log
+    assert policy.snapshot()["hedges_sent"] == 0
@@ -0,0 +1,78 @@
+# tests/unit/test_services/test_llm_gateway.py
+
+import asyncio
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+
+UNLIMITED = ProviderRateLimiter({ProviderType.GROQ: {"rpm": 1000000, "tpm": 1000000000}})
+
+
+def _chat_response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class FakeAsyncChatClient:
+    """Mimics AsyncGroq: chat.completions.create is a coroutine."""
+
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        await asyncio.sleep(0.01)
+        return _chat_response("async answer")
+
+
+class FakeSyncChatClient:
+    """Mimics Groq: records which thread each call ran on."""
+
+    def __init__(self):
+        self.threads = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.threads.append(threading.current_thread())
+        return _chat_response("sync answer")
+
+
+def test_native_async_client_is_used(monkeypatch):
+    """Concurrent calls run on the event loop through the async client."""
+    async_client = FakeAsyncChatClient()
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, *args: async_client))
+
+    gateway = LLMGateway(FakeSyncChatClient(), "llama-test", ProviderType.GROQ, rate_limiter=UNLIMITED, use_cache=False)
+
+    async def run():
+        return await asyncio.gather(*[
+            gateway.complete("prompt", system="system", max_tokens=50, json_mode=True)
+            for _ in range(100)
+        ])
+
+    results = asyncio.run(run())
+
+    assert results == ["async answer"] * 100
+    assert async_client.requests[0]["response_format"] == {"type": "json_object"}
+    assert async_client.requests[0]["messages"][0] == {"role": "system", "content": "system"}
+
+
+def test_executor_fallback_without_async_client(monkeypatch):
+    """The sync client runs on the thread pool when no async client exists."""
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, *args: None))
+    sync_client = FakeSyncChatClient()
+    gateway = LLMGateway(sync_client, "llama-test", ProviderType.GROQ, rate_limiter=UNLIMITED, use_cache=False)
+
+    result = asyncio.run(gateway.complete("prompt"))
+
+    assert result == "sync answer"
+    assert sync_client.threads[0] is not threading.main_thread()
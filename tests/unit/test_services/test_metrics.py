@@ -0,0 +1,100 @@
+# tests/unit/test_services/test_metrics.py
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.llm_gateway import LLMGateway
+from src.services.metrics import PipelineMetrics, export_cli_metrics
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+from src.services.structured_output import BIAS_ANALYSIS_SCHEMA
+
+UNLIMITED = ProviderRateLimiter({ProviderType.GROQ: {"rpm": 1000000, "tpm": 1000000000}})
+
+
+class GroqLikeClient:
+    def __init__(self, content):
+        self.content = content
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(prompt_tokens=500, completion_tokens=100)
+        )
+
+
+def test_histograms_and_counters_render_in_prometheus_format():
+    metrics = PipelineMetrics(buckets=(0.1, 1.0))
+
+    metrics.observe("bias_pipeline_step_seconds", 0.05, step="fetch")
+    metrics.observe("bias_pipeline_step_seconds", 0.5, step="fetch")
+    metrics.inc("bias_articles_fetched_total", 3, source="newsapi_ai")
+    text = metrics.render()
+
+    assert "# TYPE bias_pipeline_step_seconds histogram" in text
+    assert 'bias_pipeline_step_seconds_bucket{step="fetch",le="0.1"} 1' in text
+    assert 'bias_pipeline_step_seconds_bucket{step="fetch",le="1"} 2' in text
+    assert 'bias_pipeline_step_seconds_bucket{step="fetch",le="+Inf"} 2' in text
+    assert 'bias_pipeline_step_seconds_sum{step="fetch"} 0.55' in text
+    assert 'bias_articles_fetched_total{source="newsapi_ai"} 3' in text
+
+
+def test_time_step_counts_errors():
+    metrics = PipelineMetrics()
+
+    with metrics.time_step("store"):
+        pass
+    try:
+        with metrics.time_step("store"):
+            raise ValueError("disk full")
+    except ValueError:
+        pass
+
+    assert metrics.value("bias_pipeline_steps_total", step="store", status="ok") == 1
+    assert metrics.value("bias_pipeline_steps_total", step="store", status="error") == 1
+    assert metrics.value("bias_pipeline_step_seconds", step="store") == 2
+
+
+def test_gateway_calls_are_counted_by_stage_provider_and_model(monkeypatch):
+    metrics = PipelineMetrics()
+    monkeypatch.setattr(PipelineMetrics, "_shared", metrics)
+    client = GroqLikeClient('{"overall_bias_score": "40"}')
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, *args: client))
+    gateway = LLMGateway(client, "llama-test", ProviderType.GROQ, rate_limiter=UNLIMITED, use_cache=False)
+
+    asyncio.run(gateway.complete("detect this", stage="detect", schema=BIAS_ANALYSIS_SCHEMA))
+
+    labels = {"stage": "detect", "provider": "groq", "model": "llama-test"}
+    assert metrics.value("bias_llm_calls_total", status="success", **labels) == 1
+    assert metrics.value("bias_llm_call_seconds", **labels) == 1
+    assert metrics.value("bias_llm_tokens_total", direction="prompt", **labels) == 500
+    assert metrics.value("bias_llm_fallbacks_total", **labels) == 0
+    assert metrics.value("bias_llm_structured_responses_total", provider="groq", model="llama-test", status="repaired") == 1
+
+
+def test_dump_writes_a_textfile(tmp_path):
+    metrics = PipelineMetrics()
+    metrics.inc("bias_analysis_fallbacks_total", reason="llm_error")
+
+    path = tmp_path / "metrics" / "bias.prom"
+    metrics.dump(str(path))
+
+    assert 'bias_analysis_fallbacks_total{reason="llm_error"} 1' in path.read_text()
+
+
+def test_cli_export_survives_an_unwritable_path(tmp_path, monkeypatch, capsys):
+    """A bad metrics path is logged instead of failing the finished run."""
+    monkeypatch.setattr(PipelineMetrics, "_shared", PipelineMetrics())
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+
+    export_cli_metrics(str(blocker / "bias.prom"))
+
+    assert "Metrics file write failed" in capsys.readouterr().out
@@ -0,0 +1,136 @@
+# tests/unit/test_services/test_provider_registry.py
+
+import os
+import sys
+import threading
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+import pytest
+
+from src.services.model_factory import ModelFactory, ProviderType
+from src.services.probe_cache import ProbeCache
+from src.services.provider_registry import ProviderRegistry
+
+
+@pytest.fixture(autouse=True)
+def isolated_probe_cache(monkeypatch, tmp_path):
+    """Keep probe results out of the real data/cache directory."""
+    cache = ProbeCache(str(tmp_path / "provider_probes.json"))
+    monkeypatch.setattr(ProviderRegistry, "probe_cache", cache)
+    yield cache
+    # Background verifiers must not outlive the patched cache and write the real one
+    for verifier in list(ProviderRegistry._verifiers.values()):
+        verifier.join(timeout=5)
+    ProviderRegistry.reset()
+
+
+def _install_probe(monkeypatch, available):
+    """Replace live probing with a counter; returns the per-provider call counts."""
+    calls = {provider: 0 for provider in ProviderType}
+
+    def fake_probe(provider):
+        calls[provider] += 1
+        if provider not in available:
+            raise RuntimeError(f"No compatible {provider.value} model found")
+        return object(), f"{provider.value}-model", provider
+
+    ProviderRegistry.reset()
+    monkeypatch.setattr(ModelFactory, "get_provider_client", staticmethod(fake_probe))
+    return calls
+
+
+def test_probes_once_and_shares_client(monkeypatch):
+    """Every agent should get the same client from a single probe."""
+    calls = _install_probe(monkeypatch, {ProviderType.GROQ})
+
+    first = ProviderRegistry.get_model()
+    second = ProviderRegistry.get_model()
+    third = ProviderRegistry.get_model()
+
+    assert first[0] is second[0] is third[0]
+    assert first[2] == ProviderType.GROQ
+    assert calls[ProviderType.GROQ] == 1
+
+
+def test_failed_provider_is_not_reprobed(monkeypatch):
+    """A provider that failed its probe is skipped until the retry window passes."""
+    calls = _install_probe(monkeypatch, {ProviderType.CLAUDE})
+
+    for _ in range(3):
+        _, _, provider = ProviderRegistry.get_model()
+        assert provider == ProviderType.CLAUDE
+
+    assert calls[ProviderType.GROQ] == 1
+    assert calls[ProviderType.GEMINI] == 1
+    assert calls[ProviderType.CLAUDE] == 1
+
+
+def test_report_failure_triggers_reprobe(monkeypatch):
+    """Reporting a call failure drops the cached client."""
+    calls = _install_probe(monkeypatch, {ProviderType.GROQ})
+
+    ProviderRegistry.get_model()
+    ProviderRegistry.report_failure(ProviderType.GROQ)
+    ProviderRegistry.get_model()
+
+    assert calls[ProviderType.GROQ] == 2
+
+
+def test_ttl_expiry_reprobes_in_the_background(monkeypatch):
+    """An expired entry is still served while a background probe refreshes it."""
+    calls = _install_probe(monkeypatch, {ProviderType.GROQ})
+    first = ProviderRegistry.get_model()
+    ttl = ProviderRegistry.TTL_SECONDS
+    monkeypatch.setattr(ProviderRegistry, "TTL_SECONDS", 0)
+
+    release = threading.Event()
+    probe = ModelFactory.get_provider_client
+
+    def slow_probe(provider):
+        release.wait(timeout=5)
+        return probe(provider)
+
+    monkeypatch.setattr(ModelFactory, "get_provider_client", staticmethod(slow_probe))
+
+    # The refresh is stuck in its probe; lookups neither wait for it nor start another
+    assert ProviderRegistry.get_model() == first
+    assert ProviderRegistry.get_model() == first
+
+    release.set()
+    ProviderRegistry._verifiers[ProviderType.GROQ].join(timeout=5)
+    monkeypatch.setattr(ProviderRegistry, "TTL_SECONDS", ttl)
+    assert calls[ProviderType.GROQ] == 2
+    assert ProviderRegistry.get_model()[0] is not first[0]
+
+
+def test_probe_results_are_written_to_disk(monkeypatch, isolated_probe_cache):
+    """Successful and failed probes are both recorded in the cache file."""
+    _install_probe(monkeypatch, {ProviderType.GEMINI})
+
+    ProviderRegistry.get_model()
+
+    assert isolated_probe_cache.get(ProviderType.GEMINI)["model_name"] == "gemini-model"
+    assert isolated_probe_cache.get(ProviderType.GROQ)["model_name"] is None
+
+
+def test_fresh_disk_entry_skips_blocking_probe(monkeypatch, isolated_probe_cache):
+    """A new process builds the cached model directly and verifies it in the background."""
+    isolated_probe_cache.record(ProviderType.GROQ, "cached-model", 0.2)
+    calls = _install_probe(monkeypatch, {ProviderType.GROQ})
+    built = []
+
+    def fake_build(provider, model_name):
+        built.append((provider, model_name))
+        return object(), model_name, provider
+
+    monkeypatch.setattr(ModelFactory, "build_client", staticmethod(fake_build))
+
+    _, model_name, provider = ProviderRegistry.get_model()
+    assert (provider, model_name) == (ProviderType.GROQ, "cached-model")
+    assert built == [(ProviderType.GROQ, "cached-model")]
+
+    ProviderRegistry._verifiers[ProviderType.GROQ].join(timeout=5)
+    assert calls[ProviderType.GROQ] == 1
+    assert ProviderRegistry.get_model()[1] == "groq-model"
@@ -0,0 +1,72 @@
+# tests/unit/test_services/test_rate_limiter.py
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter, TokenBucket
+
+
+def test_token_bucket_wait_time():
+    """An empty bucket reports how long until enough tokens refill."""
+    bucket = TokenBucket(capacity=10, refill_per_second=5)
+    bucket.consume(10)
+
+    assert 0.3 < bucket.wait_time(2) <= 0.4
+    assert bucket.wait_time(100) <= 2.0  # requests larger than capacity are capped
+
+
+def test_calls_queue_instead_of_exceeding_rpm():
+    """With 120 rpm the bucket holds 120 calls; the 121st waits ~0.5s for a refill."""
+    limiter = ProviderRateLimiter({ProviderType.GROQ: {"rpm": 120, "tpm": 10000000}})
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*[limiter.acquire(ProviderType.GROQ, "llama-test", 10) for _ in range(121)])
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+
+    assert 0.4 < elapsed < 1.5
+    assert limiter.waits == 1
+
+
+def test_token_budget_limits_large_prompts():
+    """Token-per-minute budgets throttle independently of request counts."""
+    limiter = ProviderRateLimiter({ProviderType.GEMINI: {"rpm": 100000, "tpm": 6000}})
+
+    async def run():
+        started = time.monotonic()
+        await limiter.acquire(ProviderType.GEMINI, "gemini-test", 6000)
+        await limiter.acquire(ProviderType.GEMINI, "gemini-test", 50)
+        return time.monotonic() - started
+
+    assert 0.4 < asyncio.run(run()) < 1.5
+
+
+def test_gateway_retries_after_429(monkeypatch):
+    """A 429 is retried after backing off instead of surfacing as a failure."""
+    attempts = []
+
+    async def create(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise RuntimeError("Error code: 429 - rate limit exceeded")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, *args: client))
+
+    limiter = ProviderRateLimiter({ProviderType.GROQ: {"rpm": 6000, "tpm": 100000000}})
+    gateway = LLMGateway(client, "llama-test", ProviderType.GROQ, rate_limiter=limiter, use_cache=False)
+
+    assert asyncio.run(gateway.complete("prompt")) == "ok"
+    assert len(attempts) == 2
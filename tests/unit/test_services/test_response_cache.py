@@ -0,0 +1,111 @@
+# tests/unit/test_services/test_response_cache.py
+
+import asyncio
+import os
+import sqlite3
+import sys
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.circuit_breaker import CircuitBreakerBoard
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+from src.services.response_cache import ResponseCache
+
+UNLIMITED = ProviderRateLimiter({provider: {"rpm": 1000000, "tpm": 1000000000} for provider in ProviderType})
+REQUEST = {"prompt": "article text", "system": None, "temperature": 0.1, "max_tokens": 100, "json_mode": False}
+
+
+def test_key_depends_on_model_and_temperature():
+    """The same prompt under a different model or temperature is a different entry."""
+    base = ResponseCache.make_key("groq", "llama", REQUEST)
+    assert base == ResponseCache.make_key("groq", "llama", dict(REQUEST))
+    assert base != ResponseCache.make_key("groq", "other", REQUEST)
+    assert base != ResponseCache.make_key("groq", "llama", dict(REQUEST, temperature=0.3))
+
+
+def test_memory_then_disk_hits(tmp_path):
+    """Entries survive a new cache instance through the SQLite tier."""
+    db_path = str(tmp_path / "cache.db")
+    key = ResponseCache.make_key("groq", "llama", REQUEST)
+
+    first = ResponseCache(db_path)
+    assert first.get(key) is None
+    first.put(key, "groq", "llama", 0.1, "answer")
+    assert first.get(key) == "answer"
+    assert first.stats()["memory_hits"] == 1
+
+    second = ResponseCache(db_path)
+    assert second.get(key) == "answer"
+    assert second.get(key) == "answer"
+    assert second.stats()["disk_hits"] == 1
+    assert second.stats()["memory_hits"] == 1
+
+
+def test_lru_and_ttl_eviction(tmp_path):
+    """The memory tier keeps only the newest entries and expired rows are ignored."""
+    cache = ResponseCache(str(tmp_path / "cache.db"), memory_entries=2, ttl_seconds=1000)
+    for name in ("a", "b", "c"):
+        cache.put(name, "groq", "llama", 0.1, name)
+    assert list(cache._memory) == ["b", "c"]
+    assert cache.stats()["evictions"] == 1
+
+    conn = sqlite3.connect(cache.db_path)
+    conn.execute("UPDATE llm_responses SET created_at = 0 WHERE cache_key = 'a'")
+    conn.commit()
+    conn.close()
+    assert cache.get("a") is None
+
+
+def test_gateway_answers_repeated_prompt_from_cache(tmp_path, monkeypatch):
+    """Only the first of several identical prompts reaches the provider."""
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="analysis"))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, *args: client))
+
+    gateway = LLMGateway(
+        client, "llama-test", ProviderType.GROQ,
+        rate_limiter=UNLIMITED, response_cache=ResponseCache(str(tmp_path / "cache.db")), use_cache=True
+    )
+
+    async def run():
+        return [await gateway.complete("same article", max_tokens=50) for _ in range(3)]
+
+    assert asyncio.run(run()) == ["analysis"] * 3
+    assert len(calls) == 1
+
+
+def test_failover_answers_are_found_on_a_rerun(tmp_path, monkeypatch):
+    """The answer from the fallback provider is stored under the preferred target's key."""
+    async def failing(**kwargs):
+        raise RuntimeError("groq down")
+
+    async def answering(**kwargs):
+        return SimpleNamespace(content=[SimpleNamespace(text="claude analysis")])
+
+    groq = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=failing)))
+    claude = SimpleNamespace(messages=SimpleNamespace(create=answering))
+    monkeypatch.setattr(ProviderRegistry, "get_provider", classmethod(
+        lambda cls, provider: (claude, "claude-test", ProviderType.CLAUDE) if provider == ProviderType.CLAUDE else None
+    ))
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, provider, model, client: client))
+    db_path = str(tmp_path / "cache.db")
+
+    def gateway():
+        return LLMGateway(groq, "llama-test", ProviderType.GROQ, rate_limiter=UNLIMITED,
+                          breakers=CircuitBreakerBoard(), response_cache=ResponseCache(db_path), use_cache=True)
+
+    assert asyncio.run(gateway().complete("same article", max_tokens=50)) == "claude analysis"
+
+    rerun = gateway()
+    assert asyncio.run(rerun.complete("same article", max_tokens=50)) == "claude analysis"
+    assert rerun.response_cache.stats()["disk_hits"] == 1
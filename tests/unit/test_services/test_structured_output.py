@@ -0,0 +1,106 @@
+# tests/unit/test_services/test_structured_output.py
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.rate_limiter import ProviderRateLimiter
+from src.services.structured_output import BIAS_ANALYSIS_SCHEMA, ParseStats, parse_structured, validate
+
+COMPLETE = {
+    "emotional_bias_score": 70,
+    "framing_bias_score": 50,
+    "omission_bias_score": 30,
+    "overall_bias_score": 55,
+    "biased_phrases": [{"text": "slammed", "suggested_replacement": "criticized"}],
+    "summary": "Loaded verbs"
+}
+
+
+def test_valid_response_parses_clean():
+    data, status = parse_structured(json.dumps(COMPLETE), BIAS_ANALYSIS_SCHEMA)
+    assert (data, status) == (COMPLETE, "clean")
+
+
+def test_near_misses_are_repaired_instead_of_discarded():
+    """Fenced, string-typed, trailing-comma output missing overall_bias_score keeps its content."""
+    text = """```json
+    {"emotional_bias_score": "70/100", "framing_bias_score": 50, "omission_bias_score": 30,
+     "biased_phrases": ["slammed"], "summary": "Loaded verbs",}
+    ```"""
+
+    data, status = parse_structured(text, BIAS_ANALYSIS_SCHEMA)
+
+    assert status == "repaired"
+    assert data["emotional_bias_score"] == 70
+    assert data["overall_bias_score"] == 50
+    assert data["biased_phrases"] == [{"text": "slammed"}]
+    assert validate(data, BIAS_ANALYSIS_SCHEMA) == []
+
+
+def test_malformed_phrase_is_dropped_not_the_whole_analysis():
+    response = dict(COMPLETE, biased_phrases=[
+        {"text": "slammed", "bias_type": "emotional"},
+        {"bias_type": "framing", "explanation": "No text given"},
+        {"text": "reckless"}
+    ])
+
+    data, status = parse_structured(json.dumps(response), BIAS_ANALYSIS_SCHEMA)
+
+    assert status == "repaired"
+    assert [phrase["text"] for phrase in data["biased_phrases"]] == ["slammed", "reckless"]
+    assert data["overall_bias_score"] == COMPLETE["overall_bias_score"]
+
+
+def test_truncated_response_keeps_completed_fields():
+    text = json.dumps(COMPLETE)[:-40]
+
+    data, status = parse_structured(text, BIAS_ANALYSIS_SCHEMA)
+
+    assert status == "repaired"
+    assert data["overall_bias_score"] == 55
+    assert data["biased_phrases"][0]["text"] == "slammed"
+
+
+def test_responses_without_scores_fail():
+    assert parse_structured("I cannot analyze this article.", BIAS_ANALYSIS_SCHEMA) == (None, "failed")
+    assert parse_structured('{"summary": "only prose"}', BIAS_ANALYSIS_SCHEMA) == (None, "failed")
+
+
+class FakeClaudeToolsClient:
+    """Mimics AsyncAnthropic on older SDKs, where tool use lives under beta.tools."""
+
+    def __init__(self):
+        self.requests = []
+        self.beta = SimpleNamespace(tools=SimpleNamespace(messages=SimpleNamespace(create=self._create)))
+
+    async def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        partial = dict(COMPLETE, overall_bias_score="55")
+        return SimpleNamespace(content=[SimpleNamespace(type="tool_use", input=partial)], usage=None)
+
+
+def test_gateway_forces_claude_tool_call_and_tracks_parse_outcomes(monkeypatch):
+    client = FakeClaudeToolsClient()
+    monkeypatch.setattr(ProviderRegistry, "get_async_client", classmethod(lambda cls, *args: client))
+    stats = ParseStats()
+    monkeypatch.setattr(ParseStats, "_shared", stats)
+    limiter = ProviderRateLimiter({ProviderType.CLAUDE: {"rpm": 1000000, "tpm": 1000000000}})
+    gateway = LLMGateway(client, "claude-test", ProviderType.CLAUDE, rate_limiter=limiter, use_cache=False)
+
+    text = asyncio.run(gateway.complete("analyze", schema=BIAS_ANALYSIS_SCHEMA))
+
+    request = client.requests[0]
+    assert request["tools"][0]["input_schema"] == BIAS_ANALYSIS_SCHEMA
+    assert request["extra_body"]["tool_choice"] == {"type": "tool", "name": request["tools"][0]["name"]}
+    assert json.loads(text)["overall_bias_score"] == 55
+    assert stats.snapshot()[0]["repaired"] == 1
+    assert stats.snapshot()[0]["parse_failure_rate"] == 0.0
@@ -0,0 +1,123 @@
+# tests/unit/test_services/test_tracing.py
+
+import asyncio
+import json
+import os
+import sys
+from datetime import date
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.database import news_db
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.services.tracing import STATUS_ERROR, STATUS_OK, Tracer, current_trace_id
+
+ANALYSIS = {
+    "emotional_bias_score": 30,
+    "framing_bias_score": 30,
+    "omission_bias_score": 30,
+    "overall_bias_score": 30,
+    "biased_phrases": [],
+    "summary": "Some loaded wording"
+}
+
+
+def _exported_spans(path):
+    lines = path.read_text().splitlines()
+    return [
+        [span for resource in json.loads(line)["resourceSpans"]
+         for scope in resource["scopeSpans"] for span in scope["spans"]]
+        for line in lines
+    ]
+
+
+def test_nested_spans_are_exported_once_the_root_ends(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracer = Tracer(export="file", path=str(path))
+
+    with tracer.span("root", query="climate") as root:
+        assert current_trace_id() == root.trace_id
+        with tracer.span("child"):
+            pass
+        try:
+            with tracer.span("failing"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert not path.exists()
+
+    (trace,) = _exported_spans(path)
+    by_name = {span["name"]: span for span in trace}
+    assert {span["traceId"] for span in trace} == {root.trace_id}
+    assert by_name["child"]["parentSpanId"] == root.span_id
+    assert "parentSpanId" not in by_name["root"]
+    assert by_name["failing"]["status"] == {"code": STATUS_ERROR, "message": "ValueError: boom"}
+    assert by_name["root"]["status"] == {"code": STATUS_OK}
+    assert by_name["root"]["attributes"] == [{"key": "query", "value": {"stringValue": "climate"}}]
+    assert current_trace_id() is None
+
+
+def test_explicit_trace_id_starts_a_new_trace(tmp_path):
+    tracer = Tracer(export="file", path=str(tmp_path / "spans.jsonl"))
+
+    with tracer.span("request") as outer:
+        with tracer.span("background", trace_id="ab" * 16) as inner:
+            pass
+
+    assert inner.trace_id == "ab" * 16
+    assert inner.parent_id is None
+    assert len(_exported_spans(tmp_path / "spans.jsonl")) == 2
+    assert outer.trace_id != inner.trace_id
+
+
+def test_store_analyze_persist_share_one_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(export="file", path=str(path))
+    monkeypatch.setattr(Tracer, "_shared", tracer)
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+
+    async def dispatch(self, request, hedge, call):
+        call["usage"] = (400, 80)
+        return json.dumps(ANALYSIS) if request["json_mode"] else "The council approved the budget."
+
+    monkeypatch.setattr(LLMGateway, "_dispatch", dispatch)
+    orchestrator = BiasAnalysisOrchestrator(concurrency=AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1))
+    article = {
+        "title": "Council rams through budget",
+        "source": "test",
+        "date": date.today().isoformat(),
+        "url": "https://example.com/budget",
+        "body": "The council rammed through a reckless budget after a long session about roads and schools.",
+        "category": "politics"
+    }
+
+    async def run():
+        with tracer.span("pipeline.run") as root:
+            news_db.get_connection_to_news_db()
+            news_db.add_news([article])
+            result = await orchestrator.analyze_article(article["body"], article["title"], "test")
+            news_db.add_bias([{"bias": json.dumps(result["analysis"]), "rewritten_article": result["neutral_version"],
+                               "title": article["title"], "body": article["body"]}])
+        return root
+
+    root = asyncio.run(run())
+
+    (trace,) = _exported_spans(path)
+    spans = {span["spanId"]: span for span in trace}
+    by_name = {span["name"]: span for span in trace}
+    assert {"db.add_news", "analyze_article", "concurrency.wait", "stage.analysis",
+            "llm.detect", "db.add_bias"} <= set(by_name)
+    assert by_name["db.add_news"]["parentSpanId"] == root.span_id
+    assert by_name["analyze_article"]["parentSpanId"] == root.span_id
+    assert spans[by_name["stage.analysis"]["parentSpanId"]]["name"] == "analyze_article"
+    assert spans[by_name["llm.detect"]["parentSpanId"]]["name"] == "stage.analysis"
+
+    llm_attributes = {item["key"]: item["value"] for item in by_name["llm.detect"]["attributes"]}
+    assert llm_attributes["model"] == {"stringValue": "llama-test"}
+    assert llm_attributes["prompt_tokens"] == {"intValue": "400"}
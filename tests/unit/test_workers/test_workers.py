@@ -0,0 +1,132 @@
+# tests/unit/test_workers/test_workers.py
+
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import date
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, project_root)
+
+from src.agents.orchestrator import BiasAnalysisOrchestrator
+from src.database import job_queue, news_db
+from src.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.services.llm_gateway import LLMGateway
+from src.services.model_factory import ProviderType
+from src.services.provider_registry import ProviderRegistry
+from src.workers.analysis import AnalysisWorker
+from src.workers.ingest import IngestWorker
+
+ANALYSIS = {
+    "emotional_bias_score": 10,
+    "framing_bias_score": 10,
+    "omission_bias_score": 10,
+    "overall_bias_score": 10,
+    "biased_phrases": [],
+    "summary": "Mostly neutral"
+}
+
+
+class FakeNewsClient:
+    def __init__(self, articles):
+        self.articles = articles
+
+    async def fetch_articles(self, query=None, count=5):
+        return self.articles[:count]
+
+
+def _articles(count):
+    return [
+        {
+            "title": f"Council approves budget {i}",
+            "source": "test",
+            "date": date.today().isoformat(),
+            "url": f"https://example.com/{i}",
+            "body": f"The council approved budget number {i} after a long session about roads and schools {i * 7919}.",
+            "category": "politics"
+        }
+        for i in range(count)
+    ]
+
+
+def _use_tmp_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(news_db, "news_DB", str(tmp_path / "news.db"))
+
+
+def test_ingest_stores_and_queues_each_article_once(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+    worker = IngestWorker(news_client=FakeNewsClient(_articles(3)))
+
+    first = asyncio.run(worker.run_once(count=3))
+    second = asyncio.run(worker.run_once(count=3))
+
+    assert first == {"fetched": 3, "added": 3, "queued": 3}
+    assert second["added"] == 0
+    assert job_queue.get_queue_stats()["pending"] == 3
+
+
+def test_ingest_queues_every_older_unqueued_article_but_not_ones_with_a_job(tmp_path, monkeypatch):
+    _use_tmp_db(monkeypatch, tmp_path)
+    news_db.get_connection_to_news_db()
+    articles = _articles(4)
+    news_db.add_news(data=articles)
+    # The API is analyzing the first article in-process under its own job
+    [api_job] = job_queue.enqueue_articles(articles[:1], priority=0)
+    job_queue.claim_jobs("api-worker", job_ids=[api_job])
+
+    stats = asyncio.run(IngestWorker(news_client=FakeNewsClient([])).run_once(count=1))
+
+    assert stats["queued"] == 3
+    assert job_queue.get_job(api_job)["lease_owner"] == "api-worker"
+
+
+def test_parallel_analysis_workers_split_the_queue(tmp_path, monkeypatch):
+    """Two workers in separate threads and event loops never analyze the same article."""
+    _use_tmp_db(monkeypatch, tmp_path)
+    monkeypatch.setattr(ProviderRegistry, "get_model", classmethod(lambda cls: (object(), "llama-test", ProviderType.GROQ)))
+    detected = []
+    lock = threading.Lock()
+
+    async def complete(self, prompt, **kwargs):
+        await asyncio.sleep(0.01)
+        if kwargs.get("stage") == "detect":
+            with lock:
+                detected.append(prompt)
+            return json.dumps(ANALYSIS)
+        return "The council approved the budget."
+
+    monkeypatch.setattr(LLMGateway, "complete", complete)
+    asyncio.run(IngestWorker(news_client=FakeNewsClient(_articles(8))).run_once(count=8))
+
+    workers = [
+        AnalysisWorker(
+            BiasAnalysisOrchestrator(concurrency=AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)),
+            batch_size=2, worker_id=f"worker-{i}"
+        )
+        for i in range(2)
+    ]
+
+    def drain(worker):
+        async def run():
+            while await worker.run_once():
+                pass
+        asyncio.run(run())
+
+    threads = [threading.Thread(target=drain, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(detected) == 8
+    assert sum(worker.completed for worker in workers) == 8
+    assert all(worker.completed > 0 for worker in workers)
+    assert job_queue.get_queue_stats()["done"] == 8
+
+    conn = sqlite3.connect(news_db.news_DB)
+    unanalyzed = conn.execute("SELECT COUNT(*) FROM data_news WHERE bias IS NULL").fetchone()[0]
+    conn.close()
+    assert unanalyzed == 0